@@ -0,0 +1,230 @@
+"""
+Cold-start import report for the dashboard.
+
+Runs the app headlessly (streamlit.testing) in a fresh interpreter with
+``python -X importtime`` for each scenario and records which modules the app
+itself pulls in on top of Streamlit, and how long they take to import:
+
+    login   unauthenticated login page
+    2026    default 2026 view (data fetch stubbed)
+    2025    2025 recap (data fetch stubbed)
+
+Results are compared against benchmarks/cold_start_baseline.json. The run
+fails if a scenario imports a module it is not allowed to, or if its import
+time grows past the baseline by more than the tolerance.
+
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "cold_start_baseline.json")
+MARKER = "--- cold start: app ---"
+
+SCENARIOS = ["login", "2026", "2025"]
+
+# Modules a scenario must never import. The login page renders no data, and
+# each year only loads the plotting backend it draws with. numpy is not listed
+# for the login page because Streamlit imports it to process the page icon.
+FORBIDDEN = {
+    "login": ["pandas", "requests", "msal", "openpyxl", "matplotlib", "altair"],
+    "2026": ["matplotlib"],
+    "2025": ["plotly.graph_objs._figure"],
+}
+
+# Heavy modules worth calling out in the report, present or not
+TRACKED = ["pandas", "numpy", "requests", "msal", "openpyxl", "matplotlib", "altair", "plotly.graph_objs._figure"]
+
+
+#----------------------
+# PROBE (runs inside the child interpreter)
+#----------------------
+
+def _fake_tables():
+    import pandas as pd
+
+    name = "Test User"
+    weeks = pd.date_range("2025-01-06", periods=4, freq="W-MON")
+    return {
+        "userfig": pd.DataFrame({
+            "Full Name": [name], "Email": ["test@example.com"],
+            "Start": [pd.Timestamp("2024-01-01")], "End": [pd.NaT],
+            "Working Hrs": [37.5], "Legal Office": ["Vancouver"], "Utilization Target": [0.75],
+        }),
+        "timesheet": pd.DataFrame({
+            "Date": list(weeks) * 2,
+            "Employee Full Name": [name] * 8,
+            "Sum of Hours": [30.0] * 4 + [7.5] * 4,
+            "Utilization Category": ["Billable Project"] * 4 + ["Time Off"] * 4,
+            "Project No - Title": ["P1 - Project"] * 4 + ["Vacation"] * 4,
+        }),
+        "allowance": pd.DataFrame({
+            "Employee Full Name": [name], "Allowance": [112.5],
+            "Timesheet Week": [weeks[-1]], "Utilization Target": [0.75],
+        }),
+        "flexot": pd.DataFrame({
+            "Full Name": [name] * 4, "WeekStart": weeks,
+            "Flex Bucket": [1.0] * 4, "OT Bucket": [0.5] * 4,
+            "Utilization": [0.8] * 4, "Utilization Target": [0.75] * 4,
+            "Flex PTO": [0.0] * 4, "Future Flex PTO": [0.0] * 4,
+            "OT PTO": [0.0] * 4, "Payout OT": [0.0] * 4, "Future OT PTO": [0.0] * 4,
+        }),
+    }
+
+
+def probe(scenario):
+    from unittest import mock
+
+    import streamlit.user_info
+    from streamlit.testing.v1 import AppTest
+
+    sys.path.insert(0, ROOT)
+    sys.stderr.write(MARKER + "\n")
+    sys.stderr.flush()
+
+    logged_in = scenario != "login"
+    user = {"is_logged_in": logged_in, "email": "test@example.com"}
+
+    with mock.patch.object(streamlit.user_info, "_get_user_info", lambda: user):
+        if logged_in:
+            # Same import the script does, so its cost lands after the marker
+            import sharepoint
+
+            def fake_fetch(client_id, client_secret, tenant_id, site_url, file_path, sheet_name=None):
+                return _fake_tables()[file_path]
+
+            sharepoint.get_sharepoint_file = fake_fetch
+
+        at = AppTest.from_file(os.path.join(ROOT, "streamlit1.py"), default_timeout=60)
+        at.secrets["sharepoint"] = {
+            "client_id": "", "client_secret": "", "tenant_id": "", "site_url": "",
+            "userfig_path_2025": "userfig", "timesheet_path_2025": "timesheet", "allowance_path_2025": "allowance",
+            "userfig_path_2026": "userfig", "timesheet_path_2026": "timesheet", "allowance_path_2026": "allowance",
+            "flexot_path_2026": "flexot",
+        }
+        if scenario == "2025":
+            at.session_state["year"] = "2025"
+        at.run()
+
+    if at.exception:
+        raise SystemExit(f"App raised during {scenario}: {at.exception[0].message}")
+
+    print(json.dumps(sorted(sys.modules)))
+
+
+#----------------------
+# REPORT
+#----------------------
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr):
+    """Top-level imports made after the marker, as {module: cumulative_us}."""
+    after = stderr.split(MARKER, 1)[1] if MARKER in stderr else ""
+    rows = [
+        (int(m.group(2)), len(m.group(3)), m.group(4))
+        for m in map(_LINE.match, after.splitlines()) if m
+    ]
+    if not rows:
+        return {}
+
+    top_level = min(indent for _, indent, _ in rows)
+    return {name: cumulative for cumulative, indent, name in rows if indent == top_level}
+
+
+def run_scenario(scenario):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--probe", scenario],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr[-2000:])
+
+    modules = set(json.loads(proc.stdout.strip().splitlines()[-1]))
+    imports = parse_importtime(proc.stderr)
+    return {
+        "total_ms": round(sum(imports.values()) / 1000, 1),
+        "top_imports_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(imports.items(), key=lambda kv: -kv[1])[:10]
+        },
+        "loaded": {name: name in modules for name in TRACKED},
+    }
+
+
+def check(report, baseline, tolerance, slack_ms):
+    failures = []
+    for scenario, result in report["scenarios"].items():
+        for name in FORBIDDEN[scenario]:
+            if result["loaded"].get(name):
+                failures.append(f"{scenario}: imports {name}")
+
+        base = baseline.get("scenarios", {}).get(scenario) if baseline else None
+        if base:
+            limit = base["total_ms"] * (1 + tolerance) + slack_ms
+            if result["total_ms"] > limit:
+                failures.append(
+                    f"{scenario}: app imports took {result['total_ms']:.1f} ms "
+                    f"(baseline {base['total_ms']:.1f} ms, limit {limit:.1f} ms)"
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--probe", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario, fastest is kept")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative slowdown vs baseline")
+    parser.add_argument("--slack-ms", type=float, default=25.0, help="absolute slack on top of the tolerance")
+    parser.add_argument("--output", help="also write the report to this path")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    if args.probe:
+        probe(args.probe)
+        return
+
+    report = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "scenarios": {},
+    }
+    for scenario in SCENARIOS:
+        runs = [run_scenario(scenario) for _ in range(args.repeat)]
+        report["scenarios"][scenario] = min(runs, key=lambda r: r["total_ms"])
+
+    for scenario, result in report["scenarios"].items():
+        loaded = ", ".join(name for name, hit in result["loaded"].items() if hit) or "-"
+        print(f"{scenario:>6}  {result['total_ms']:8.1f} ms   loads: {loaded}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return
+
+    baseline = None
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    failures = check(report, baseline, args.tolerance, args.slack_ms)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Memory check for the memoized figure builders in figures.py.
+
+Renders the donuts many times the way reruns do: most renders repeat one of
+a small set of "hot" inputs (cache hits), and a share are new inputs that
+are never seen again (misses that force evictions). Resident memory is
+sampled as it runs; once the caches are full it must stay flat, no figure
+may be left in pyplot's registry, and no cache may grow past its bound.
+
+    python benchmarks/figure_cache_leak.py
+    python benchmarks/figure_cache_leak.py --renders 2000 --miss-rate 0.05
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import figures  # noqa: E402
+from diagnostics import MIB, process_rss  # noqa: E402
+
+BUILDERS = [figures.donut_chart_svg, figures.donut_chart_plotly, figures.donut_chart_plotly_vacation]
+
+
+def render(used, remaining):
+    figures.donut_chart_svg(used, remaining, "Vacation", f"Max: {used + remaining:.1f} hrs")
+    figures.donut_chart_plotly(used, remaining, "Sick", f"Max: {used + remaining:.1f} hrs", "Sick time")
+    figures.donut_chart_plotly_vacation(used, 3.75, remaining, "Vacation", "Max", "Vacation time")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=10_000)
+    parser.add_argument("--hot", type=int, default=100, help="distinct inputs that keep coming back")
+    parser.add_argument("--miss-rate", type=float, default=0.1, help="share of renders with never-seen inputs")
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--budget-mib", type=float, default=8.0, help="allowed RSS growth after warmup")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    hot = [(rng.uniform(0, 150), rng.uniform(0, 150)) for _ in range(args.hot)]
+    fresh = 0
+
+    # Warm up until every cache has had to evict, so later samples measure
+    # a full cache rather than one still filling up
+    warmup = figures.FIGURE_CACHE_SIZE * 2
+    for i in range(warmup):
+        render(1000.0 + i, 1.0)
+    gc.collect()
+    start = process_rss() / MIB
+
+    every = max(1, args.renders // args.samples)
+    samples = []
+    t0 = time.perf_counter()
+    for i in range(1, args.renders + 1):
+        if rng.random() < args.miss_rate:
+            fresh += 1
+            render(5000.0 + fresh, 1.0)
+        else:
+            render(*rng.choice(hot))
+
+        if i % every == 0:
+            gc.collect()
+            samples.append((i, process_rss() / MIB))
+            print(f"{i:>7} renders  {samples[-1][1]:8.1f} MiB")
+    elapsed = time.perf_counter() - t0
+
+    failures = []
+    growth = max(mib for _, mib in samples) - start
+    if growth > args.budget_mib:
+        failures.append(f"RSS grew {growth:.1f} MiB after warmup (budget {args.budget_mib:.1f} MiB)")
+
+    for builder in BUILDERS:
+        info = builder.cache_info()
+        print(f"{builder.__name__:<28} hits {info.hits:>7}  misses {info.misses:>6}  size {info.currsize}/{info.maxsize}")
+        if info.currsize > info.maxsize:
+            failures.append(f"{builder.__name__}: cache holds {info.currsize} > {info.maxsize}")
+
+    import matplotlib.pyplot as plt
+
+    if plt.get_fignums():
+        failures.append(f"{len(plt.get_fignums())} figures left open in pyplot")
+
+    print(f"{args.renders} renders in {elapsed:.1f} s, {fresh} with new inputs; RSS {start:.1f} -> {samples[-1][1]:.1f} MiB")
+    if failures:
+        print("FAIL\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
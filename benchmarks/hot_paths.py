@@ -0,0 +1,249 @@
+"""
+Benchmarks for the ingestion and metrics hot paths.
+
+Each benchmark times one step the dashboard runs on every cache miss, by
+calling the function timesheet_metrics.py runs for it, on synthetic tables
+(synthetic.py) of several sizes: parsing the workbook, cleaning the
+timesheet, the contract baseline, the adjusted target, per-user filtering,
+the weekly chart data, and the per-user and all-employee metrics. Results
+are written as JSON with the machine they ran on and compared with a stored
+baseline; any benchmark slower than the baseline by more than the tolerance
+fails the run.
+
+    python benchmarks/hot_paths.py
+    python benchmarks/hot_paths.py --sizes 100 1000 10000 --out results.json
+    python benchmarks/hot_paths.py --only clean_timesheet contract_baseline_apply
+    python benchmarks/hot_paths.py --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import synthetic  # noqa: E402
+import timesheet_metrics as tm  # noqa: E402
+
+BASELINE = os.path.join(ROOT, "benchmarks", "hot_paths_baseline.json")
+
+EXCEL_ROWS = 20_000   # Excel is parsed from a sample: writing a 500k-row workbook takes minutes
+USERS = 20            # users per per-user benchmark
+
+# name -> setup(ctx) returning the zero-argument callable to time
+BENCHMARKS = {}
+
+
+def benchmark(func):
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+#----------------------
+# BENCHMARKS
+#----------------------
+
+@benchmark
+def excel_parse(ctx):
+    buf = BytesIO()
+    ctx["tables"]["df"].head(EXCEL_ROWS).to_excel(buf, sheet_name="PQ", index=False)
+    data = buf.getvalue()
+    ctx["rows"] = min(len(ctx["tables"]["df"]), EXCEL_ROWS)
+    return lambda: pd.read_excel(BytesIO(data), engine="openpyxl", sheet_name="PQ")
+
+
+@benchmark
+def clean_timesheet(ctx):
+    df = ctx["tables"]["df"]
+    ctx["rows"] = len(df)
+    return lambda: tm.clean_timesheet_2026(df.copy())
+
+
+def _contracts(ctx):
+    users = tm.prepare_contracts_2026(ctx["tables"]["df_user"].copy(), ctx["cap_end_date"])
+    ctx["rows"] = len(users)
+    return users
+
+
+@benchmark
+def contract_baseline_apply(ctx):
+    users = _contracts(ctx)
+    return lambda: users.apply(tm.weekday_hours, axis=1)
+
+
+@benchmark
+def contract_baseline_busday(ctx):
+    users = _contracts(ctx)
+    return lambda: tm._business_days(users["Start"], users["End"]) * users["Daily_Hours"]
+
+
+@benchmark
+def adjusted_target_for_period(ctx):
+    # The YTD and last-month periods compute_2026_state asks for, for several users
+    users = _contracts(ctx)
+    df = tm.clean_timesheet_2026(ctx["tables"]["df"].copy())
+    df = df[df["Date"] < ctx["monday"]]
+    cap = pd.Timestamp(ctx["cap_end_date"]).normalize()
+    last_month_end = cap.replace(day=1) - pd.Timedelta(days=1)
+    periods = [(pd.Timestamp("2026-01-01"), cap), (last_month_end.replace(day=1), last_month_end)]
+    per_user = [(name, df[df["Full Name"] == name]) for name in ctx["names"]]
+    ctx["rows"] = sum(len(frame) for _, frame in per_user)
+
+    def run():
+        for emp_name, df_util in per_user:
+            for start, end in periods:
+                tm.adjusted_target_for_period_2026(users, df_util, emp_name, start, end)
+    return run
+
+
+@benchmark
+def per_user_filter(ctx):
+    df = tm.clean_timesheet_2026(ctx["tables"]["df"].copy())
+    ctx["rows"] = len(df)
+    return lambda: [df[df["Full Name"] == name].copy() for name in ctx["names"]]
+
+
+@benchmark
+def chart_data(ctx):
+    # The weekly utilization chart's rows, per user
+    flexot = ctx["tables"]["df_flexot"]
+    per_user = [flexot[flexot["Full Name"].str.lower() == name.lower()] for name in ctx["names"]]
+    ctx["rows"] = sum(len(frame) for frame in per_user)
+    return lambda: [tm.weekly_utilization_2026(frame) for frame in per_user]
+
+
+@benchmark
+def per_user_state(ctx):
+    tables = ctx["tables"]
+    ctx["rows"] = len(tables["df"])
+    email = ctx["emails"][0]
+    return lambda: tm.compute_2026_state(**tables, email=email, today=ctx["today"])
+
+
+@benchmark
+def employee_table(ctx):
+    tables = ctx["tables"]
+    ctx["rows"] = len(tables["df"])
+    return lambda: tm.compute_2026_employee_table(**tables, today=ctx["today"])
+
+
+#----------------------
+# RUNNER
+#----------------------
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def run(sizes, names, repeat, today):
+    results = {}
+    for size in sizes:
+        tables = synthetic.generate(size, year=2026, seed=0, today=today)
+        users = tables["df_user"].drop_duplicates("Full Name").head(USERS)
+        for name in names:
+            ctx = {
+                "tables": tables,
+                "today": today,
+                "monday": today - timedelta(days=today.weekday()),
+                "cap_end_date": today - timedelta(days=today.weekday() + 1),
+                "names": users["Full Name"].tolist(),
+                "emails": users["Email"].tolist(),
+            }
+            func = BENCHMARKS[name](ctx)
+            func()   # warm up imports and caches
+            times = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - started)
+            results.setdefault(name, {})[str(size)] = {
+                "median_s": statistics.median(times),
+                "min_s": min(times),
+                "rows": ctx.get("rows"),
+            }
+            print(f"{name:<28} {size:>6} employees  {statistics.median(times) * 1000:10.2f} ms  ({ctx.get('rows')} rows)")
+    return results
+
+
+def compare(results, baseline, tolerance, floor_s):
+    """Benchmarks slower than the baseline by more than `tolerance` (and `floor_s`)."""
+    failures = []
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            before = baseline["results"].get(name, {}).get(size)
+            if before is None:
+                continue
+            ratio = result["median_s"] / before["median_s"] if before["median_s"] > 0 else float("inf")
+            slower = result["median_s"] - before["median_s"]
+            flag = ""
+            if ratio > 1 + tolerance and slower > floor_s:
+                flag = "  REGRESSION"
+                failures.append(f"{name} @ {size}: {before['median_s'] * 1000:.2f} -> {result['median_s'] * 1000:.2f} ms ({ratio:.2f}x)")
+            print(f"{name:<28} {size:>6}  {before['median_s'] * 1000:10.2f} -> {result['median_s'] * 1000:10.2f} ms  {ratio:5.2f}x{flag}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000], help="employees per synthetic dataset")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--today", type=datetime.fromisoformat, default=datetime(2026, 10, 19), help="run as of this date (YYYY-MM-DD)")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON to compare with (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, as a fraction of the baseline")
+    parser.add_argument("--floor-ms", type=float, default=2.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    names = args.only or list(BENCHMARKS)
+    report = {
+        "machine": machine_info(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "params": {"sizes": args.sizes, "repeat": args.repeat, "today": args.today.date().isoformat()},
+        "results": run(args.sizes, names, args.repeat, args.today),
+    }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with the baseline from {baseline['created']}")
+    if baseline["machine"] != report["machine"]:
+        print(f"  note: the baseline was recorded on a different machine: {baseline['machine']}")
+
+    failures = compare(report["results"], baseline, args.tolerance, args.floor_ms / 1000)
+    if failures:
+        print("FAIL\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Concurrent-session load test for the dashboard.
+
+Simulates a Monday morning: N logged-in users open the 2026 dashboard at
+the same time, each in its own headless session (Streamlit's AppTest) of
+this one process, reading a local snapshot instead of SharePoint. N is
+ramped step by step; each step reports per-load latency, throughput, peak
+RSS and CPU, and the report names the saturation point: the first step
+where adding users no longer adds throughput, or p95 latency breaks the
+SLO.
+
+    python benchmarks/load_test.py --employees 300
+    python benchmarks/load_test.py --snapshot snapshots/2026-10-19 --ramp 1 2 4 8 16 32 --out load.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from diagnostics import MIB, process_rss  # noqa: E402
+
+APP = os.path.join(ROOT, "streamlit1.py")
+EMAIL_KEY = "load_test_email"   # session state key holding the simulated user
+
+
+class Monitor:
+    """Samples RSS in the background and measures CPU time over a step."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+
+    def __enter__(self):
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, process_rss() / MIB)
+            self._stop.wait(self.interval)
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, process_rss() / MIB)
+        self.wall = time.perf_counter() - self.wall
+        self.cpu = time.process_time() - self.cpu
+
+
+#----------------------
+# SESSIONS
+#----------------------
+
+def simulated_user():
+    """
+    st.user for whichever simulated session is running: logged in, with the
+    email stored in that session's state. Replaces Streamlit's lookup, which
+    in AppTest always returns the same test user.
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None or EMAIL_KEY not in ctx.session_state:
+        return {}
+    return {"is_logged_in": True, "email": ctx.session_state[EMAIL_KEY]}
+
+
+def shared_secrets(values):
+    """
+    Secrets installed once for every session. AppTest's own per-test
+    secrets swap the global st.secrets in and out around each run, which
+    concurrent sessions would race on.
+    """
+    from streamlit.runtime.secrets import Secrets
+
+    secrets = Secrets()
+    secrets._secrets = values
+    return secrets
+
+
+def shared_runtime():
+    """
+    One mock Runtime for every session, as AppTest builds per run. AppTest
+    clears the global Runtime when each run ends, under any other session
+    still running.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    return runtime
+
+
+def page_load(email, timeout):
+    """One user opening the dashboard in a new session; returns seconds."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=timeout)
+    at.session_state[EMAIL_KEY] = email
+
+    started = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(f"{email}: {at.exception[0].message}")
+    return elapsed
+
+
+def run_step(users, emails, loads, timeout):
+    """`users` concurrent sessions, each opening the dashboard `loads` times."""
+    jobs = [emails[(u * loads + i) % len(emails)] for u in range(users) for i in range(loads)]
+    with Monitor() as monitor, ThreadPoolExecutor(max_workers=users) as pool:
+        latencies = list(pool.map(lambda email: page_load(email, timeout), jobs))
+
+    latencies.sort()
+    return {
+        "users": users,
+        "loads": len(latencies),
+        "throughput": len(latencies) / monitor.wall,
+        "p50_s": statistics.median(latencies),
+        "p95_s": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "max_s": latencies[-1],
+        "peak_rss_mib": monitor.peak,
+        "cpu_percent": 100 * monitor.cpu / monitor.wall,
+        "wall_s": monitor.wall,
+    }
+
+
+def saturation(steps, slo_s, min_gain):
+    """The first step that breaks the SLO or adds less than `min_gain` throughput."""
+    for previous, step in zip([None] + steps, steps):
+        if step["p95_s"] > slo_s:
+            return {"users": step["users"], "reason": f"p95 {step['p95_s']:.2f} s over the {slo_s:.2f} s SLO"}
+        if previous and step["throughput"] < previous["throughput"] * (1 + min_gain):
+            return {
+                "users": step["users"],
+                "reason": f"throughput {step['throughput']:.2f}/s vs {previous['throughput']:.2f}/s at {previous['users']} users",
+            }
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshot", help="2026 snapshot directory to serve (default: generate one)")
+    parser.add_argument("--employees", type=int, default=300, help="size of the generated snapshot")
+    parser.add_argument("--ramp", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="concurrent users per step")
+    parser.add_argument("--loads", type=int, default=2, help="page loads per user per step")
+    parser.add_argument("--slo-ms", type=float, default=5000, help="p95 page load that counts as saturated")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="throughput gain a step must add to not count as saturated")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds one page load may take")
+    parser.add_argument("--cold", action="store_true", help="skip the warmup load, so the first step fills the caches")
+    parser.add_argument("--out", help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    from unittest import mock
+
+    import pandas as pd
+    import streamlit
+    import streamlit.user_info
+    from streamlit.runtime import Runtime
+
+    snapshot = args.snapshot
+    if not snapshot:
+        import synthetic
+        from sharepoint import save_snapshot
+
+        snapshot = tempfile.mkdtemp(prefix="load-test-")
+        save_snapshot(synthetic.generate(args.employees, year=2026), snapshot)
+    emails = pd.read_pickle(os.path.join(snapshot, "df_user.pkl"))["Email"].dropna().drop_duplicates().tolist()
+    secrets = shared_secrets({"sharepoint": {"snapshot_2026": snapshot}})
+    runtime = shared_runtime()
+
+    steps = []
+    with mock.patch.object(streamlit.user_info, "_get_user_info", simulated_user), \
+            mock.patch.object(streamlit, "secrets", secrets), \
+            mock.patch.object(Runtime, "instance", classmethod(lambda cls: runtime)), \
+            mock.patch.object(Runtime, "exists", classmethod(lambda cls: True)):
+        warmup = None
+        if not args.cold:
+            warmup = page_load(emails[0], args.timeout)
+            print(f"warmup load {warmup:.2f} s")
+        print(f"{'users':>5} {'loads':>5} {'loads/s':>8} {'p50 s':>7} {'p95 s':>7} {'max s':>7} {'RSS MiB':>8} {'CPU %':>6}")
+        for users in args.ramp:
+            step = run_step(users, emails, args.loads, args.timeout)
+            steps.append(step)
+            print(
+                f"{step['users']:>5} {step['loads']:>5} {step['throughput']:>8.2f} {step['p50_s']:>7.2f} "
+                f"{step['p95_s']:>7.2f} {step['max_s']:>7.2f} {step['peak_rss_mib']:>8.1f} {step['cpu_percent']:>6.0f}"
+            )
+
+    point = saturation(steps, args.slo_ms / 1000, args.min_gain)
+    print(f"Saturated at {point['users']} users: {point['reason']}" if point else "Not saturated within the ramp")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "snapshot": snapshot,
+                "employees": len(emails),
+                "warmup_s": warmup,
+                "steps": steps,
+                "saturation": point,
+                "params": {"ramp": args.ramp, "loads": args.loads, "slo_ms": args.slo_ms, "min_gain": args.min_gain},
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Golden-output equivalence gate for the 2026 metrics.
+
+Runs the reference implementation (compute_2026_state, one call per
+employee) and every other metrics engine over the same fixtures, diffs
+each per-employee metric within a tolerance, and reports the engines'
+timings side by side. Fixtures are synthetic datasets (synthetic.py) over
+several seeds and as-of dates, or a saved snapshot of the real tables,
+anonymized before anything is computed or written out. The run fails on
+any metric that differs, on an employee only one side reports, or on an
+engine slower than the reference by more than --max-ratio. Employees the
+reference itself raises for are reported and skipped.
+
+An engine takes (tables, today) and returns one row per Full Name with the
+METRICS columns; register it with @engine below, or pass a module:function
+with --candidate.
+
+    python benchmarks/metric_equivalence.py
+    python benchmarks/metric_equivalence.py --employees 100 --seeds 0 1 2 3 --out equivalence.json
+    python benchmarks/metric_equivalence.py --snapshot snapshots/2026-10-19 --sample 50
+    python benchmarks/metric_equivalence.py --candidate fast_metrics:compute_table
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+import synthetic  # noqa: E402
+import timesheet_metrics as tm  # noqa: E402
+
+# Per-employee outputs compared between engines: numbers within tolerance,
+# the rest exactly
+METRICS = [
+    "project_hours", "internalplusproposal_hours", "overhead_hours", "total_working_hours",
+    "target_hours", "pto_vacation", "pto_sick", "combined_closed", "unpaid_hours",
+    "adjusted_target", "delta_hours", "prod_hours",
+    "vacation_max", "vacation_used", "vacation_remaining", "future_vacation_hours",
+    "sick_used", "sick_remaining",
+    "flex_bucket", "ot_bucket", "flex_used", "flex_booked", "ot_used", "ot_booked",
+    "util_target", "current_util_target",
+    "project_last_month", "project_ytd", "adjusted_target_last_month", "adjusted_target_ytd",
+    "util_last_month", "util_ytd",
+]
+EXACT = ["is_stale", "timesheet_date_str"]
+
+# Month starts, a year start (last month is in 2025) and a mid-month Monday
+TODAYS = ["2026-01-05", "2026-03-02", "2026-10-19"]
+
+REFERENCE = "reference"
+
+# name -> engine(tables, today) returning a DataFrame indexed by Full Name
+ENGINES = {}
+
+
+def engine(func):
+    ENGINES[func.__name__] = func
+    return func
+
+
+#----------------------
+# ENGINES
+#----------------------
+
+@engine
+def reference(tables, today):
+    # Employees the per-user path raises for (their dashboard would too) are
+    # listed in attrs["errors"] and left out of the comparison
+    rows, errors = {}, {}
+    for email in tables["df_user"]["Email"].dropna().drop_duplicates():
+        try:
+            state = tm.compute_2026_state(**tables, email=email, today=today)
+        except Exception as e:
+            errors[tm.find_employee_name(tables["df_user"], email)] = f"{type(e).__name__}: {e}"
+            continue
+        rows[state["emp_name"]] = {column: state[column] for column in METRICS + EXACT}
+    table = pd.DataFrame.from_dict(rows, orient="index")
+    table.attrs["errors"] = errors
+    return table
+
+
+@engine
+def employee_table(tables, today):
+    return tm.compute_2026_employee_table(**tables, today=today)
+
+
+def load_engine(spec):
+    """An engine given as module:function, importable from the repo root."""
+    module, _, name = spec.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+#----------------------
+# FIXTURES
+#----------------------
+
+def _pseudonym(value, salt, prefix):
+    return f"{prefix} {hashlib.sha256((salt + value).encode()).hexdigest()[:8].upper()}"
+
+
+def _like(original, replacement):
+    """`replacement` with the case and surrounding whitespace of `original`, which the engines match on."""
+    if original.isupper():
+        replacement = replacement.upper()
+    elif original.islower():
+        replacement = replacement.lower()
+    stripped = original.strip()
+    start = original.find(stripped)
+    return original[:start] + replacement + original[start + len(stripped):]
+
+
+def anonymize(tables, salt):
+    """
+    Replace names, emails and billable project titles with salted hashes,
+    consistently across the tables. Names are keyed case- and
+    whitespace-insensitively and keep their original variant's case and
+    padding, so lookups that match (or fail to match) on those behave as
+    they did on the real data.
+    """
+    def name(value):
+        if not isinstance(value, str):
+            return value
+        return _like(value, _pseudonym(value.strip().lower(), salt, "Employee"))
+
+    def email(value):
+        if not isinstance(value, str) or "@" not in value:
+            return value
+        local, _, domain = value.strip().rpartition("@")
+        return _like(value, f"{_pseudonym(local.lower(), salt, 'user').replace(' ', '.')}@{domain}".lower())
+
+    tables = {key: frame.copy() for key, frame in tables.items()}
+    tables["df_user"]["Full Name"] = tables["df_user"]["Full Name"].map(name)
+    for column in ["Email", tm.MANAGER_COLUMN]:
+        if column in tables["df_user"]:
+            tables["df_user"][column] = tables["df_user"][column].map(email)
+    tables["df"]["Employee Full Name"] = tables["df"]["Employee Full Name"].map(name)
+    tables["df_allowance"]["Employee Full Name"] = tables["df_allowance"]["Employee Full Name"].map(name)
+    tables["df_flexot"]["Full Name"] = tables["df_flexot"]["Full Name"].map(name)
+
+    # Internal, overhead and time-off titles drive the math; client project names do not
+    df = tables["df"]
+    billable = df["Utilization Category"] == "Billable Project"
+    df.loc[billable, "Project No - Title"] = df.loc[billable, "Project No - Title"].map(
+        lambda title: _pseudonym(str(title), salt, "Project")
+    )
+    return tables
+
+
+def sample_employees(tables, n, seed):
+    """The tables cut down to `n` random employees (all of their rows)."""
+    names = tables["df_user"]["Full Name"].dropna().str.strip().str.lower().drop_duplicates()
+    keep = set(names.sample(min(n, len(names)), random_state=seed))
+
+    def rows(frame, column):
+        return frame[frame[column].str.strip().str.lower().isin(keep)]
+
+    return {
+        "df_user": rows(tables["df_user"], "Full Name"),
+        "df": rows(tables["df"], "Employee Full Name"),
+        "df_allowance": rows(tables["df_allowance"], "Employee Full Name"),
+        "df_flexot": rows(tables["df_flexot"], "Full Name"),
+    }
+
+
+def fixtures(args):
+    """(label, tables, today) for every fixture of the run."""
+    if args.snapshot:
+        from sharepoint import load_snapshot
+
+        tables = anonymize(load_snapshot(args.snapshot), salt=os.urandom(8).hex())
+        if args.sample:
+            tables = sample_employees(tables, args.sample, seed=0)
+        for today in args.today:
+            yield f"snapshot @ {today.date()}", tables, today
+        return
+
+    for seed in args.seeds:
+        for today in args.today:
+            tables = synthetic.generate(args.employees, year=2026, seed=seed, today=today)
+            yield f"synthetic {args.employees}/seed {seed} @ {today.date()}", tables, today
+
+
+#----------------------
+# COMPARISON
+#----------------------
+
+def diff(expected, actual, atol, rtol):
+    """Rows (employee, metric, expected, actual) where `actual` differs from the reference."""
+    actual = actual.drop(index=list(expected.attrs.get("errors", {})), errors="ignore")
+    differences = []
+    for name in expected.index.difference(actual.index):
+        differences.append({"employee": name, "metric": "(row)", "expected": "present", "actual": "missing"})
+    for name in actual.index.difference(expected.index):
+        differences.append({"employee": name, "metric": "(row)", "expected": "missing", "actual": "present"})
+
+    common = expected.index.intersection(actual.index)
+    for column in METRICS + EXACT:
+        if column not in actual:
+            differences.append({"employee": "(all)", "metric": column, "expected": "column", "actual": "missing"})
+            continue
+        want = expected.loc[common, column]
+        got = actual.loc[common, column]
+        if column in EXACT:
+            same = want.astype(str).to_numpy() == got.astype(str).to_numpy()
+        else:
+            want_values = want.astype(float).to_numpy()
+            got_values = got.astype(float).to_numpy()
+            same = np.isclose(got_values, want_values, atol=atol, rtol=rtol, equal_nan=True)
+        for name in common[~same]:
+            differences.append({
+                "employee": name,
+                "metric": column,
+                "expected": expected.at[name, column],
+                "actual": actual.at[name, column],
+            })
+    return differences
+
+
+def run_fixture(engines, tables, today):
+    """Each engine's output and seconds on one fixture, the reference first."""
+    outputs, seconds = {}, {}
+    for name, func in engines.items():
+        started = time.perf_counter()
+        outputs[name] = func(tables, today)
+        seconds[name] = time.perf_counter() - started
+    return outputs, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=40, help="employees per synthetic dataset")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1])
+    parser.add_argument("--today", type=datetime.fromisoformat, nargs="+",
+                        default=[datetime.fromisoformat(day) for day in TODAYS], help="as-of dates (YYYY-MM-DD)")
+    parser.add_argument("--snapshot", help="compare on an anonymized copy of this 2026 snapshot instead")
+    parser.add_argument("--sample", type=int, help="with --snapshot, compare this many random employees")
+    parser.add_argument("--only", nargs="+", choices=sorted(set(ENGINES) - {REFERENCE}), help="compare only these engines")
+    parser.add_argument("--candidate", nargs="+", default=[], help="extra engines as module:function")
+    parser.add_argument("--atol", type=float, default=1e-6, help="absolute tolerance on numeric metrics")
+    parser.add_argument("--rtol", type=float, default=1e-9, help="relative tolerance on numeric metrics")
+    parser.add_argument("--max-ratio", type=float, default=1.0, help="slowest allowed engine time, as a multiple of the reference")
+    parser.add_argument("--show", type=int, default=20, help="differences to print per engine and fixture")
+    parser.add_argument("--out", help="write the report to this JSON file")
+    args = parser.parse_args()
+
+    engines = {REFERENCE: ENGINES[REFERENCE]}
+    engines.update({name: ENGINES[name] for name in args.only or ENGINES if name != REFERENCE})
+    engines.update({spec: load_engine(spec) for spec in args.candidate})
+
+    report = {"params": {"atol": args.atol, "rtol": args.rtol, "max_ratio": args.max_ratio}, "fixtures": []}
+    failures = []
+    print(f"{'fixture':<36} {'engine':<24} {'employees':>9} {'ms':>10} {'ratio':>7} {'diffs':>6}")
+    for label, tables, today in fixtures(args):
+        outputs, seconds = run_fixture(engines, tables, today)
+        expected = outputs[REFERENCE]
+        errors = expected.attrs.get("errors", {})
+        fixture = {"fixture": label, "employees": len(expected), "reference_errors": errors, "engines": {}}
+        for name, output in outputs.items():
+            differences = [] if name == REFERENCE else diff(expected, output, args.atol, args.rtol)
+            ratio = seconds[name] / seconds[REFERENCE]
+            fixture["engines"][name] = {"seconds": seconds[name], "ratio": ratio, "differences": differences}
+            print(f"{label:<36} {name:<24} {len(output):>9} {seconds[name] * 1000:>10.1f} {ratio:>6.3f}x {len(differences):>6}")
+
+            for row in differences[:args.show]:
+                print(f"    {row['employee']!s:<28} {row['metric']:<28} {row['expected']!s:>20} -> {row['actual']!s}")
+            if len(differences) > args.show:
+                print(f"    ... {len(differences) - args.show} more")
+            if differences:
+                failures.append(f"{name} on {label}: {len(differences)} differences")
+            if ratio > args.max_ratio:
+                failures.append(f"{name} on {label}: {ratio:.2f}x the reference time")
+        for employee, error in errors.items():
+            print(f"    reference fails for {employee}: {error}")
+        report["fixtures"].append(fixture)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    if failures:
+        print("FAIL\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Brute-force check of the time-off planner arithmetic.
+
+Rebuilds every employee's bookable hours day by day from the synthetic
+tables (synthetic.py), with plain loops instead of the capacity prefix
+sums, and checks merge_ranges, planned_hours and time_off_plan against a
+day-by-day sum over random plans: overlapping ranges of different kinds,
+ranges that cross the split week, and ranges reaching outside the year.
+The run fails on any plan whose hours differ.
+
+    python benchmarks/time_off_plan_check.py
+    python benchmarks/time_off_plan_check.py --employees 50 --seeds 0 1 2 --plans 500
+"""
+import argparse
+import os
+import random
+import sys
+from collections import defaultdict
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+import synthetic  # noqa: E402
+import timesheet_metrics as tm  # noqa: E402
+
+YEAR = 2026
+
+
+def free_hours_by_day(tables):
+    """{Full Name: {date: bookable hours}} over the year, one contract row and one timesheet row at a time."""
+    first, last = date(YEAR, 1, 1), date(YEAR, 12, 31)
+    days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+    contract = defaultdict(lambda: defaultdict(float))
+    for user in tables["df_user"].to_dict("records"):
+        start, end = pd.to_datetime(user["Start"], errors="coerce"), pd.to_datetime(user["End"], errors="coerce")
+        if pd.isna(start) or not user["Working Hrs"] > 0:
+            continue
+        end = last if pd.isna(end) else end.date()
+        for day in days:
+            if start.date() <= day <= end and day.weekday() < 5:
+                contract[user["Full Name"]][day] += user["Working Hrs"] / 5
+
+    booked = defaultdict(float)
+    df = tables["df"]
+    for name, day, title, hours in zip(df["Employee Full Name"], pd.to_datetime(df["Date"]), df["Project No - Title"], df["Sum of Hours"]):
+        if title in tm.PERIOD_PTO_TITLES and day.year == YEAR and not pd.isna(hours):
+            booked[name, day.date()] += hours
+
+    return {
+        name: {day: max(contract[name][day] - booked[name, day], 0) for day in days}
+        for name in tables["df_user"]["Full Name"].unique()
+    }
+
+
+def brute_plan(free, entries, split):
+    """time_off_plan by walking each entry's days, skipping days an earlier entry took."""
+    plan = {kind: [0.0, 0.0] for kind in tm.PLANNER_KINDS}
+    taken = set()
+    for kind, start, end in entries:
+        start, end = min(start, end), max(start, end)
+        for i in range((end - start).days + 1):
+            day = start + timedelta(days=i)
+            if day not in taken:
+                taken.add(day)
+                plan[kind][day >= split] += free.get(day, 0.0)
+    return plan, taken
+
+
+def random_entries(rng, split):
+    # Clustered around the split so ranges overlap each other and cross it;
+    # some start in December of the year before or end in January after
+    entries = []
+    for _ in range(rng.randint(1, 5)):
+        start = split + timedelta(days=rng.randint(-40, 40))
+        if rng.random() < 0.1:
+            start = rng.choice([date(YEAR - 1, 12, 20), date(YEAR, 12, 24)])
+        end = start + timedelta(days=rng.randint(0, 20))
+        if rng.random() < 0.2:
+            start, end = end, start
+        entries.append((rng.choice(tm.PLANNER_KINDS), start, end))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=20)
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1])
+    parser.add_argument("--plans", type=int, default=200, help="random plans per employee sampled")
+    parser.add_argument("--sample", type=int, default=5, help="employees checked per dataset")
+    parser.add_argument("--atol", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    failures = []
+    for seed in args.seeds:
+        rng = random.Random(seed)
+        tables = synthetic.generate(args.employees, YEAR, seed, today="2026-10-19")
+        capacity = tm.compute_2026_time_off_capacity(tables["df_user"], tables["df"], YEAR)
+        free = free_hours_by_day(tables)
+        checked = 0
+        for name in rng.sample(sorted(free), min(args.sample, len(free))):
+            for _ in range(args.plans):
+                split = date(YEAR, 1, 5) + timedelta(weeks=rng.randint(0, 51))
+                entries = random_entries(rng, split)
+                expected, taken = brute_plan(free[name], entries, split)
+
+                merged = tm.merge_ranges([(start, end) for _, start, end in entries])
+                merged_days = {start + timedelta(days=i) for start, end in merged for i in range((end - start).days + 1)}
+                apart = all(b[0] > a[1] + timedelta(days=1) for a, b in zip(merged, merged[1:]))
+                if merged_days != taken or not apart:
+                    failures.append(f"seed {seed} {name}: merge_ranges {merged} for {entries}")
+
+                total = tm.planned_hours(capacity, name, [(start, end) for _, start, end in entries], split)
+                want = (sum(p for p, _ in expected.values()), sum(f for _, f in expected.values()))
+                if any(abs(a - b) > args.atol for a, b in zip(total, want)):
+                    failures.append(f"seed {seed} {name}: planned_hours {total} != {want} for {entries}, split {split}")
+
+                plan = tm.time_off_plan(capacity, name, entries, split)
+                for kind in tm.PLANNER_KINDS:
+                    if any(abs(a - b) > args.atol for a, b in zip(plan[kind], expected[kind])):
+                        failures.append(f"seed {seed} {name}: time_off_plan {kind} {plan[kind]} != {tuple(expected[kind])} for {entries}, split {split}")
+                checked += 1
+        print(f"seed {seed}: {checked} plans over {min(args.sample, len(free))} employees")
+
+    if failures:
+        print("FAIL\n  " + "\n  ".join(failures[:20]))
+        if len(failures) > 20:
+            print(f"  ... {len(failures) - 20} more")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+KPI card rendering.
+
+Cards are rendered as plain HTML into the page (st.html) rather than one
+components.html iframe each. A section emits all of its cards in a single
+grid, and the stylesheet they share is injected once per script run by
+inject_card_styles(), so individual cards carry no inline CSS.
+"""
+from html import escape
+from string import Template
+
+import streamlit as st
+
+CARD_CSS = """
+.kpi-grid {
+    display: grid;
+    gap: 1rem 2rem;
+    margin-bottom: 1rem;
+    font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
+}
+.kpi-card {
+    width: 100%;
+    padding: 1rem;
+    border: 1px solid #e5e7eb;
+    border-radius: 10px;
+    box-sizing: border-box;
+    text-align: center;
+    color: #111827;
+}
+.kpi-title {
+    margin: 0 0 0.25rem 0;
+    font-size: 1.17rem;
+    font-weight: 600;
+}
+.kpi-value {
+    margin: 0 0 1rem 0;
+    font-size: 3rem;
+    font-weight: 700;
+    line-height: 1.2;
+}
+.kpi-parts {
+    display: flex;
+    flex-wrap: wrap;
+    justify-content: center;
+    align-items: center;
+    gap: 1.5rem;
+}
+.kpi-label {
+    margin: 0;
+    font-size: 0.9rem;
+    color: #6b7280;
+}
+.kpi-number, .kpi-op {
+    margin: 0;
+    font-size: 0.9rem;
+    font-weight: 600;
+}
+.kpi-op {
+    font-weight: 700;
+}
+.kpi-parts-lg .kpi-number, .kpi-parts-lg .kpi-op {
+    font-size: 1.2rem;
+}
+.kpi-summary {
+    padding: 0.75rem 1rem;
+    text-align: left;
+    font-size: 0.95rem;
+    color: #374151;
+}
+.kpi-summary p {
+    margin: 0.4rem 0 0 0;
+}
+.kpi-summary p:first-child {
+    margin-top: 0;
+}
+.kpi-accent {
+    color: #ED017F;
+}
+.kpi-stats {
+    padding: 0.75rem 1rem;
+}
+.kpi-stats .kpi-title {
+    margin-bottom: 0.5rem;
+    font-size: 1.2rem;
+}
+.kpi-stats-row {
+    display: flex;
+    justify-content: space-between;
+}
+.kpi-stats-row .kpi-label {
+    font-size: 0.8rem;
+}
+.kpi-grid .info-tooltip {
+    font-size: 1rem;
+    font-weight: 400;
+    color: #6B7280;
+    vertical-align: super;
+    cursor: help;
+}
+.kpi-grid .info-tooltip:hover {
+    color: #374151;
+}
+@media (max-width: 768px) {
+    .kpi-grid {
+        grid-template-columns: 1fr !important;
+    }
+}
+"""
+
+#----------------------
+# TEMPLATES
+#----------------------
+
+_STYLE = Template("<style>$css</style>")
+_GRID = Template('<div class="kpi-grid" style="grid-template-columns: $columns;">$cards</div>')
+_TOOLTIP = Template('<span class="info-tooltip" title="$text"> ⓘ</span>')
+_METRIC = Template(
+    '<div class="kpi-card">'
+    '<div class="kpi-title">$title$tooltip</div>'
+    '<div class="kpi-value">$value</div>'
+    '$parts'
+    '</div>'
+)
+_PARTS = Template('<div class="kpi-parts $size">$items</div>')
+_PART = Template('<div><p class="kpi-label">$label</p><p class="kpi-number">$value</p></div>')
+_OP = Template('<div class="kpi-op">$op</div>')
+_SUMMARY = Template('<div class="kpi-card kpi-summary">$paragraphs</div>')
+_STATS = Template(
+    '<div class="kpi-card kpi-stats">'
+    '<div class="kpi-title">$title$tooltip</div>'
+    '<div class="kpi-stats-row">$items</div>'
+    '</div>'
+)
+_STAT = Template('<div><p class="kpi-label">$label</p><p class="kpi-number">$value</p></div>')
+
+
+def info_tooltip(text):
+    return _TOOLTIP.substitute(text=escape(text)) if text else ""
+
+
+#----------------------
+# CARDS
+#----------------------
+
+def metric_card(title, value, parts=(), operator="+", tooltip=None, decimals=2, large_parts=False):
+    """
+    Headline number with an optional breakdown, e.g. Baseline - Vacation - ...
+    `parts` is a sequence of (label, value) pairs joined by `operator`.
+    """
+    parts_html = ""
+    if parts:
+        items = _OP.substitute(op=operator).join(
+            _PART.substitute(label=escape(label), value=f"{part:.{decimals}f}")
+            for label, part in parts
+        )
+        parts_html = _PARTS.substitute(size="kpi-parts-lg" if large_parts else "", items=items)
+
+    return _METRIC.substitute(
+        title=escape(title),
+        tooltip=info_tooltip(tooltip),
+        value=f"{value:.{decimals}f}",
+        parts=parts_html,
+    )
+
+
+def summary_card(paragraphs):
+    """Free-text card. Paragraphs are trusted HTML built by the caller."""
+    return _SUMMARY.substitute(paragraphs="".join(f"<p>{p}</p>" for p in paragraphs))
+
+
+def stats_card(title, items, tooltip=None, decimals=2):
+    """Title over a row of small (label, value) stats."""
+    return _STATS.substitute(
+        title=escape(title),
+        tooltip=info_tooltip(tooltip),
+        items="".join(
+            _STAT.substitute(label=escape(label), value=f"{value:.{decimals}f}")
+            for label, value in items
+        ),
+    )
+
+
+#----------------------
+# RENDERING
+#----------------------
+
+def card_grid(cards, columns):
+    """One grid of cards. `columns` is a CSS grid-template-columns value."""
+    return _GRID.substitute(columns=columns, cards="".join(cards))
+
+
+def inject_card_styles():
+    """Emit the shared card stylesheet. Call once per script run, outside fragments."""
+    st.html(_STYLE.substitute(css=CARD_CSS))
+
+
+def render_cards(*grids):
+    """Render one or more card grids as a single HTML element."""
+    st.html("".join(grids))
@@ -0,0 +1,302 @@
+"""
+Per-stage timing and memory accounting for the dashboard.
+
+Stages (SharePoint fetch steps, metric computation, each render function)
+record wall time plus optional bytes, rows and cache hit/miss into a
+rolling window of recent samples per stage. The windows live in this
+process only and are summarized as p50/p95/p99 for the admin diagnostics
+panel. Recording is a lock, a deque append and a perf_counter call, so it
+stays on in production. Each timed block is also a span of the rerun's
+trace (see tracing.py) when one is running.
+
+Memory is accounted per session (the frames each script run was handed),
+per shared cache and for the process, and checked against budgets that
+evict caches before the container runs out.
+"""
+import logging
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+from tracing import close_span, open_span
+
+WINDOW = 1000   # samples kept per stage
+
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))
+_local = threading.local()
+
+
+def record(stage, seconds, bytes=None, rows=None, cache_hit=None):
+    sample = {"at": time.time(), "seconds": seconds, "bytes": bytes, "rows": rows, "cache_hit": cache_hit}
+    with _lock:
+        _samples[stage].append(sample)
+
+
+@contextmanager
+def timed(stage, cached=False):
+    """
+    Time the block as `stage`. The yielded dict can be filled with "bytes"
+    and "rows". With cached=True the sample is a cache hit unless
+    note_cache_miss() is called inside the block (i.e. by the cached
+    function's body, which only runs on a miss). After the block the dict
+    also holds the sample's "seconds" and "cache_hit".
+    """
+    fields = {}
+    outer = getattr(_local, "miss", None)
+    _local.miss = False
+    span = open_span(stage)
+    started = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        elapsed = time.perf_counter() - started
+        missed = _local.miss
+        _local.miss = outer if outer is None else (outer or missed)
+        hit = (not missed) if cached else None
+        record(stage, elapsed, cache_hit=hit, **fields)
+        close_span(span, cache_hit=hit, **fields)
+        fields.update(seconds=elapsed, cache_hit=hit)
+
+
+def note_cache_miss():
+    """Mark the enclosing timed(..., cached=True) block as a cache miss."""
+    if getattr(_local, "miss", None) is not None:
+        _local.miss = True
+
+
+def timed_function(stage=None):
+    """Decorator form of timed(); the stage defaults to the function's name."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage or func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def summary():
+    """One row per stage: count, p50/p95/p99/max in ms, bytes and rows per call, cache hit rate."""
+    import numpy as np
+
+    with _lock:
+        snapshot = {stage: list(samples) for stage, samples in _samples.items()}
+
+    rows = []
+    for stage, samples in sorted(snapshot.items()):
+        ms = np.array([s["seconds"] for s in samples]) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        sizes = [s["bytes"] for s in samples if s["bytes"] is not None]
+        counts = [s["rows"] for s in samples if s["rows"] is not None]
+        hits = [s["cache_hit"] for s in samples if s["cache_hit"] is not None]
+        rows.append({
+            "stage": stage,
+            "count": len(samples),
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "max_ms": ms.max(),
+            "bytes": sum(sizes) / len(sizes) if sizes else None,
+            "rows": sum(counts) / len(counts) if counts else None,
+            "cache_hit_rate": sum(hits) / len(hits) if hits else None,
+        })
+    return rows
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+
+
+#----------------------
+# MEMORY
+#----------------------
+
+MIB = 1024 * 1024
+SESSION_IDLE = 3600          # seconds before a quiet session drops out of the accounting
+BUDGET_CHECK_INTERVAL = 30   # seconds between budget checks
+
+logger = logging.getLogger(__name__)
+
+_sessions = {}        # session id -> {"seen": time, "objects": {name: bytes}}
+_tables = {}          # source table -> deep bytes when last loaded
+_resources = {}       # st.cache_resource function -> deep bytes when last built
+_last_budget_check = 0.0
+
+
+def deep_size(obj):
+    """Bytes held by `obj`, counting DataFrame contents and containers' items."""
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_size(k) + deep_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(deep_size(item) for item in obj)
+    return sys.getsizeof(obj)
+
+
+def process_rss():
+    """Resident memory of this process in bytes (peak where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def container_memory_limit():
+    """The cgroup memory limit in bytes, or None outside a limited container."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        # cgroup v1 reports "no limit" as a huge number
+        if value != "max" and int(value) < 1 << 60:
+            return int(value)
+    return None
+
+
+def note_table_size(name, table):
+    """Record the deep size of a freshly loaded source table; returns it."""
+    size = deep_size(table)
+    with _lock:
+        _tables[name] = size
+    return size
+
+
+def table_sizes():
+    with _lock:
+        return dict(_tables)
+
+
+def note_resource_size(name, value):
+    """Record the deep size of a freshly built shared resource; returns the value."""
+    size = deep_size(value)
+    with _lock:
+        _resources[name] = size
+    return value
+
+
+def resource_sizes():
+    with _lock:
+        return dict(_resources)
+
+
+def cache_data_sizes():
+    """Stored bytes (pickled) per st.cache_data function name."""
+    from streamlit.runtime.caching import get_data_cache_stats_provider
+
+    sizes = {}
+    for stat in get_data_cache_stats_provider().get_stats():
+        name = stat.cache_name.rsplit(".", 1)[-1]
+        sizes[name] = sizes.get(name, 0) + stat.byte_length
+    return sizes
+
+
+def shared_cache_sizes():
+    """Bytes per shared cache: pickled entries of cache_data, deep size of cache_resource."""
+    return {**cache_data_sizes(), **resource_sizes()}
+
+
+def start_session_run(session):
+    """Forget what `session` held in its previous run."""
+    with _lock:
+        _sessions[session] = {"seen": time.time(), "objects": {}}
+
+
+def account(session, name, size):
+    """Add `size` bytes held by the session's run under `name`."""
+    with _lock:
+        entry = _sessions.setdefault(session, {"seen": time.time(), "objects": {}})
+        entry["objects"][name] = entry["objects"].get(name, 0) + size
+
+
+def active_sessions(within=300):
+    """Sessions that started a run in the last `within` seconds."""
+    cutoff = time.time() - within
+    with _lock:
+        return sum(entry["seen"] >= cutoff for entry in _sessions.values())
+
+
+def session_memory():
+    """One row per live session: bytes held in its last run and its largest object."""
+    cutoff = time.time() - SESSION_IDLE
+    with _lock:
+        for session in [s for s, entry in _sessions.items() if entry["seen"] < cutoff]:
+            del _sessions[session]
+        sessions = {s: dict(entry["objects"]) for s, entry in _sessions.items()}
+
+    rows = []
+    for session, objects in sessions.items():
+        largest = max(objects, key=objects.get) if objects else None
+        rows.append({"session": session, "bytes": sum(objects.values()), "largest": largest})
+    return sorted(rows, key=lambda row: row["bytes"], reverse=True)
+
+
+def enforce_memory_budget(evictable, process_budget=None, cache_budget=None, force=False):
+    """
+    Evict caches when the process or the caches are over budget (in bytes).
+    `evictable` lists (function name, clear) in the order to give them up.
+    Over the cache budget, caches are cleared in order until the rest fit;
+    over the process budget, the first cache holding anything is cleared.
+    Checks run at most every BUDGET_CHECK_INTERVAL seconds; returns the
+    names evicted.
+    """
+    global _last_budget_check
+
+    with _lock:
+        now = time.monotonic()
+        if not force and now - _last_budget_check < BUDGET_CHECK_INTERVAL:
+            return []
+        _last_budget_check = now
+
+    evicted = []
+    sizes = shared_cache_sizes()
+    total = sum(sizes.values())
+    if cache_budget and total > cache_budget:
+        logger.warning("Caches hold %.0f MiB, over the %.0f MiB budget; evicting", total / MIB, cache_budget / MIB)
+        for name, clear in evictable:
+            if total <= cache_budget:
+                break
+            if sizes.get(name):
+                _evict(name, clear)
+                total -= sizes.pop(name)
+                evicted.append(name)
+
+    rss = process_rss()
+    if process_budget and rss > process_budget:
+        logger.warning("Process uses %.0f MiB, over the %.0f MiB budget; evicting", rss / MIB, process_budget / MIB)
+        for name, clear in evictable:
+            if sizes.get(name):
+                _evict(name, clear)
+                evicted.append(name)
+                break
+
+    if evicted:
+        logger.warning("Evicted caches: %s", ", ".join(evicted))
+    return evicted
+
+
+def _evict(name, clear):
+    clear()
+    with _lock:
+        _resources.pop(name, None)
@@ -0,0 +1,170 @@
+"""
+Weekly 2026 digest for every employee.
+
+A short Monday summary of the numbers most people open the dashboard for:
+hours ± baseline, utilization last month and YTD, vacation remaining, and
+the stale timesheet warning. All employees are computed in one pass
+(compute_2026_employee_table) and each digest is handed to a sink as HTML
+and plain text. Sinks are pluggable; "file" writes them to a directory for
+testing and review.
+
+    python digest.py --snapshot snapshots/2026-10-19 --out digests/
+    python digest.py --sink file --out digests/ --today 2026-10-19
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timedelta
+from html import escape
+from string import Template
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_SUBJECT = Template("Your timesheet week of $week")
+
+_TEXT = Template("""Good morning, $first_name
+
+Your year so far, as of $week:
+
+  Hours ± baseline:        $delta_hours
+  Utilization last month:  $util_last_month ($last_month_label)
+  Utilization YTD:         $util_ytd (target $util_target)
+  Vacation remaining:      $vacation_remaining hrs
+$stale_text""")
+
+_HTML = Template("""<!DOCTYPE html>
+<html lang="en">
+<body style="font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif; color: #111827;">
+<h2 style="margin-bottom: 0;">Good morning, <span style="color:#ED017F;">$first_name</span></h2>
+<p style="margin-top: 0.1rem; color: #374151;">Your year so far, as of $week:</p>
+<table style="border-collapse: collapse;">
+<tr><td style="padding: 0.25rem 1rem 0.25rem 0;">Hours ± baseline</td><td><strong>$delta_hours</strong></td></tr>
+<tr><td style="padding: 0.25rem 1rem 0.25rem 0;">Utilization last month ($last_month_label)</td><td><strong>$util_last_month</strong></td></tr>
+<tr><td style="padding: 0.25rem 1rem 0.25rem 0;">Utilization YTD</td><td><strong style="color:#ED017F;">$util_ytd</strong> (target $util_target)</td></tr>
+<tr><td style="padding: 0.25rem 1rem 0.25rem 0;">Vacation remaining</td><td><strong>$vacation_remaining</strong> hrs</td></tr>
+</table>
+$stale_html
+</body>
+</html>
+""")
+
+_STALE_TEXT = Template("""
+! Your latest timesheet week is $timesheet_date_str. Your timesheet may have
+  missing entries; please make sure it is up to date.
+""")
+
+_STALE_HTML = Template(
+    '<p style="color:#DC2626; font-weight:600;">Your latest timesheet week is $timesheet_date_str. '
+    "Your timesheet may have missing entries; please make sure it is up to date.</p>"
+)
+
+
+#----------------------
+# SINKS
+#----------------------
+
+class FileSink:
+    """Writes each digest to <out_dir>/<email>.html and .txt."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        os.makedirs(out_dir, exist_ok=True)
+
+    def send(self, recipient, subject, html, text):
+        base = os.path.join(self.out_dir, recipient.lower())
+        with open(base + ".html", "w", encoding="utf-8") as f:
+            f.write(html)
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(f"To: {recipient}\nSubject: {subject}\n\n{text}")
+
+    def close(self):
+        pass
+
+
+# name -> factory(args); a sink has send(recipient, subject, html, text) and close()
+SINKS = {
+    "file": lambda args: FileSink(args.out or os.path.join(ROOT, "digests")),
+}
+
+
+#----------------------
+# DIGEST
+#----------------------
+
+def render_digest(record, week):
+    """(subject, html, text) for one row of the employee table."""
+    values = {
+        "week": week,
+        "first_name": record["Full Name"].split(" ")[0],
+        "delta_hours": f"{record['delta_hours']:+.2f}",
+        "util_last_month": f"{record['util_last_month']:.1%}",
+        "last_month_label": record["last_month_label"],
+        "util_ytd": f"{record['util_ytd']:.1%}",
+        "util_target": f"{record['current_util_target']:.1%}",
+        "vacation_remaining": f"{record['vacation_remaining']:.1f}",
+        "timesheet_date_str": record["timesheet_date_str"],
+    }
+    html_values = {name: escape(value) for name, value in values.items()}
+
+    stale = record["is_stale"]
+    text = _TEXT.substitute(values, stale_text=_STALE_TEXT.substitute(values) if stale else "")
+    html = _HTML.substitute(html_values, stale_html=_STALE_HTML.substitute(html_values) if stale else "")
+    return _SUBJECT.substitute(values), html, text
+
+
+def run(tables, sink, today=None):
+    """Compute and deliver every digest; returns a summary."""
+    from timesheet_metrics import compute_2026_employee_table
+
+    today = today or datetime.today()
+    monday = today - timedelta(days=today.weekday())
+    week = monday.strftime("%B %d, %Y")
+    cap_end_date = monday - timedelta(days=1)
+    last_month_label = (cap_end_date.replace(day=1) - timedelta(days=1)).strftime("%B %Y")
+
+    started = time.perf_counter()
+    table = compute_2026_employee_table(**tables, today=today)
+    computed = time.perf_counter()
+
+    sent = skipped = stale = 0
+    for record in table.reset_index().to_dict("records"):
+        if not isinstance(record["Email"], str) or "@" not in record["Email"]:
+            skipped += 1
+            continue
+        subject, html, text = render_digest({**record, "last_month_label": last_month_label}, week)
+        sink.send(record["Email"], subject, html, text)
+        sent += 1
+        stale += bool(record["is_stale"])
+    sink.close()
+
+    return {
+        "sent": sent,
+        "skipped": skipped,
+        "stale": stale,
+        "compute_s": computed - started,
+        "deliver_s": time.perf_counter() - computed,
+    }
+
+
+def main():
+    from sharepoint import load_2026_tables
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sink", choices=sorted(SINKS), default="file")
+    parser.add_argument("--out", help="output directory for the file sink (default: digests/)")
+    parser.add_argument("--secrets", help="Streamlit secrets file with the [sharepoint] section (default: .streamlit/secrets.toml)")
+    parser.add_argument("--snapshot", help="read the tables from this snapshot directory instead of SharePoint")
+    parser.add_argument("--save-snapshot", help="save the fetched tables to this directory")
+    parser.add_argument("--today", type=datetime.fromisoformat, default=None, help="run as of this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    tables = load_2026_tables(args.secrets, snapshot=args.snapshot, save_snapshot_to=args.save_snapshot)
+    stats = run(tables, SINKS[args.sink](args), today=args.today)
+    print(
+        f"{stats['sent']} digests sent ({stats['stale']} with a stale timesheet, {stats['skipped']} without an email)\n"
+        f"  metrics {stats['compute_s']:.2f} s, delivery {stats['deliver_s']:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
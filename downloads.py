@@ -0,0 +1,72 @@
+"""
+Timesheet breakdown downloads.
+
+The firm-wide timesheet is indexed once by employee (name -> row positions),
+so one person's rows are taken straight from the shared frame without
+filtering or copying the rest of it. Files are only built when asked for.
+"""
+import pandas as pd
+
+SHEETS = ["Timesheet", "By Project", "By Month"]
+
+FORMATS = {
+    "CSV": {"extension": "zip", "mime": "application/zip"},
+    "Excel": {"extension": "xlsx", "mime": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+}
+
+
+def employee_row_index(df, name_column="Employee Full Name"):
+    """Row positions of each employee in `df`."""
+    return df.groupby(name_column, sort=False).indices
+
+
+def timesheet_breakdown(df, positions, week_start):
+    """
+    One employee's rows and the summaries behind their numbers, as
+    {sheet name: frame}. Only rows before `week_start` count toward the
+    dashboard; later rows are listed as booked ahead.
+    """
+    rows = df.take(positions)[["Date", "Project No - Title", "Utilization Category", "Sum of Hours"]]
+    rows = rows.rename(columns={"Sum of Hours": "Hours"})
+    rows["Date"] = pd.to_datetime(rows["Date"])
+    rows = rows.sort_values("Date", kind="stable").reset_index(drop=True)
+    rows["Counted"] = rows["Date"] < week_start
+
+    counted = rows[rows["Counted"]]
+    by_project = (
+        counted.groupby(["Utilization Category", "Project No - Title"], as_index=False)["Hours"].sum()
+        .sort_values(["Utilization Category", "Hours"], ascending=[True, False])
+    )
+    by_month = (
+        counted.pivot_table(
+            index=counted["Date"].dt.to_period("M").astype(str).rename("Month"),
+            columns="Utilization Category",
+            values="Hours",
+            aggfunc="sum",
+            fill_value=0,
+        )
+        .reset_index()
+    )
+    by_month.columns.name = None
+
+    return {"Timesheet": rows, "By Project": by_project, "By Month": by_month}
+
+
+def breakdown_file(sheets, fmt):
+    """Encode the breakdown as a zip of CSVs or one xlsx workbook; returns bytes."""
+    from io import BytesIO
+
+    buf = BytesIO()
+    if fmt == "CSV":
+        from zipfile import ZIP_DEFLATED, ZipFile
+
+        with ZipFile(buf, "w", ZIP_DEFLATED) as archive:
+            for name, frame in sheets.items():
+                # Write each CSV straight into the archive rather than via a string
+                with archive.open(f"{name.lower().replace(' ', '_')}.csv", "w") as f:
+                    frame.to_csv(f, index=False, chunksize=5000, encoding="utf-8")
+    else:
+        with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+            for name, frame in sheets.items():
+                frame.to_excel(writer, sheet_name=name, index=False)
+    return buf.getvalue()
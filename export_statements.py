@@ -0,0 +1,245 @@
+"""
+Monthly 2026 statements for every employee.
+
+Computes all employees' metrics in one pass (compute_2026_employee_table)
+and renders one self-contained HTML statement per person on a process pool,
+with the figures the 2026 dashboard shows: hours worked, the adjusted
+baseline breakdown, PD/vacation/sick donuts, flex/OT buckets and
+utilization. An index.html linking every statement is written alongside.
+
+Data is fetched from SharePoint with the credentials in the Streamlit
+secrets file, or read from a snapshot saved with --save-snapshot:
+
+    python export_statements.py
+    python export_statements.py --out statements/2026-09 --workers 8 --today 2026-10-01
+    python export_statements.py --snapshot snapshots/2026-10-19
+"""
+import argparse
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from html import escape
+from string import Template
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_PAGE = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<style>
+body { max-width: 1100px; margin: 2rem auto; padding: 0 1rem; font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif; color: #111827; }
+h1 { margin-bottom: 0; }
+h1 span { color: #ED017F; }
+.subtitle { margin-top: 0.25rem; color: #6b7280; }
+.donuts { display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; margin-bottom: 1rem; text-align: center; }
+.donuts img { width: 200px; max-width: 100%; }
+table { border-collapse: collapse; width: 100%; }
+th, td { padding: 0.4rem 0.6rem; border-bottom: 1px solid #e5e7eb; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+$card_css
+</style>
+</head>
+<body>
+$body
+</body>
+</html>
+""")
+
+
+#----------------------
+# DATA
+#----------------------
+
+def statement_records(tables, today=None):
+    """One plain dict per employee with everything a statement shows."""
+    from timesheet_metrics import compute_2026_employee_table
+
+    table = compute_2026_employee_table(**tables, today=today)
+    records = table.reset_index().to_dict("records")
+    slugs = [_slug(record["Full Name"]) or "employee" for record in records]
+    counts = Counter(slugs)
+    taken = {slug for slug, count in counts.items() if count == 1}
+    for i, (record, slug) in enumerate(zip(records, slugs)):
+        # Names that slug alike get their email's local part, else the row number, so no file is shared
+        name = slug
+        if counts[slug] > 1:
+            email = record.get("Email")
+            name = f"{slug}-{_slug(email.split('@')[0])}" if isinstance(email, str) and email.strip() else None
+            if name is None or name in taken:
+                name = f"{slug}-{i + 1}"
+            taken.add(name)
+        record["file"] = name + ".html"
+    return records
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-")
+
+
+#----------------------
+# RENDERING (runs in the pool)
+#----------------------
+
+def _donut(used, remaining, title, footer, booked=0):
+    from base64 import b64encode
+
+    from figures import donut_chart_svg
+
+    # A pie can't draw negative or all-zero wedges; show an empty ring instead
+    remaining = max(remaining, 0)
+    if used + booked + remaining <= 0:
+        remaining = 1
+    svg = donut_chart_svg(used, remaining, title, footer, booked=booked)
+    return f'<div><img alt="{escape(title)}" src="data:image/svg+xml;base64,{b64encode(svg.encode()).decode()}"></div>'
+
+
+def render_statement(record, period_label, out_dir):
+    """Write one employee's statement and return (name, file, bytes)."""
+    from cards import CARD_CSS, card_grid, metric_card, stats_card, summary_card
+
+    r = record
+    body = [
+        f'<h1>Statement for <span>{escape(r["Full Name"])}</span></h1>',
+        f'<p class="subtitle">{escape(str(r["Legal Office"]))} &middot; as of {escape(period_label)}</p>',
+        card_grid([
+            metric_card("Hours Worked", r["total_working_hours"], parts=[
+                ("Billable Project", r["project_hours"]),
+                ("Internal + Proposal", r["internalplusproposal_hours"]),
+                ("Overhead", r["overhead_hours"]),
+            ], operator="+"),
+            metric_card("Adjusted Baseline", r["adjusted_target"], parts=[
+                ("Baseline", r["target_hours"]),
+                ("Vacation", r["pto_vacation"]),
+                ("Sick/Medical", r["pto_sick"]),
+                ("Stat", r["combined_closed"]),
+                ("Unpaid", r["unpaid_hours"]),
+            ], operator="-"),
+            metric_card("Hours ± Baseline", r["delta_hours"], parts=[
+                ("Hours Worked", r["total_working_hours"]),
+                ("Adjusted Baseline", r["adjusted_target"]),
+            ], operator="-"),
+        ], columns="repeat(3, 1fr)"),
+        card_grid([
+            metric_card("Flex Bucket", r["flex_bucket"]),
+            metric_card("OT Bucket", r["ot_bucket"]),
+        ], columns="repeat(2, 1fr)"),
+        '<div class="donuts">'
+        + _donut(r["prod_hours"], 30 - r["prod_hours"], "PD", "Max: 30 hrs")
+        + _donut(
+            r["vacation_used"], r["vacation_remaining"], "Vacation",
+            f'Max: {r["vacation_max"]:.1f} hrs', booked=r["future_vacation_hours"],
+        )
+        + _donut(r["sick_used"], r["sick_remaining"], "Sick / Medical", "Max: 37.5 hrs")
+        + "</div>",
+        card_grid([
+            summary_card([
+                f'Utilization YTD is <strong class="kpi-accent">{r["util_ytd"]:.1%}</strong> '
+                f'and last month was <strong>{r["util_last_month"]:.1%}</strong>',
+                f'Average utilization target YTD is <strong class="kpi-accent">{r["util_target"]:.1%}</strong> '
+                f'and current utilization target is <strong class="kpi-accent">{r["current_util_target"]:.1%}</strong>',
+                f'Billable Project hours last month: <strong>{r["project_last_month"]:.2f}</strong> '
+                f'&nbsp;/&nbsp; Baseline: <strong>{r["adjusted_target_last_month"]:.2f}</strong>',
+                f'Billable Project hours YTD: <strong>{r["project_ytd"]:.2f}</strong> '
+                f'&nbsp;/&nbsp; Baseline: <strong>{r["adjusted_target_ytd"]:.2f}</strong>',
+            ]),
+            stats_card("Additional Time Off", [
+                ("Flex Used", r["flex_used"]),
+                ("Flex Booked", r["flex_booked"]),
+                ("OT Used", r["ot_used"]),
+                ("OT Booked", r["ot_booked"]),
+                ("Unpaid", r["unpaid_hours"]),
+            ]),
+        ], columns="1.6fr 0.8fr"),
+    ]
+
+    html = _PAGE.substitute(title=escape(f'{r["Full Name"]} - {period_label}'), card_css=CARD_CSS, body="\n".join(body))
+    with open(os.path.join(out_dir, r["file"]), "w", encoding="utf-8") as f:
+        f.write(html)
+    return r["Full Name"], r["file"], len(html)
+
+
+def _render_one(args):
+    return render_statement(*args)
+
+
+def write_index(records, period_label, out_dir):
+    rows = "\n".join(
+        f'<tr><td><a href="{escape(r["file"])}">{escape(r["Full Name"])}</a></td>'
+        f'<td>{escape(str(r["Legal Office"]))}</td>'
+        f'<td>{r["total_working_hours"]:.2f}</td><td>{r["adjusted_target"]:.2f}</td>'
+        f'<td>{r["delta_hours"]:.2f}</td><td>{r["util_ytd"]:.1%}</td></tr>'
+        for r in sorted(records, key=lambda r: r["Full Name"])
+    )
+    body = (
+        f"<h1>Statements</h1><p class=\"subtitle\">{len(records)} employees &middot; as of {escape(period_label)}</p>"
+        "<table><tr><th>Name</th><th>Office</th><th>Hours Worked</th><th>Adjusted Baseline</th>"
+        f"<th>Hours ± Baseline</th><th>Utilization YTD</th></tr>\n{rows}\n</table>"
+    )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(_PAGE.substitute(title="Statements", card_css="", body=body))
+
+
+#----------------------
+# EXPORT
+#----------------------
+
+def export(tables, out_dir, workers=None, today=None):
+    """Render every statement plus the index into `out_dir`; returns a throughput summary."""
+    from datetime import timedelta
+
+    today = today or datetime.today()
+    as_of = today - timedelta(days=today.weekday() + 1)   # Sunday last week, the data cutoff
+    period_label = as_of.strftime("%B %d, %Y")
+    os.makedirs(out_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    records = statement_records(tables, today=today)
+    computed = time.perf_counter()
+
+    workers = workers or os.cpu_count() or 1
+    jobs = [(record, period_label, out_dir) for record in records]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        written = list(pool.map(_render_one, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+    write_index(records, period_label, out_dir)
+    finished = time.perf_counter()
+
+    return {
+        "employees": len(written),
+        "bytes": sum(size for _, _, size in written),
+        "compute_s": computed - started,
+        "render_s": finished - computed,
+        "per_second": len(written) / (finished - started) if finished > started else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--secrets", help="Streamlit secrets file with the [sharepoint] section (default: .streamlit/secrets.toml)")
+    parser.add_argument("--snapshot", help="read the tables from this snapshot directory instead of SharePoint")
+    parser.add_argument("--save-snapshot", help="save the fetched tables to this directory")
+    parser.add_argument("--out", help="output directory (default: statements/<YYYY-MM>)")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--today", type=datetime.fromisoformat, default=None, help="run as of this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    today = args.today or datetime.today()
+    out_dir = args.out or os.path.join(ROOT, "statements", today.strftime("%Y-%m"))
+
+    from sharepoint import load_2026_tables
+
+    tables = load_2026_tables(args.secrets, snapshot=args.snapshot, save_snapshot_to=args.save_snapshot)
+    stats = export(tables, out_dir, workers=args.workers, today=today)
+    print(
+        f"{stats['employees']} statements ({stats['bytes'] / 1024:.0f} KiB) in {out_dir}\n"
+        f"  metrics {stats['compute_s']:.2f} s, rendering {stats['render_s']:.2f} s, "
+        f"{stats['per_second']:.1f} statements/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
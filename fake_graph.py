@@ -0,0 +1,359 @@
+"""
+Local stand-in for the Microsoft login and Graph endpoints the dashboard uses.
+
+Serves workbooks from a local directory over HTTPS (self-signed, so msal
+accepts the authority) with the endpoints get_sharepoint_file calls, plus
+item metadata with eTags and JSON $batch:
+
+    POST /{tenant}/oauth2/v2.0/token                client credentials token
+    GET  /v1.0/sites/{host}:/{path}                 site id
+    GET  /v1.0/sites/{site}/drive/root:/{path}      item metadata (eTag, version, size)
+    GET  /v1.0/sites/{site}/drive/root:/{path}:/content
+    POST /v1.0/$batch
+    GET  /_stats                                    request counts by route and status
+
+Latency, throttling (429 + Retry-After) and failures (503) are configurable
+and seeded, so fetch-path changes (caching, concurrency, retries) can be
+measured offline and repeatably. Replacing a file bumps its version and
+eTag; content requests honour If-None-Match.
+
+    python fake_graph.py --root synthetic/2026 --latency-ms 80 --throttle-rate 0.05
+
+then start the app (or an offline job) with the printed environment, e.g.
+
+    SHAREPOINT_LOGIN_URL=https://localhost:8443 SHAREPOINT_GRAPH_URL=https://localhost:8443/v1.0 \\
+    REQUESTS_CA_BUNDLE=/tmp/fake-graph/cert.pem streamlit run streamlit1.py
+
+A file path in secrets is looked up under --root, falling back to its file
+name, so the xlsx written by synthetic.py can be served as is.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import ssl
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+TOKEN_LIFETIME = 3599
+
+_TOKEN = re.compile(r"^/([^/]+)/oauth2/v2\.0/token$")
+_OPENID = re.compile(r"^/([^/]+)/v2\.0/\.well-known/openid-configuration$")
+_SITE = re.compile(r"^/v1\.0/sites/([^/:]+):(/.*)$")
+_ITEM = re.compile(r"^/v1\.0/sites/([^/]+)/drive/root:/(.+?)(:/content)?$")
+
+
+def self_signed_cert(directory, host="localhost"):
+    """Write a self-signed certificate and key for `host`; returns (cert, key) paths."""
+    import ipaddress
+    from datetime import timedelta
+
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host)])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=30))
+        .add_extension(x509.SubjectAlternativeName([
+            x509.DNSName(host), x509.IPAddress(ipaddress.ip_address("127.0.0.1")),
+        ]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .add_extension(x509.SubjectKeyIdentifier.from_public_key(key.public_key()), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+
+    os.makedirs(directory, exist_ok=True)
+    cert_path, key_path = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+        ))
+    return cert_path, key_path
+
+
+class FakeGraph:
+    """
+    The server and its behaviour. Use as a context manager (or start/stop)
+    to run it on a background thread, e.g. from a benchmark:
+
+        with FakeGraph(root, latency_ms=50) as graph:
+            os.environ.update(graph.environ())
+    """
+
+    def __init__(self, root, host="localhost", port=0, latency_ms=0.0, jitter_ms=0.0,
+                 throttle_rate=0.0, throttle_every=0, retry_after=1, failure_rate=0.0,
+                 seed=0, cert_dir=None):
+        self.root = root
+        self.host = host
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.failure_rate = failure_rate
+        self.stats = Counter()
+        self.tokens = set()
+        self._versions = {}   # path -> (signature, version)
+        self._random = random.Random(seed)
+        self._requests = 0
+        self._lock = threading.Lock()
+
+        self.cert_file, key_file = self_signed_cert(cert_dir or tempfile.mkdtemp(prefix="fake-graph-"), host)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.cert_file, key_file)
+        self.server = ThreadingHTTPServer((host, port), _handler(self))
+        self.server.daemon_threads = True
+        self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        self.port = self.server.server_address[1]
+        self.url = f"https://{host}:{self.port}"
+
+    def environ(self):
+        """Environment variables that point get_sharepoint_file at this server."""
+        return {
+            "SHAREPOINT_LOGIN_URL": self.url,
+            "SHAREPOINT_GRAPH_URL": f"{self.url}/v1.0",
+            "REQUESTS_CA_BUNDLE": self.cert_file,
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    #----------------------
+    # BEHAVIOUR
+    #----------------------
+
+    def fault(self):
+        """
+        The injected response for the next request, if any: (429, seconds)
+        for throttling or (503, None) for a failure. Draws are seeded, so the
+        same request order gives the same faults.
+        """
+        with self._lock:
+            self._requests += 1
+            draw = self._random.random()
+            if self.throttle_every and self._requests % self.throttle_every == 0:
+                return 429, self.retry_after
+            if draw < self.throttle_rate:
+                return 429, self.retry_after
+            if draw < self.throttle_rate + self.failure_rate:
+                return 503, None
+            delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(delay, 0) / 1000)
+        return None
+
+    def resolve(self, path):
+        """Local file for a drive path: under root, else by file name."""
+        candidate = os.path.join(self.root, path)
+        if not os.path.isfile(candidate):
+            candidate = os.path.join(self.root, os.path.basename(path))
+        return candidate if os.path.isfile(candidate) else None
+
+    def item(self, path):
+        """Drive item metadata; the version goes up whenever the file changes."""
+        local = self.resolve(path)
+        if local is None:
+            return None
+        info = os.stat(local)
+        signature = (info.st_mtime_ns, info.st_size)
+        with self._lock:
+            previous, version = self._versions.get(path, (None, 0))
+            if previous != signature:
+                version += 1
+                self._versions[path] = (signature, version)
+        item_id = hashlib.sha1(path.encode()).hexdigest()[:16].upper()
+        return {
+            "id": item_id,
+            "name": os.path.basename(path),
+            "eTag": f'"{{{item_id}}},{version}"',
+            "cTag": f'"c:{{{item_id}}},{version}"',
+            "size": info.st_size,
+            "lastModifiedDateTime": datetime.fromtimestamp(info.st_mtime, timezone.utc).isoformat().replace("+00:00", "Z"),
+            "file": {"mimeType": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"},
+            "version": version,
+            "_local": local,
+        }
+
+    def handle(self, method, path, headers, body):
+        """One request -> (status, headers, body bytes); shared by HTTP and $batch."""
+        path = unquote(urlsplit(path).path)
+
+        if method == "GET" and (match := _OPENID.match(path)):
+            tenant = match.group(1)
+            return _json(200, {
+                "issuer": f"{self.url}/{tenant}/v2.0",
+                "authorization_endpoint": f"{self.url}/{tenant}/oauth2/v2.0/authorize",
+                "token_endpoint": f"{self.url}/{tenant}/oauth2/v2.0/token",
+            }, route="openid")
+
+        if method == "POST" and _TOKEN.match(path):
+            token = uuid.uuid4().hex
+            with self._lock:
+                self.tokens.add(token)
+            return _json(200, {"token_type": "Bearer", "expires_in": TOKEN_LIFETIME, "access_token": token}, route="token")
+
+        if headers.get("Authorization", "").removeprefix("Bearer ") not in self.tokens:
+            return _json(401, {"error": {"code": "InvalidAuthenticationToken", "message": "Access token is empty or invalid."}}, route="unauthorized")
+
+        if method == "POST" and path == "/v1.0/$batch":
+            return self.batch(json.loads(body or b"{}"))
+
+        if method == "GET" and (match := _SITE.match(path)):
+            host, site_path = match.groups()
+            digest = hashlib.sha1(f"{host}{site_path}".encode()).hexdigest()
+            site_id = f"{host},{uuid.UUID(digest[:32])},{uuid.UUID(digest[8:40])}"
+            return _json(200, {"id": site_id, "name": site_path.rsplit("/", 1)[-1], "webUrl": f"https://{host}{site_path}"}, route="site")
+
+        if method == "GET" and (match := _ITEM.match(path)):
+            _, drive_path, content = match.groups()
+            item = self.item(drive_path)
+            if item is None:
+                return _json(404, {"error": {"code": "itemNotFound", "message": "The resource could not be found."}}, route="item")
+            local = item.pop("_local")
+            if not content:
+                return _json(200, item, route="item")
+            if headers.get("If-None-Match") == item["eTag"]:
+                return 304, {"ETag": item["eTag"]}, b"", "content"
+            with open(local, "rb") as f:
+                data = f.read()
+            return 200, {"Content-Type": item["file"]["mimeType"], "ETag": item["eTag"]}, data, "content"
+
+        return _json(400, {"error": {"code": "invalidRequest", "message": f"Unsupported {method} {path}"}}, route="unsupported")
+
+    def batch(self, payload):
+        """JSON batching: each sub-request runs (and is throttled) on its own."""
+        responses = []
+        for request in payload.get("requests", [])[:20]:
+            url = request["url"] if request["url"].startswith("/v1.0") else "/v1.0" + request["url"]
+            headers = {"Authorization": "Bearer " + next(iter(self.tokens), ""), **request.get("headers", {})}
+            status, out_headers, body, route = self.faulted(request.get("method", "GET"), url, headers, None)
+            if out_headers.get("Content-Type", "").startswith("application/json"):
+                body = json.loads(body) if body else None
+            elif body:
+                body = base64.b64encode(body).decode()   # Graph returns binary bodies base64-encoded
+            responses.append({"id": request["id"], "status": status, "headers": out_headers, "body": body})
+            self.count(route, status)
+        return _json(200, {"responses": responses}, route="batch")
+
+    def faulted(self, method, path, headers, body):
+        fault = self.fault()
+        if fault:
+            status, retry_after = fault
+            if status == 429:
+                out = _json(429, {"error": {"code": "TooManyRequests", "message": "Please retry after"}}, route="throttled")
+                out[1]["Retry-After"] = str(retry_after)
+                return out
+            return _json(503, {"error": {"code": "serviceNotAvailable", "message": "Service unavailable"}}, route="failed")
+        return self.handle(method, path, headers, body)
+
+    def count(self, route, status):
+        with self._lock:
+            self.stats[f"{route} {status}"] += 1
+
+
+def _json(status, payload, route):
+    return status, {"Content-Type": "application/json"}, json.dumps(payload).encode(), route
+
+
+def _handler(graph):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, method):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path == "/_stats":
+                with graph._lock:
+                    status, headers, data, route = _json(200, dict(graph.stats), route="stats")
+            elif method == "POST" and self.path.startswith("/v1.0/$batch"):
+                # The batch itself is never throttled; its sub-requests are
+                status, headers, data, route = graph.handle(method, self.path, dict(self.headers), body)
+            else:
+                status, headers, data, route = graph.faulted(method, self.path, dict(self.headers), body)
+            if route != "stats":
+                graph.count(route, status)
+
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._respond("GET")
+
+        def do_POST(self):
+            self._respond("POST")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", required=True, help="directory of workbooks to serve")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8443)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added to every request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="± random spread on the latency")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of requests answered 429")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer every Nth request 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on a 429")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of requests answered 503")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cert-dir", help="where to write the self-signed certificate (default: a temp dir)")
+    args = parser.parse_args()
+
+    graph = FakeGraph(
+        args.root, host=args.host, port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        throttle_rate=args.throttle_rate, throttle_every=args.throttle_every, retry_after=args.retry_after,
+        failure_rate=args.failure_rate, seed=args.seed, cert_dir=args.cert_dir,
+    )
+    print(f"Serving {args.root} at {graph.url}; point the app at it with:")
+    for name, value in graph.environ().items():
+        print(f"  export {name}={value}")
+    try:
+        graph.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        graph.server.server_close()
+        print(json.dumps(dict(graph.stats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
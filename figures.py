@@ -0,0 +1,276 @@
+"""
+Donut figure builders.
+
+Builders are memoized on their inputs, so a rerun with unchanged numbers
+reuses the figure instead of rebuilding it. Plotly builders return a shared
+go.Figure: st.plotly_chart re-validates dict specs, so a ready Figure is its
+cheapest input, and callers must treat it as read-only. The static 2025
+donut is returned as SVG markup. Caches are bounded LRUs.
+"""
+from functools import lru_cache, wraps
+
+FIGURE_CACHE_SIZE = 256
+
+
+def _cache_key(value):
+    # numpy scalars and float noise would otherwise defeat the cache
+    if isinstance(value, float) or hasattr(value, "item"):
+        return round(float(value), 4)
+    return value
+
+
+def cached_figure(builder):
+    """Bounded memo cache for a figure builder, keyed by its (normalized) inputs."""
+    cached = lru_cache(maxsize=FIGURE_CACHE_SIZE)(builder)
+
+    @wraps(builder)
+    def wrapper(*args, **kwargs):
+        return cached(
+            *map(_cache_key, args),
+            **{name: _cache_key(value) for name, value in kwargs.items()}
+        )
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+#----------------------
+# 2025 (matplotlib)
+#----------------------
+
+@cached_figure
+def donut_chart_svg(used, remaining, title, footer, booked=0):
+    """
+    Static donut (2025 dashboard, exported statements), rendered once to SVG
+    markup. A non-zero `booked` adds a hatched segment after `used`.
+    """
+    from io import StringIO
+    from matplotlib.figure import Figure
+
+    # A bare Figure is never registered with pyplot, so nothing is left
+    # behind in its global figure list once the SVG is written
+    fig = Figure(figsize=(1, 1))
+    ax = fig.subplots()
+
+    values, colors = [used, remaining], ["#ED017F", "#F7B3D6"]
+    if booked:
+        values.insert(1, booked)
+        colors.insert(1, "#F7B3D6")
+
+    wedges, _ = ax.pie(
+        values,
+        colors=colors,
+        labels=None,
+        startangle=90,
+        counterclock=False,
+        wedgeprops=dict(width=0.28),
+    )
+    if booked:
+        wedges[1].set_hatch("//////")
+        wedges[1].set_edgecolor("#ED017F")
+
+    ax.text(
+        0, 0,
+        f"{used:.1f}",
+        ha="center",
+        va="center",
+        fontsize=10,
+        fontweight="600",
+        color="#111827"
+    )
+    ax.set_title(title, fontsize=7,fontweight="600",pad=6)
+    ax.axis("equal")
+    ax.axis("off")
+
+    fig.text(
+        0.5,
+        0.02,
+        footer,
+        ha="center",
+        va="bottom",
+        fontsize=5,
+        color="#6b7280"
+    )
+
+    buf = StringIO()
+    fig.savefig(buf, format="svg", bbox_inches="tight")
+    fig.clear()
+    return buf.getvalue()
+
+
+#----------------------
+# 2026 (plotly)
+#----------------------
+
+def title_info_annotation(text, x=0.63):
+        return dict(
+            text="ⓘ",
+            x=x,
+            y=1.02,
+            xref="paper",
+            yref="paper",
+            showarrow=False,
+            font=dict(size=14, color="#6B7280"),
+            hovertext=text,
+            hoverlabel=dict(
+                bgcolor="white",
+                font_size=12,
+                font_color="#111827"
+            ),
+        )
+
+
+@cached_figure
+def donut_chart_plotly(used, remaining, title, footer, annotation_text):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        data=[
+            go.Pie(
+                values=[used, remaining],
+                labels=["Used", "Remaining"],
+                hole=0.72,
+                direction="clockwise",
+                marker=dict(
+                    colors=["#ED017F", "#F7B3D6"]
+                ),
+                textinfo="none",
+                hovertemplate="%{label}: %{value:.2f} hrs<extra></extra>",
+            )
+        ]
+    )
+
+    fig.update_layout(
+        title=dict(
+            text=title,
+            y=1,
+            x=0.5,
+            xanchor="center",
+            yanchor="top",
+            font=dict(size=25, color="#111827"),
+        ),
+        annotations=[
+            title_info_annotation(annotation_text),
+            dict(
+                text=f"<b>{used:.2f}</b>",
+                x=0.5,
+                y=0.5,
+                font=dict(size=25, color="#111827"),
+                showarrow=False,
+            ),
+            dict(
+                text=footer,
+                x=0.5,
+                y=-0.25,
+                font=dict(size=15, color="#6b7280"),
+                showarrow=False,
+            ),
+        ],
+        showlegend=False,
+        margin=dict(t=40, b=35, l=0, r=0),
+        height=240,
+    )
+
+    return fig
+
+
+@cached_figure
+def donut_chart_plotly_vacation(
+    used,
+    booked,
+    remaining,
+    title,
+    footer,
+    annotation_text
+):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        data=[
+            go.Pie(
+                values=[used, booked, remaining],
+                labels=["Used", "Future Booked", "Remaining"],
+                hole=0.72,
+                marker=dict(
+                    colors=[
+                        "#ED017F",   
+                        "#ED017F",
+                        "#F7B3D6"    
+                    ],
+
+                    pattern=dict(
+                        shape=["", "/", ""],   # <-- pattern only on Future Booked
+                        fgcolor="#ED017F",
+                        solidity=0.5
+                    )
+                ),
+                textinfo="none",
+                hovertemplate="%{label}: %{value:.2f} hrs<extra></extra>",
+            )
+        ]
+    )
+
+    fig.update_layout(
+        title=dict(
+            text=title,
+            y=1,
+            x=0.5,
+            xanchor="center",
+            yanchor="top",
+            font=dict(size=25, color="#111827"),
+        ),
+        annotations=[
+            title_info_annotation(annotation_text),
+        dict(
+                text=f"<b>{used + booked:.2f}</b>",
+                x=0.5,
+                y=0.5,
+                font=dict(size=25, color="#111827"),
+                showarrow=False,
+            ),
+        dict(
+                text=footer,
+                x=0.5,
+                y=-0.25,
+                font=dict(size=15, color="#6b7280"),
+                showarrow=False,
+            ),
+
+
+        dict(
+            x=0.70,
+            y=0.62,
+            xanchor="left",
+            yanchor="middle",
+            text=f"<span style='color:#ED017F;'>■</span> Used: {used:.1f} hrs",
+            showarrow=False,
+            font=dict(size=13, color="#111827"),
+        ),
+        dict(
+            x=0.70,
+            y=0.52,
+            xanchor="left",
+            yanchor="middle",
+            text=f"<span style='color:#ED017F;'>▧</span> Future Booked: {booked:.1f} hrs",
+            showarrow=False,
+            font=dict(size=13, color="#111827"),
+        ),
+        dict(
+            x=0.70,
+            y=0.42,
+            xanchor="left",
+            yanchor="middle",
+            text=f"<span style='color:#F7B3D6;'>■</span> Remaining: {remaining:.1f} hrs",
+            showarrow=False,
+            font=dict(size=13, color="#111827"),
+        ),
+    ],
+
+
+        showlegend=False,
+        margin=dict(t=40, b=35, l=0, r=0),
+        height=240,
+    )
+
+    return fig
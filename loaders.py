@@ -0,0 +1,312 @@
+"""
+Cached loaders for the dashboard's shared state.
+
+The SharePoint tables, each user's state and the all-employee indexes and
+aggregates, cached per process with st.cache_data / st.cache_resource. The
+build_* caches are keyed on the version of the tables they are built from
+(load_2025_tables / load_2026_tables); the load_* functions next to them
+look up the current version and tables.
+
+Streamlit keys a cache on the function's module and source, so the loaders
+live here rather than in the script: the app (run as __main__) and the
+boot warmup (warmup.py, outside any session) then share the same entries.
+"""
+from datetime import date, datetime, time, timedelta
+from uuid import uuid4
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from sharepoint import get_sharepoint_file, read_snapshot_table
+from timesheet_metrics import (
+    compute_2025_state,
+    compute_2026_day_grid,
+    compute_2026_employee_table,
+    compute_2026_office_cube,
+    compute_2026_project_weeks,
+    compute_2026_projection,
+    compute_2026_state,
+    compute_2026_time_off_capacity,
+    compute_utilization_distribution,
+    data_version,
+    manager_emails,
+    roll_up_office_cube,
+)
+from downloads import breakdown_file, employee_row_index, timesheet_breakdown
+from diagnostics import (
+    MIB,
+    account,
+    container_memory_limit,
+    note_cache_miss,
+    note_resource_size,
+    note_table_size,
+    table_sizes,
+    timed,
+)
+from metrics import observe_cached_load
+
+#----------------------
+# SHARED STATE
+#----------------------
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_sharepoint_table(path_key, sheet_name):
+    note_cache_miss()
+    # A snapshot directory per year (snapshot_2026 = "...") stands in for
+    # SharePoint, for local runs and load tests
+    snapshot = st.secrets["sharepoint"].get(f"snapshot_{path_key[-4:]}")
+    if snapshot:
+        table = read_snapshot_table(snapshot, path_key)
+    else:
+        table = get_sharepoint_file(
+            client_id=st.secrets["sharepoint"]["client_id"],
+            client_secret=st.secrets["sharepoint"]["client_secret"],
+            tenant_id=st.secrets["sharepoint"]["tenant_id"],
+            site_url=st.secrets["sharepoint"]["site_url"],
+            file_path=st.secrets["sharepoint"][path_key],
+            sheet_name=sheet_name
+        )
+    note_table_size(path_key, table)
+    return table
+
+
+def load_sharepoint_table(path_key, sheet_name):
+    with timed(f"load {path_key}", cached=True) as stage:
+        table = fetch_sharepoint_table(path_key, sheet_name)
+        stage["rows"] = len(table)
+    observe_cached_load(path_key, stage)
+    # Every call hands this session its own copy of the table
+    account_session(path_key, table_sizes().get(path_key, 0))
+    return table
+
+
+# Each year's tables as (path key, sheet), in the order the compute functions take them
+TABLES = {
+    "2025": [("userfig_path_2025", "in"), ("timesheet_path_2025", "in"), ("allowance_path_2025", "in")],
+    "2026": [("userfig_path_2026", "PQ"), ("timesheet_path_2026", "PQ"), ("allowance_path_2026", "PQ"), ("flexot_path_2026", "PQ")],
+}
+
+
+def _load_tables(year):
+    tables = {path_key: load_sharepoint_table(path_key, sheet_name) for path_key, sheet_name in TABLES[year]}
+    return data_version(*tables.values()), tables
+
+
+# A year's tables, shared read-only under one content version. Every cache
+# built from them is keyed on that version, so a refresh replaces the
+# per-user state and the shared aggregates together. Only these read the
+# table caches, whose entries are filled just before them and so have
+# expired by the time they refresh.
+@st.cache_resource(ttl=3600, show_spinner=False)
+def load_2025_tables():
+    return note_resource_size("load_2025_tables", _load_tables("2025"))
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def load_2026_tables():
+    return note_resource_size("load_2026_tables", _load_tables("2026"))
+
+
+@st.cache_data(ttl=3600, show_spinner="Loading your dashboard...")
+def build_2025_state(version, email, _tables):
+    note_cache_miss()
+    with timed("compute 2025 state"):
+        return compute_2025_state(*_tables.values(), email)
+
+
+def load_2025_state(email):
+    version, tables = load_2025_tables()
+    return build_2025_state(version, email, tables)
+
+
+@st.cache_data(ttl=3600, show_spinner="Loading your dashboard...")
+def build_2026_state(version, email, _tables):
+    note_cache_miss()
+    with timed("compute 2026 state"):
+        return compute_2026_state(*_tables.values(), email)
+
+
+def load_2026_state(email):
+    version, tables = load_2026_tables()
+    return build_2026_state(version, email, tables)
+
+
+@st.cache_data(ttl=3600, show_spinner="Loading your team...")
+def build_2026_employee_table(version, _tables):
+    # Every employee in one pass, shared by all managers
+    return compute_2026_employee_table(*_tables.values())
+
+
+def load_2026_employee_table():
+    version, tables = load_2026_tables()
+    return build_2026_employee_table(version, tables)
+
+
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=2)
+def build_2026_managers(version, _tables):
+    # Who gets the team view, checked on every rerun without touching the employee table
+    return manager_emails(_tables["userfig_path_2026"])
+
+
+def load_2026_managers():
+    version, tables = load_2026_tables()
+    return build_2026_managers(version, tables)
+
+
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=2)
+def build_2026_employee_rows(version, _df):
+    return note_resource_size("build_2026_employee_rows", employee_row_index(_df))
+
+
+def load_2026_timesheet_index():
+    # The shared, read-only timesheet of the current version, with each
+    # employee's rows. A resource is handed out as is, where cache_data would
+    # copy the frame
+    version, tables = load_2026_tables()
+    df = tables["timesheet_path_2026"]
+    return version, df, build_2026_employee_rows(version, df)
+
+
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=2)
+def build_2026_project_weeks(version, _df):
+    # Employee x project x week, built once per data version and only sliced afterwards
+    return note_resource_size("build_2026_project_weeks", compute_2026_project_weeks(_df))
+
+
+def load_2026_project_weeks():
+    version, df, _ = load_2026_timesheet_index()
+    return build_2026_project_weeks(version, df)
+
+
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=2)
+def build_2026_day_grid(version, _df):
+    # Everyone's 366-day calendar as dense arrays; a user's view is one row
+    return note_resource_size("build_2026_day_grid", compute_2026_day_grid(_df))
+
+
+def load_2026_day_grid():
+    version, df, _ = load_2026_timesheet_index()
+    return build_2026_day_grid(version, df)
+
+
+@st.cache_resource(ttl=3600, show_spinner=False, max_entries=2)
+def build_2026_time_off_capacity(version, _tables):
+    # Prefix sums of bookable hours for everyone; a planned range is one lookup.
+    # Keyed like the state and projection the planner combines it with
+    capacity = compute_2026_time_off_capacity(_tables["userfig_path_2026"], _tables["timesheet_path_2026"])
+    return note_resource_size("build_2026_time_off_capacity", capacity)
+
+
+def load_2026_time_off_capacity():
+    version, tables = load_2026_tables()
+    return build_2026_time_off_capacity(version, tables)
+
+
+@st.cache_data(ttl=3600, show_spinner="Preparing your download...", max_entries=256)
+def build_2026_breakdown_file(version, emp_name, fmt, week_start, _df, _index):
+    # Keyed on the week too, so a file built last week is not served after Monday
+    sheets = timesheet_breakdown(_df, _index.get(emp_name, []), datetime.combine(week_start, time()))
+    return breakdown_file(sheets, fmt)
+
+
+def load_2026_breakdown_file(emp_name, fmt):
+    today = date.today()
+    version, df, index = load_2026_timesheet_index()
+    return build_2026_breakdown_file(version, emp_name, fmt, today - timedelta(days=today.weekday()), df, index)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_2026_projection(version, _tables):
+    # Simulated for everyone in one batch, alongside the employee table
+    return compute_2026_projection(
+        build_2026_employee_table(version, _tables),
+        _tables["userfig_path_2026"],
+        _tables["timesheet_path_2026"],
+        _tables["flexot_path_2026"],
+    )
+
+
+def load_2026_projection():
+    version, tables = load_2026_tables()
+    return build_2026_projection(version, tables)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_2026_utilization_distribution(version, _tables):
+    table = build_2026_employee_table(version, _tables)
+    return compute_utilization_distribution(table), table["Legal Office"].to_dict()
+
+
+def load_2026_utilization_distribution():
+    version, tables = load_2026_tables()
+    return build_2026_utilization_distribution(version, tables)
+
+
+@st.cache_data(ttl=3600, show_spinner="Loading office rollups...")
+def build_2026_office_cube(version, _tables):
+    return compute_2026_office_cube(
+        _tables["userfig_path_2026"],
+        _tables["timesheet_path_2026"],
+        _tables["allowance_path_2026"],
+    )
+
+
+def load_2026_office_cube():
+    version, tables = load_2026_tables()
+    return version, build_2026_office_cube(version, tables)
+
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=64)
+def load_2026_office_rollup(version, freq, offices, _cube):
+    # Keyed on the data version, so filter changes re-aggregate the small
+    # daily cube and a data refresh never serves an old rollup
+    return roll_up_office_cube(_cube, freq, list(offices))
+
+
+#----------------------
+# MEMORY
+#----------------------
+
+# Shared caches in the order they are given up when over budget: cheapest to
+# rebuild and least shared first, the source tables last
+EVICTION_ORDER = [
+    ("build_2026_breakdown_file", build_2026_breakdown_file.clear),
+    ("load_2026_office_rollup", load_2026_office_rollup.clear),
+    ("build_2026_projection", build_2026_projection.clear),
+    ("build_2026_utilization_distribution", build_2026_utilization_distribution.clear),
+    ("build_2026_office_cube", build_2026_office_cube.clear),
+    ("build_2025_state", build_2025_state.clear),
+    ("build_2026_state", build_2026_state.clear),
+    ("build_2026_employee_table", build_2026_employee_table.clear),
+    ("build_2026_day_grid", build_2026_day_grid.clear),
+    ("build_2026_project_weeks", build_2026_project_weeks.clear),
+    ("build_2026_time_off_capacity", build_2026_time_off_capacity.clear),
+    ("build_2026_managers", build_2026_managers.clear),
+    ("build_2026_employee_rows", build_2026_employee_rows.clear),
+    ("load_2025_tables", load_2025_tables.clear),
+    ("load_2026_tables", load_2026_tables.clear),
+    ("fetch_sharepoint_table", fetch_sharepoint_table.clear),
+]
+
+
+def memory_budgets():
+    # [memory] process_mib / cache_mib in secrets; the process budget defaults
+    # to 80% of the container limit, leaving headroom before the OOM killer
+    settings = st.secrets.get("memory", {})
+    limit = container_memory_limit()
+    process = settings.get("process_mib")
+    process = process * MIB if process else (0.8 * limit if limit else None)
+    cache = settings.get("cache_mib")
+    return process, cache * MIB if cache else None
+
+
+def memory_session():
+    # A short id per browser session, for the per-session memory table
+    return st.session_state.setdefault("memory_session", uuid4().hex[:8])
+
+
+def account_session(name, size):
+    # Loads outside a session (the boot warmup) hand nothing to anyone
+    if get_script_run_ctx() is None:
+        return
+    account(memory_session(), name, size)
@@ -0,0 +1,213 @@
+"""
+Prometheus metrics for the dashboard.
+
+Counters, gauges and histograms kept in this process and served in the
+Prometheus text format from a small HTTP server next to Streamlit's, for
+scraping over time:
+
+    graph_requests_total            Graph/login calls by endpoint and status
+    graph_request_seconds           their latency
+    graph_token_requests_total      token acquisitions by source (identity_provider or cache)
+    cache_requests_total            cached loads by cache and hit/miss
+    table_refresh_seconds           time to refresh a table on a cache miss
+    render_seconds                  full render time per view
+    active_sessions                 sessions that ran in the last 5 minutes
+
+Updating a metric is a dict lookup and a few additions under a lock, so
+instrumented code stays cheap; the text is only built when scraped. The
+same server answers /healthz with the process's readiness (see warmup.py).
+"""
+import bisect
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; wide enough for a cold workbook fetch and parse
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+REGISTRY = []
+
+logger = logging.getLogger(__name__)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        return tuple(labels[name] for name in self.labels)
+
+    def samples(self):
+        """(suffix, label values, extra labels, value) for every series."""
+        with self._lock:
+            return [("", key, (), value) for key, value in self._values.items()]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labels, key, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """A value read when scraped, from `function()`."""
+    kind = "gauge"
+
+    def __init__(self, name, help, function):
+        super().__init__(name, help)
+        self.function = function
+
+    def samples(self):
+        return [("", (), (), self.function())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, seconds, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            series["counts"][bisect.bisect_left(self.buckets, seconds)] += 1
+            series["sum"] += seconds
+
+    def samples(self):
+        with self._lock:
+            snapshot = {key: (list(series["counts"]), series["sum"]) for key, series in self._values.items()}
+
+        samples = []
+        for key, (counts, total) in snapshot.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append(("_bucket", key, (("le", _format_value(float(bound))),), cumulative))
+            samples.append(("_sum", key, (), total))
+            samples.append(("_count", key, (), cumulative))
+        return samples
+
+
+def render():
+    """Every registered metric in the Prometheus text format."""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+#----------------------
+# DASHBOARD METRICS
+#----------------------
+
+def _active_sessions():
+    from diagnostics import active_sessions
+
+    return active_sessions()
+
+
+GRAPH_REQUESTS = Counter("graph_requests_total", "Graph and login requests by endpoint and HTTP status.", ["endpoint", "status"])
+GRAPH_LATENCY = Histogram("graph_request_seconds", "Graph and login request latency.", ["endpoint"])
+TOKEN_REQUESTS = Counter("graph_token_requests_total", "Access tokens acquired, by where they came from.", ["source"])
+CACHE_REQUESTS = Counter("cache_requests_total", "Cached loads by cache and result (hit or miss).", ["cache", "result"])
+REFRESH_SECONDS = Histogram("table_refresh_seconds", "Time to load a table or state on a cache miss.", ["cache"])
+RENDER_SECONDS = Histogram("render_seconds", "Time to render a dashboard view.", ["view"])
+ACTIVE_SESSIONS = Gauge("active_sessions", "Sessions that ran the script in the last 5 minutes.", _active_sessions)
+
+
+def observe_cached_load(cache, stage):
+    """Count a timed(..., cached=True) block's hit or miss, and its time when it missed."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if stage["cache_hit"] else "miss")
+    if not stage["cache_hit"]:
+        REFRESH_SECONDS.observe(stage["seconds"], cache=cache)
+
+
+#----------------------
+# ENDPOINT
+#----------------------
+
+# A function returning (ready, details) for /healthz; None reports ready
+readiness = None
+
+_server = None
+_server_lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/metrics":
+            self._send(200, CONTENT_TYPE, render())
+        elif path == "/healthz":
+            ready, details = readiness() if readiness else (True, {})
+            self._send(200 if ready else 503, "application/json", json.dumps({"ready": ready, **details}))
+        else:
+            self.send_error(404)
+
+    def _send(self, code, content_type, text):
+        body = text.encode()
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, host="127.0.0.1"):
+    """
+    Serve /metrics and /healthz on a daemon thread, once per process; returns
+    the server, or None if the port is taken.
+    """
+    global _server
+
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError as e:
+            logger.warning("Metrics endpoint not started on %s:%s: %s", host, port, e)
+            return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,61 @@
+"""
+Start the dashboard with a boot-time warmup.
+
+Runs `streamlit run streamlit1.py` in this process, after starting the
+/metrics and /healthz endpoint ([metrics] port in secrets, or --metrics-port)
+and the warmup thread (warmup.py). Streamlit comes up straight away, but
+/healthz answers 503 until the default year's tables and shared aggregates
+are cached, so a readiness probe pointed at it only sends traffic to a warm
+process. Arguments after -- go to `streamlit run`.
+
+    python serve.py
+    python serve.py --metrics-port 9464 -- --server.port 8501 --server.headless true
+"""
+import argparse
+import logging
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(ROOT, "streamlit1.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--year", default=None, help="year to warm (default: the dashboard's default year)")
+    parser.add_argument("--metrics-port", type=int, help="serve /metrics and /healthz here (default: [metrics] port in secrets)")
+    parser.add_argument("--metrics-host", help="interface for /metrics and /healthz (default: [metrics] host, else localhost)")
+    parser.add_argument("--no-warmup", action="store_true", help="start cold and report ready at once, e.g. to measure the first page load")
+    parser.add_argument("streamlit_args", nargs="*", help="passed on to streamlit run")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    import streamlit as st
+    from streamlit.web import cli
+
+    import metrics
+    import warmup
+
+    year = args.year or warmup.DEFAULT_YEAR
+    if args.no_warmup:
+        warmup.skip(year)
+    else:
+        warmup.start(year)
+
+    # Secrets are read relative to the working directory, as streamlit run does
+    os.chdir(ROOT)
+    settings = st.secrets.get("metrics", {})
+    port = args.metrics_port or settings.get("port")
+    if port:
+        metrics.readiness = warmup.readiness
+        metrics.serve(int(port), args.metrics_host or settings.get("host", "127.0.0.1"))
+    else:
+        logging.warning("No [metrics] port set: readiness is not exposed on /healthz")
+
+    sys.argv = ["streamlit", "run", APP, *args.streamlit_args]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import os
+import pandas as pd
+import requests
+from io import BytesIO
+from diagnostics import timed
+from metrics import GRAPH_LATENCY, GRAPH_REQUESTS, TOKEN_REQUESTS
+
+# Microsoft's endpoints, unless pointed elsewhere (e.g. at fake_graph.py for offline testing)
+MICROSOFT_LOGIN_URL = "https://login.microsoftonline.com"
+LOGIN_URL = os.environ.get("SHAREPOINT_LOGIN_URL", MICROSOFT_LOGIN_URL)
+GRAPH_URL = os.environ.get("SHAREPOINT_GRAPH_URL", "https://graph.microsoft.com/v1.0")
+
+
+# Graph endpoint -> diagnostics stage
+GRAPH_STAGES = {"site": "sharepoint: resolve site", "content": "sharepoint: download"}
+
+
+def _graph_get(endpoint, url, headers):
+    """GET a Graph endpoint, timed for diagnostics and counted by status for metrics."""
+    status = "error"
+    try:
+        with timed(GRAPH_STAGES[endpoint]) as stage:
+            response = requests.get(url, headers=headers)
+            status = str(response.status_code)
+            stage["bytes"] = len(response.content)
+    finally:
+        GRAPH_REQUESTS.inc(endpoint=endpoint, status=status)
+        GRAPH_LATENCY.observe(stage["seconds"], endpoint=endpoint)
+    return response
+
+
+def get_sharepoint_file(client_id, client_secret, tenant_id, site_url, file_path, sheet_name = None):
+    """
+    Fetch CSV from SharePoint via Microsoft Graph
+    """
+
+    # msal is only needed once we actually fetch, so the login page never loads it
+    from msal import ConfidentialClientApplication
+
+    # Auth
+    authority = f"{LOGIN_URL}/{tenant_id}"
+    app = ConfidentialClientApplication(
+        client_id,
+        client_credential=client_secret,
+        authority=authority,
+        # Only Microsoft's login host can be validated against Microsoft
+        instance_discovery=None if LOGIN_URL == MICROSOFT_LOGIN_URL else False
+    )
+
+    with timed("sharepoint: token") as stage:
+        token = app.acquire_token_for_client(
+            scopes=["https://graph.microsoft.com/.default"]
+        )
+    ok = "access_token" in token
+    GRAPH_REQUESTS.inc(endpoint="token", status="200" if ok else "error")
+    GRAPH_LATENCY.observe(stage["seconds"], endpoint="token")
+    TOKEN_REQUESTS.inc(source=token.get("token_source", "identity_provider") if ok else "error")
+
+    if "access_token" not in token:
+        raise Exception(f"Could not get token: {token}")
+
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    # Resolve site ID
+    hostname = site_url.split("//")[1].split("/")[0]
+    site_path = "/" + "/".join(site_url.split("/")[3:])
+
+    site_api = f"{GRAPH_URL}/sites/{hostname}:{site_path}"
+    response = _graph_get("site", site_api, headers)
+    site_info = response.json()
+
+    if "id" not in site_info:
+        raise Exception(f"Failed to resolve site: {site_info}")
+
+    site_id = site_info["id"]
+
+    # Fetch file
+    file_api = (
+        f"{GRAPH_URL}/sites/{site_id}"
+        f"/drive/root:/{file_path}:/content"
+    )
+
+    r = _graph_get("content", file_api, headers)
+    r.raise_for_status()
+
+    with timed("sharepoint: read_excel") as stage:
+        data = pd.read_excel(BytesIO(r.content), engine ="openpyxl",sheet_name=sheet_name)
+        stage["rows"] = len(data) if isinstance(data, pd.DataFrame) else sum(map(len, data.values()))
+    return data
+
+
+#----------------------
+# OFFLINE JOBS
+#----------------------
+
+# The 2026 tables as the dashboard loads them: name -> secrets key for the file path
+TABLES_2026 = {
+    "df_user": "userfig_path_2026",
+    "df": "timesheet_path_2026",
+    "df_allowance": "allowance_path_2026",
+    "df_flexot": "flexot_path_2026",
+}
+SHEET_2026 = "PQ"
+
+SECRETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+
+
+def load_2026_tables(secrets_path=None, snapshot=None, save_snapshot_to=None):
+    """
+    The 2026 tables for offline jobs: read from a `snapshot` directory, or
+    fetched with the credentials in a Streamlit secrets file (and optionally
+    saved to `save_snapshot_to` for later runs).
+    """
+    import tomllib
+
+    if snapshot:
+        return load_snapshot(snapshot)
+
+    with open(secrets_path or SECRETS_PATH, "rb") as f:
+        creds = tomllib.load(f)["sharepoint"]
+
+    tables = {
+        name: get_sharepoint_file(
+            client_id=creds["client_id"],
+            client_secret=creds["client_secret"],
+            tenant_id=creds["tenant_id"],
+            site_url=creds["site_url"],
+            file_path=creds[path_key],
+            sheet_name=SHEET_2026,
+        )
+        for name, path_key in TABLES_2026.items()
+    }
+    if save_snapshot_to:
+        save_snapshot(tables, save_snapshot_to)
+    return tables
+
+
+def save_snapshot(tables, directory):
+    """Write fetched tables to `directory`, one pickle per table."""
+    os.makedirs(directory, exist_ok=True)
+    for name, frame in tables.items():
+        frame.to_pickle(os.path.join(directory, f"{name}.pkl"))
+
+
+def load_snapshot(directory):
+    """Tables saved by save_snapshot(), so jobs can run without SharePoint."""
+    return {name: pd.read_pickle(os.path.join(directory, f"{name}.pkl")) for name in TABLES_2026}
+
+
+# SharePoint file (secrets key prefix) -> snapshot table name
+SNAPSHOT_NAMES = {"userfig": "df_user", "timesheet": "df", "allowance": "df_allowance", "flexot": "df_flexot"}
+
+
+def read_snapshot_table(directory, path_key):
+    """The snapshot table standing in for the SharePoint file at secrets key `path_key`."""
+    name = SNAPSHOT_NAMES[path_key.split("_path_")[0]]
+    return pd.read_pickle(os.path.join(directory, f"{name}.pkl"))
@@ -0,0 +1,125 @@
+"""
+Static assets for the login page.
+
+Images under assets/ are pre-resized into the variants the page needs and
+written to static/ with content-hashed filenames, which Streamlit serves from
+app/static/ when server.enableStaticServing is on. URLs carry the hash as a
+?v= argument, which makes the static handler send a long-lived Cache-Control
+header; a changed image gets a new name, so stale caches are never an issue.
+
+Rebuild after changing anything in assets/:
+
+    python static_assets.py
+"""
+import hashlib
+import json
+import os
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ASSETS_DIR = os.path.join(ROOT, "assets")
+STATIC_DIR = os.path.join(ROOT, "static")
+MANIFEST_PATH = os.path.join(STATIC_DIR, "manifest.json")
+URL_PREFIX = "app/static"
+
+# Source image -> widths to produce and output format
+VARIANTS = {
+    "ASPECT_Malahat": {"source": "ASPECT_Malahat.png", "widths": [640, 1280, 1920], "format": "JPEG"},
+    "ASPECT_Full_Logo": {"source": "ASPECT_Full_Logo.png", "widths": [140, 280], "format": "PNG"},
+}
+
+_EXTENSIONS = {"JPEG": "jpg", "PNG": "png"}
+
+
+#----------------------
+# BUILD
+#----------------------
+
+def _encode(image, fmt):
+    from io import BytesIO
+
+    buf = BytesIO()
+    if fmt == "JPEG":
+        image.convert("RGB").save(buf, "JPEG", quality=72, optimize=True, progressive=True)
+    else:
+        image.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
+
+
+def build():
+    """Write every variant to static/ and return the new manifest."""
+    from PIL import Image
+
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    manifest = {}
+
+    for name, spec in VARIANTS.items():
+        source = Image.open(os.path.join(ASSETS_DIR, spec["source"]))
+        ext = _EXTENSIONS[spec["format"]]
+        manifest[name] = []
+
+        for width in spec["widths"]:
+            width = min(width, source.width)   # never upscale
+            height = round(source.height * width / source.width)
+            data = _encode(source.resize((width, height), Image.LANCZOS), spec["format"])
+
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            filename = f"{name}.{width}.{digest}.{ext}"
+            with open(os.path.join(STATIC_DIR, filename), "wb") as f:
+                f.write(data)
+
+            manifest[name].append({"width": width, "file": filename, "hash": digest, "bytes": len(data)})
+
+    # Drop variants the new manifest no longer references
+    keep = {v["file"] for variants in manifest.values() for v in variants} | {"manifest.json"}
+    for filename in os.listdir(STATIC_DIR):
+        if filename not in keep:
+            os.remove(os.path.join(STATIC_DIR, filename))
+
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+    return manifest
+
+
+#----------------------
+# LOOKUP
+#----------------------
+
+_manifest = None
+
+
+def load_manifest():
+    global _manifest
+    if _manifest is None:
+        with open(MANIFEST_PATH) as f:
+            _manifest = json.load(f)
+    return _manifest
+
+
+def asset_url(name, width):
+    """URL of the smallest variant of `name` at least `width` px wide."""
+    variants = load_manifest()[name]
+    variant = next((v for v in variants if v["width"] >= width), variants[-1])
+    return f"{URL_PREFIX}/{variant['file']}?v={variant['hash']}"
+
+
+def responsive_background_css(selector, name):
+    """background-image rules that pick a variant by viewport width and pixel density."""
+    variants = load_manifest()[name]
+    rules = [f'{selector} {{ background-image: url("{asset_url(name, 0)}"); }}']
+
+    for prev, variant in zip(variants, variants[1:]):
+        url = f"{URL_PREFIX}/{variant['file']}?v={variant['hash']}"
+        rules.append(
+            f"@media (min-width: {prev['width'] + 1}px), "
+            f"(min-width: {prev['width'] // 2 + 1}px) and (min-resolution: 2dppx) {{ "
+            f'{selector} {{ background-image: url("{url}"); }} }}'
+        )
+    return "\n".join(rules)
+
+
+if __name__ == "__main__":
+    for name, variants in build().items():
+        for v in variants:
+            print(f"{v['file']:<48} {v['bytes'] / 1024:8.1f} KiB")
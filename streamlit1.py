@@ -1,15 +1,7 @@
 import streamlit as st
-import pandas as pd
-import altair as alt
-from datetime import datetime, timedelta
-import numpy as np
-from pandas.tseries.offsets import BDay
-import requests
-from msal import ConfidentialClientApplication
-from io import BytesIO
-import matplotlib.pyplot as plt
-import streamlit.components.v1 as components
-import plotly.graph_objects as go
+from static_assets import asset_url, responsive_background_css
+from diagnostics import timed
+from tracing import finish_trace, pseudonym, set_attributes, start_trace
 
 st.set_page_config(
     layout="wide",  # makes content stretch full width
@@ -17,7 +9,18 @@ st.set_page_config(
     page_icon = "assets/ASPECT_Logomark.png"
     )
 
-if not hasattr(st, "user") or not st.user.is_logged_in:
+# A span trace of this rerun, appended to a JSON lines file when
+# [tracing] path = "traces/reruns.jsonl" is set in secrets. sample_rate
+# (default 0.05) picks reruns at random; any rerun over slow_ms is kept.
+# Traces name the user only when a secret user_key is set to hash them with.
+trace_settings = st.secrets.get("tracing", {})
+if trace_settings.get("path"):
+    start_trace("rerun", trace_settings["path"], trace_settings.get("sample_rate", 0.05), trace_settings.get("slow_ms", 5000))
+
+with timed("auth check"):
+    logged_in = hasattr(st, "user") and st.user.is_logged_in
+
+if not logged_in:
 
     st.markdown(
         """
@@ -46,7 +49,6 @@ if not hasattr(st, "user") or not st.user.is_logged_in:
         .login-container {
             position: fixed;
             inset: 0;
-            background-image: url("https://raw.githubusercontent.com/Aspect-Structural-Engineers/streamlit-timesheet-dashboard/main/assets/ASPECT_Malahat.png");
             background-size: cover;
             background-position: center;
             display: flex;
@@ -120,12 +122,19 @@ if not hasattr(st, "user") or not st.user.is_logged_in:
         unsafe_allow_html=True
     )
 
+    # Background and logo are served from static/ (see static_assets.py)
+    st.markdown(
+        f"<style>{responsive_background_css('.login-container', 'ASPECT_Malahat')}</style>",
+        unsafe_allow_html=True
+    )
+
     st.markdown(
-    """
+    f"""
     <div class="login-container">
         <div class="login-card">
             <img
-                src="https://raw.githubusercontent.com/Aspect-Structural-Engineers/streamlit-timesheet-dashboard/main/assets/ASPECT_Full_Logo.png"
+                src="{asset_url('ASPECT_Full_Logo', 140)}"
+                srcset="{asset_url('ASPECT_Full_Logo', 140)} 1x, {asset_url('ASPECT_Full_Logo', 280)} 2x"
                 class="login-logo"
             />
             <div class="login-title">Timesheet Dashboard</div>
@@ -143,177 +152,92 @@ if not hasattr(st, "user") or not st.user.is_logged_in:
         st.markdown("<br><br><br><br><br><br><br><br><br><br><br><br><br><br><br>", unsafe_allow_html=True)
         st.button("Log in with Microsoft", on_click = st.login, args=("microsoft",))
         
+    finish_trace(page="login")
     st.stop()
 
+# Data libraries are only imported past the login gate. Plotting backends are
+# imported inside the builders that use them, so each view only loads its own.
+from loaders import (
+    EVICTION_ORDER,
+    account_session,
+    load_2025_state,
+    load_2026_breakdown_file,
+    load_2026_day_grid,
+    load_2026_employee_table,
+    load_2026_managers,
+    load_2026_office_cube,
+    load_2026_office_rollup,
+    load_2026_project_weeks,
+    load_2026_projection,
+    load_2026_state,
+    load_2026_time_off_capacity,
+    load_2026_utilization_distribution,
+    memory_budgets,
+    memory_session,
+)
+from timesheet_metrics import (
+    calendar_days,
+    direct_reports,
+    percentile_rank,
+    quartiles,
+    PLANNER_KINDS,
+    apply_time_off_plan,
+    time_off_plan,
+    top_projects,
+    utilization_histogram,
+)
+from figures import donut_chart_plotly, donut_chart_plotly_vacation, donut_chart_svg
+from downloads import FORMATS
+from diagnostics import (
+    container_memory_limit,
+    deep_size,
+    enforce_memory_budget,
+    process_rss,
+    session_memory,
+    shared_cache_sizes,
+    start_session_run,
+    summary as diagnostics_summary,
+    table_sizes,
+    timed_function,
+)
+from metrics import RENDER_SECONDS, observe_cached_load, serve as serve_metrics
+from warmup import status as warmup_status
+from cards import card_grid, info_tooltip, inject_card_styles, metric_card, render_cards, stats_card, summary_card
+
 year = st.segmented_control(
     "Year",
     options=["2025", "2026"],
-    default="2026"
+    default="2026",
+    key="year"
 )
 
-def get_sharepoint_file(client_id, client_secret, tenant_id, site_url, file_path, sheet_name = None):
-    """
-    Fetch CSV from SharePoint via Microsoft Graph
-    """
-
-    # Auth
-    authority = f"https://login.microsoftonline.com/{tenant_id}"
-    app = ConfidentialClientApplication(
-        client_id,
-        client_credential=client_secret,
-        authority=authority
-    )
-
-    token = app.acquire_token_for_client(
-        scopes=["https://graph.microsoft.com/.default"]
-    )
-
-    if "access_token" not in token:
-        raise Exception(f"Could not get token: {token}")
-
-    headers = {"Authorization": f"Bearer {token['access_token']}"}
-
-    # Resolve site ID
-    hostname = site_url.split("//")[1].split("/")[0]
-    site_path = "/" + "/".join(site_url.split("/")[3:])
-
-    site_api = f"https://graph.microsoft.com/v1.0/sites/{hostname}:{site_path}"
-    site_info = requests.get(site_api, headers=headers).json()
-
-    if "id" not in site_info:
-        raise Exception(f"Failed to resolve site: {site_info}")
-
-    site_id = site_info["id"]
-
-    # Fetch file
-    file_api = (
-        f"https://graph.microsoft.com/v1.0/sites/{site_id}"
-        f"/drive/root:/{file_path}:/content"
-    )
-
-    r = requests.get(file_api, headers=headers)
-    r.raise_for_status()
-
-    return pd.read_excel(BytesIO(r.content), engine ="openpyxl",sheet_name=sheet_name)
-
-def render_2025_dashboard():
-    
-    def donut_chart(used, remaining, title, footer):
-        fig, ax = plt.subplots(figsize=(1, 1))
-
-        ax.pie(
-            [used, remaining],
-            colors=["#ED017F", "#F7B3D6"],
-            labels=None,
-            startangle=90,
-            counterclock=False,
-            wedgeprops=dict(width=0.28),
-        )
-
-        ax.text(
-            0, 0,
-            f"{used:.1f}",
-            ha="center",
-            va="center",
-            fontsize=10,
-            fontweight="600",
-            color="#111827"
-        )
-        ax.set_title(title, fontsize=7,fontweight="600",pad=6)
-        ax.axis("equal")
-        ax.axis("off")
-
-        fig.text( 
-            0.5,        
-            0.02,       
-            footer,
-            ha="center",
-            va="bottom",
-            fontsize=5,
-            color="#6b7280"
-        )
-
-        return fig
-
-    def target_hours_in_period(row, period_start, period_end):
-        start = max(row["Start"], period_start)
-        end = min(row["End"], period_end)
+#----------------------
+# SHARED STATE
+#----------------------
 
-        if start > end:
-            return 0
+# The cached loaders are in loaders.py, where the boot warmup can fill the
+# same cache entries the script reads
 
-        weekdays = pd.bdate_range(start=start, end=end)
-        return len(weekdays) * row["Daily_Hours"]
+@st.cache_resource(show_spinner=False)
+def start_metrics_server():
+    # Prometheus metrics for this process, when [metrics] port = 9464 is set
+    # in secrets (host defaults to localhost)
+    settings = st.secrets.get("metrics", {})
+    if not settings.get("port"):
+        return None
+    return serve_metrics(int(settings["port"]), settings.get("host", "127.0.0.1"))
 
-    def adjusted_target_for_period(start_date, end_date):
-        # Target hours in period
-        target = (
-            df_user[df_user["Full Name"] == emp_name]
-            .apply(target_hours_in_period, axis=1, args=(start_date, end_date))
-            .sum()
-        )
-
-        # PTO taken in period
-        pto = df_util[
-            (df_util["Date"].between(start_date, end_date)) &
-            (df_util["Project No - Title"].isin([
-                "Vacation",
-                "PTO Office Closed",
-                "Stat Holidays",
-                "Unpaid Time Off",
-                "PTO Sick/Medical"
-            ]))
-        ]["Hours"].sum()
-
-        return max(target - pto, 0)
-
-    def weekday_hours(row):
-        weekdays = pd.bdate_range(start=row["Start"], end=row["End"])
-        return len(weekdays) * row["Daily_Hours"]
-
-
-    # Load data
-    df_user = get_sharepoint_file(
-        client_id=st.secrets["sharepoint"]["client_id"],
-        client_secret=st.secrets["sharepoint"]["client_secret"],
-        tenant_id=st.secrets["sharepoint"]["tenant_id"],
-        site_url=st.secrets["sharepoint"]["site_url"],
-        file_path=st.secrets["sharepoint"]["userfig_path_2025"],
-        sheet_name = "in"
-        )
-
-
-    df = get_sharepoint_file(
-        client_id=st.secrets["sharepoint"]["client_id"],
-        client_secret=st.secrets["sharepoint"]["client_secret"],
-        tenant_id=st.secrets["sharepoint"]["tenant_id"],
-        site_url=st.secrets["sharepoint"]["site_url"],
-        file_path=st.secrets["sharepoint"]["timesheet_path_2025"],
-        sheet_name = "in"
-    )
-
-    df_allowance = get_sharepoint_file(
-        client_id=st.secrets["sharepoint"]["client_id"],
-        client_secret=st.secrets["sharepoint"]["client_secret"],
-        tenant_id=st.secrets["sharepoint"]["tenant_id"],
-        site_url=st.secrets["sharepoint"]["site_url"],
-        file_path=st.secrets["sharepoint"]["allowance_path_2025"],
-        sheet_name = "in"
-    )
 
-    logged_in_email = st.user.email
-    user_info = df_user[df_user["Email"].str.lower() == logged_in_email.lower()]
+#----------------------
+# 2025 FRAGMENTS
+#----------------------
 
-    if not user_info.empty:
-        emp_name = user_info.iloc[0]["Full Name"]
-    else:
-        emp_name = "Unknown User"
-    first_name = emp_name.split(" ")[0]
 
-
-    today = datetime.today()
-    monday = today - timedelta(days=today.weekday())
-    last_refreshed = monday.strftime("%B %d, %Y")
+@st.fragment
+@timed_function()
+def render_header_2025(state):
+    first_name = state["first_name"]
+    last_refreshed = state["last_refreshed"]
 
     col_left, col_right = st.columns([3, 1])
 
@@ -346,6 +270,138 @@ def render_2025_dashboard():
         )
 
 
+
+@st.fragment
+@timed_function()
+def render_kpi_cards_2025(state):
+    render_cards(card_grid([
+        metric_card(
+            "Hours Worked",
+            state["total_working_hours"],
+            parts=[("Project", state["project_hours"]), ("Internal", state["internal_hours"])],
+            operator="+",
+            decimals=1,
+            large_parts=True
+        ),
+        metric_card(
+            "Adjusted Baseline",
+            state["adjusted_target"],
+            parts=[
+                ("Baseline", state["target_hours"]),
+                ("Vacation", state["pto_vacation"]),
+                ("Sick/Medical", state["pto_sick"]),
+                ("Stat + Office Closed", state["combined_closed"]),
+                ("Unpaid", state["unpaid_hours"]),
+            ],
+            operator="-",
+            decimals=1,
+            large_parts=True
+        ),
+    ], columns="0.6fr 1fr"))
+
+
+@st.fragment
+@timed_function()
+def render_donuts_2025(state):
+    vacation_used = state["vacation_used"]
+    vacation_remaining = state["vacation_remaining"]
+    vacation_max = state["vacation_max"]
+    sick_used = state["sick_used"]
+    sick_remaining = state["sick_remaining"]
+
+    chart_col1, chart_col2 = st.columns([1, 0.8])
+    with chart_col1:
+        svg_vac = donut_chart_svg(
+            used=vacation_used,
+            remaining=vacation_remaining,
+            title="Vacation",
+            footer=f"Max: {vacation_max:.1f} hrs"
+        )
+        st.image(svg_vac, width=200)
+
+    with chart_col2:
+        svg_sick = donut_chart_svg(
+            used=sick_used,
+            remaining=sick_remaining,
+            title="Sick/Medical",
+            footer="Max: 37.5 hrs"
+        )
+        st.image(svg_sick, width=200)
+
+    st.markdown("<div style='height:0.75rem'></div>", unsafe_allow_html=True)
+
+
+@st.fragment
+@timed_function()
+def render_utilization_panel_2025(state):
+    render_cards(card_grid([
+        summary_card([
+            f"""Your utilization for last month (December 2025) was
+            <strong>{state["util_last_month"]:.1%}</strong>,
+            and utilization YTD is
+            <strong class="kpi-accent">{state["util_ytd"]:.1%}</strong>.
+            Your utilization target is
+            <strong class="kpi-accent">{state["util_target"]:.1%}</strong>""",
+            f"""Project hours in December:
+            <strong>{state["project_last_month"]:.1f}</strong>
+            &nbsp;/&nbsp;
+            Baseline:
+            <strong>{state["adjusted_target_last_month"]:.1f}</strong>""",
+            f"""Project hours YTD:
+            <strong>{state["project_ytd"]:.1f}</strong>
+            &nbsp;/&nbsp;
+            Baseline:
+            <strong>{state["adjusted_target_ytd"]:.1f}</strong>""",
+        ]),
+        stats_card(
+            "Additional Time Off Taken",
+            [("Flex", state["flex_vacation"]), ("Unpaid", state["unpaid_hours"])],
+            decimals=1
+        ),
+    ], columns="1.6fr 0.8fr"))
+
+
+@st.fragment
+@timed_function()
+def render_charts_2025(state):
+    import altair as alt
+
+    agg_df = state["agg_df"]
+    totals_by_month = state["totals_by_month"]
+
+    st.subheader("Monthly Hours by Utilization Category")
+    bars = alt.Chart(agg_df).mark_bar().encode(
+        x="Month:N",
+        y="Hours:Q",
+        color=alt.Color(
+        "Utilization Category:N",
+        scale=alt.Scale(
+            domain=["Project", "Internal", "Budget PTO", "Add'l & Flex PTO"],
+            range=["black", "#50005C", "#ED017F", "#F2BEDA"])),
+        tooltip=["Month", "Utilization Category", "Hours"]
+    ).properties(width=700, height=400)
+
+    text = alt.Chart(totals_by_month).mark_text(
+        dy=-10,
+        color="black"
+    ).encode(
+        x="Month:N",
+        y="Hours:Q",
+        text=alt.Text("Hours:Q")
+    )
+    st.altair_chart(bars + text)
+
+
+def render_2025_dashboard():
+    with timed("load 2025 state", cached=True) as stage:
+        state = load_2025_state(st.user.email)
+    observe_cached_load("state_2025", stage)
+    account_session("state", deep_size(state))
+
+    render_header_2025(state)
+
+    inject_card_styles()
+
     st.markdown(
         """
         <style>
@@ -374,433 +430,784 @@ def render_2025_dashboard():
     )
 
 
+    col_metrics, col_charts = st.columns([1.6, 0.8])
 
     #----------------------
-    # TARGET HRS CALC
+    # Hours Worked + Adjusted Target Boxes
     #----------------------
-    # Convert dates
-    df_user["Start"] = pd.to_datetime(df_user["Start"], errors="coerce")
-    df_user["End"] = pd.to_datetime(df_user["End"], errors="coerce")
-
-    # Hard cap date
-    cap_end_date = pd.Timestamp("2025-12-31")
-
-    # Fill open-ended contracts to cap date
-    df_user["End"] = df_user["End"].fillna(cap_end_date)
-
-    # Cap all End dates at Dec 31, 2025
-    df_user["End"] = df_user["End"].clip(upper=cap_end_date)
-
-    # Calculate daily working hours
-    df_user["Daily_Hours"] = np.where(
-        df_user["Working Hrs"] > 0,
-        df_user["Working Hrs"] / 5,
-        0
-    )
-
-    df_user["Target Working Hrs (Contract)"] = df_user.apply(weekday_hours, axis=1)
-
-
-    # Aggregate by employee
-    df_target = df_user.groupby(["Full Name", "Legal Office"], as_index=False)["Target Working Hrs (Contract)"].sum()
-
-    df_util_target = (
-        df_user
-        .groupby("Full Name", as_index=False)
-        .agg({"Utilization Target": "mean"})
-    )
+    with col_metrics:
+        render_kpi_cards_2025(state)
 
     #----------------------
-    # TIMESHEET CLEANING
+    # Pie Charts
     #----------------------
+    with col_charts:
+        render_donuts_2025(state)
 
-    df.rename(columns={
-        "Employee Full Name": "Full Name", 
-        "Sum of Hours": "Hours"
-    }, inplace=True)
-
-    # Convert Date
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Month"] = df["Date"].dt.to_period("M").astype(str)
-
-    # Force Utilization Category order
-    cat_order = ["Project", "Internal", "Budget PTO", "Add'l & Flex PTO"]
-    df["Utilization Category"] = pd.Categorical(
-        df["Utilization Category"], 
-        categories=cat_order, 
-        ordered=True
-    )
-
-    # Filter timesheet to only include dates before start of this week
-    today = datetime.today()
-    start_of_week = today - timedelta(days=today.weekday())  # Monday this week
-    df = df[df["Date"] < start_of_week]
-
-    # Target vs Actual Comparison
-    df_filtered = df[df["Full Name"] == emp_name]
-    df_actual = df_filtered.groupby("Full Name", as_index=False)["Hours"].sum()
-    df_comparison = pd.merge(df_target, df_actual, on="Full Name", how="left").fillna(0)
-    totals_by_util = df_filtered.groupby("Utilization Category")["Hours"].sum().reset_index()
+    # ----------------------
+    # Bottom Summary Row
+    # ----------------------
+    render_utilization_panel_2025(state)
 
     #----------------------
-    # METRICS
+    # BAR CHART
     #----------------------
-    project_hours = totals_by_util.loc[totals_by_util["Utilization Category"] == "Project", "Hours"].sum()
-    internal_hours = totals_by_util.loc[totals_by_util["Utilization Category"] == "Internal", "Hours"].sum()
-    total_working_hours = project_hours + internal_hours
-    budget_pto = totals_by_util.loc[totals_by_util["Utilization Category"] == "Budget PTO", "Hours"].sum()
-    flex_pto = totals_by_util.loc[totals_by_util["Utilization Category"] == "Add'l & Flex PTO", "Hours"].sum()
-
-    # Calculate PTO breakdown
-    budget_pto_breakdown = df_filtered[df_filtered["Utilization Category"] == "Budget PTO"]
-    budget_pto_grouped = budget_pto_breakdown.groupby("Project No - Title")["Hours"].sum().reset_index()
-
-    # Add PTO Flex from Add'l & Flex PTO
-    flex_hours = df_filtered.loc[df_filtered["Utilization Category"] == "Add'l & Flex PTO", "Hours"].sum()
-    flex_row = pd.DataFrame({"Project No - Title": ["PTO Flex Vacation"], "Hours": [flex_hours]})
-    budget_pto_grouped = pd.concat([budget_pto_grouped, flex_row], ignore_index=True)
-    unpaid_hours = df_filtered.loc[df_filtered["Project No - Title"] == "Unpaid Time Off", "Hours"].sum()
+    render_charts_2025(state)
 
-    # PTO titles order
-    titles_order = ["Vacation", "PTO Sick/Medical","PTO Flex Vacation", "Stat Holidays", "PTO Office Closed"]
 
-    # Merge to ensure all titles exist
-    all_titles_df = pd.DataFrame({"Project No - Title": titles_order})
-    budget_pto_grouped = pd.merge(all_titles_df, budget_pto_grouped, on="Project No - Title", how="left").fillna(0)
+#----------------------
+# 2026 FRAGMENTS
+#----------------------
 
 
-    df_allowance.rename(columns={
-        "Employee Full Name": "Full Name"
-    }, inplace=True)
+@st.fragment
+@timed_function()
+def render_header_2026(state):
+    first_name = state["first_name"]
+    last_refreshed = state["last_refreshed"]
+    timesheet_date_str = state["timesheet_date_str"]
+    latest_date_str = state["latest_date_str"]
+    is_stale = state["is_stale"]
 
-    df_allowance["Full Name"] = df_allowance["Full Name"].str.strip()
-    df_target["Full Name"] = df_target["Full Name"].str.strip()
-
-    df_target = df_target.merge(
-        df_allowance,
-        on="Full Name",
-        how="left"
-    )
+    timesheet_color = "#DC2626" if is_stale else "#374151"   # red vs normal
+    timesheet_weight = "600" if is_stale else "400"
 
-    vacation_max = (
-        df_target.loc[df_target["Full Name"] == emp_name, "Allowance"]
-        .fillna(0)
-        .iloc[0]
-    )
+    
 
-    util_target = (
-        df_util_target.loc[df_util_target["Full Name"] == emp_name, "Utilization Target"]
-        .fillna(0)
-        .iloc[0]
-    )
+    col_left, col_right = st.columns([3, 1])
 
-    #  max allocations per PTO type
-    pto_max = {
-        "Vacation": vacation_max,
-        "Sick/Medical": 37.5,
-        "Stat Holidays": np.nan,
-        "PTO Office Closed": np.nan,
-        "Flex": np.nan
-    }
+    with col_left:
+        st.markdown(
+            f"""
+            <h2 style="margin-bottom: 0;">
+                Good morning, <span style="color:#ED017F;">{first_name}</span>
+            </h2>
+            <p style="margin-top: 0.1rem; color: #374151; font-size: 1.2rem;">
+                Your year so far:
+            </p>
+            """,
+            unsafe_allow_html=True
+        )
 
-    # Get target working hours for the selected employee
-    target_hours = df_target.loc[df_target["Full Name"] == emp_name, "Target Working Hrs (Contract)"].sum()
-    # Calculate PTO amounts
-    pto_vacation = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Vacation", "Hours"].sum()
-    pto_sick = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Sick/Medical", "Hours"].sum()
-    stat_holidays = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Stat Holidays", "Hours"].sum()
-    office_closed = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Office Closed", "Hours"].sum()
+    with col_right:
+        st.markdown(
+            f"""
+            <p style="
+                text-align: right;
+                color: #374151;
+                font-size: 0.9rem;
+            ">
+                <strong>Last refreshed:</strong> {last_refreshed}
+                    <span
+                        class="info-tooltip"
+                        title="The data refresh date. Timesheet data is refreshed weekly on Mondays. Your Baseline is updated till the Friday before the refresh."
+                        style="vertical-align: super;" 
+                    > ⓘ</span>
+            </p>
+            <p style="
+                text-align: right;
+                color: {timesheet_color};
+                font-size: 0.9rem;
+                font-weight: {timesheet_weight};
+            ">
+                <strong>Your Timesheet Week:</strong> {timesheet_date_str}
+                <span
+                    class="info-tooltip"
+                    title="The most recent timesheet week included in this dashboard. If this date is before the last refreshed date, your timesheet may have missing entries, hence the red color. Please ensure your timesheet is up to date."
+                    style="vertical-align: super;"
+                > ⓘ</span>
+            </p>
+            <p style="
+                text-align: right;
+                color: #374151;
+                font-size: 0.9rem;
+            ">
+                <strong>Last Timesheet Date Included:</strong> {latest_date_str}
+                    <span
+                        class="info-tooltip"
+                        title="The last included timesheet date in the latest refresh (For partial completion)"
+                        style="vertical-align: super;" 
+                    > ⓘ</span>
+            </p>
+            """,
+            unsafe_allow_html=True
+        )
 
-    combined_closed = stat_holidays + office_closed
 
-    # Calculate Adjusted Target
-    adjusted_target = target_hours - pto_vacation - pto_sick - combined_closed - unpaid_hours
-    flex_vacation = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Flex Vacation", "Hours"].sum()
+@st.fragment
+@timed_function()
+def render_kpi_cards_2026(state):
+    row_1 = card_grid([
+        metric_card(
+            "Hours Worked",
+            state["total_working_hours"],
+            parts=[
+                ("Billable Project", state["project_hours"]),
+                ("Internal + Proposal", state["internalplusproposal_hours"]),
+                ("Overhead", state["overhead_hours"]),
+            ],
+            operator="+",
+            tooltip="Total hours worked.Includes: \nBillable Project: Client Projects\nInternal+Proposals: Internal Projects + Proposals\nOverhead: Internal time codes"
+        ),
+        metric_card(
+            "Adjusted Baseline",
+            state["adjusted_target"],
+            parts=[
+                ("Baseline", state["target_hours"]),
+                ("Vacation", state["pto_vacation"]),
+                ("Sick/Medical", state["pto_sick"]),
+                ("Stat", state["combined_closed"]),
+                ("Unpaid", state["unpaid_hours"]),
+            ],
+            operator="-",
+            tooltip="Your adjusted baseline. Baseline is calculated per your weekly working hours, minus any budgeted time off taken (vacation, sick, stat, unpaid). Stat includes both statutory holidays and winter break time. Sick includes bereavment."
+        ),
+        metric_card(
+            "Hours ± Baseline",
+            state["delta_hours"],
+            parts=[
+                ("Hours Worked", state["total_working_hours"]),
+                ("Adjusted Baseline", state["adjusted_target"]),
+            ],
+            operator="-",
+            tooltip="If you don't want to do the math. If your timesheet is up to date, this shows how many hours you've worked above or below your adjusted baseline."
+        ),
+    ], columns="repeat(3, 1fr)")
 
+    row_2 = card_grid([
+        metric_card(
+            "Flex Bucket",
+            state["flex_bucket"],
+            tooltip="Additions:\nAdjusted Baseline < Working Hours < 40\nDeductions:\n(Adjusted Baseline - Working Hours) if Working Hours < Adjusted Baseline + Flex Time Used + Future Flex booked + Cap Deductions"
+        ),
+        metric_card(
+            "OT Bucket",
+            state["ot_bucket"],
+            tooltip="Additions:\nOT Hours according to the policy\nDeductions:\nOT PTO Used + Future OT PTO booked + Payout OT"
+        ),
+    ], columns="repeat(2, 1fr)")
 
-    # PTO max values
-    vacation_max = pto_max["Vacation"]
-    sick_max = pto_max["Sick/Medical"]
+    render_cards(row_1, row_2)
 
-    vacation_used = min(pto_vacation, vacation_max)
-    vacation_remaining = max(vacation_max - vacation_used, 0)
 
-    sick_used = min(pto_sick, sick_max)
-    sick_remaining = max(sick_max - sick_used, 0)
+@st.fragment
+@timed_function()
+def render_donuts_2026(state):
+    prod_hours = state["prod_hours"]
+    vacation_used = state["vacation_used"]
+    future_vacation_hours = state["future_vacation_hours"]
+    vacation_remaining = state["vacation_remaining"]
+    vacation_max = state["vacation_max"]
+    sick_used = state["sick_used"]
+    sick_remaining = state["sick_remaining"]
 
+    r2_c1, r2_c2, r2_c3 = st.columns(3, gap="small")
+    #----------------------
+    # Pie Charts + Addl Time Off Box
+    #----------------------
 
-    # -------------------------
-    # UTILIZATION DATE WINDOWS
-    # -------------------------
+    with r2_c1:
+        fig_pd = donut_chart_plotly(
+            used=prod_hours,
+            remaining=30 - prod_hours,
+            title="PD",
+            footer="Max: 30 hrs",
+            annotation_text= "Professional development time you have used."
+        )
+        st.plotly_chart(fig_pd, width="stretch", config ={"displayModeBar": False})
 
+    with r2_c2:
+        fig_vac = donut_chart_plotly_vacation(
+        used=vacation_used,
+        booked=future_vacation_hours,
+        remaining=vacation_remaining,
+        title="Vacation",
+        footer=f"Max: {vacation_max:.1f} hrs",
+        annotation_text= "Vacation time you have used and booked. Future booked time is shown with a pattern."
+    )
+        st.plotly_chart(fig_vac, width="stretch", config ={"displayModeBar": False})
 
+    with r2_c3:
+        fig_sick = donut_chart_plotly(
+            used=sick_used,
+            remaining=sick_remaining,
+            title="Sick / Medical",
+            footer="Max: 37.5 hrs",
+            annotation_text= "Sick time you have used."
+        )
+        st.plotly_chart(fig_sick, width="stretch", config ={"displayModeBar": False})
 
-    last_month_start = pd.Timestamp("2025-12-01")
-    last_month_end = pd.Timestamp("2025-12-31")
 
-    ytd_start = pd.Timestamp("2025-01-01")
-    ytd_end = cap_end_date
+@st.fragment
+@timed_function()
+def render_utilization_panel_2026(state):
+    last_month_label = state["last_month_label"]
+    util_tooltip = info_tooltip(
+        "Your utilization vs target. If you take flex time or OT time off, your utilization will be impacted as they are included in the adjusted baseline.\nYour average utilization target is the average of your utilization target over the weeks, accounting for any changes because of the updated calculation of Utilization."
+    )
 
-    df_util = df_filtered[df_filtered["Date"] <= cap_end_date]
+    render_cards(card_grid([
+        summary_card([
+            f"""Your utilization for last month ({last_month_label}) was
+            <strong>{state["util_last_month"]:.1%}</strong>,
+            and utilization YTD is
+            <strong class="kpi-accent">{state["util_ytd"]:.1%}</strong>
+            {util_tooltip}""",
+            f"""Your average utilization target YTD is
+            <strong class="kpi-accent">{state["util_target"]:.1%}</strong>
+            and current utilization target is
+            <strong class="kpi-accent">{state["current_util_target"]:.1%}</strong>""",
+            f"""Billable Project hours in ({last_month_label}):
+            <strong>{state["project_last_month"]:.2f}</strong>
+            &nbsp;/&nbsp;
+            Baseline:
+            <strong>{state["adjusted_target_last_month"]:.2f}</strong>""",
+            f"""Billable Project hours YTD:
+            <strong>{state["project_ytd"]:.2f}</strong>
+            &nbsp;/&nbsp;
+            Baseline:
+            <strong>{state["adjusted_target_ytd"]:.2f}</strong>""",
+        ]),
+        stats_card(
+            "Additional Time Off",
+            [
+                ("Flex Used", state["flex_used"]),
+                ("Flex Booked", state["flex_booked"]),
+                ("OT Used", state["ot_used"]),
+                ("OT Booked", state["ot_booked"]),
+                ("Unpaid", state["unpaid_hours"]),
+            ],
+            tooltip="Additional Time off. Includes flex used & future booked, OT used & future booked, and Unpaid time off taken."
+        ),
+    ], columns="1.6fr 0.8fr"))
 
-    # Last month project hours
-    project_last_month = df_util[
-        (df_util["Utilization Category"] == "Billable Project") &
-        (df_util["Date"].between(last_month_start, last_month_end))
-    ]["Hours"].sum()
 
-    # YTD project hours
-    project_ytd = df_util[
-        (df_util["Utilization Category"] == "Billable Project") &
-        (df_util["Date"].between(ytd_start, ytd_end))
-    ]["Hours"].sum()
+@st.fragment
+@timed_function()
+def render_charts_2026(state):
+    import altair as alt
 
+    df_line = state["df_line"]
 
-    adjusted_target_last_month = adjusted_target_for_period(
-        last_month_start, last_month_end
+    # -----------------------
+    # BASE ENCODING
+    # -----------------------
+    base = alt.Chart(df_line).encode(
+        x=alt.X(
+            "WeekStart:T",
+            title="",
+            axis=alt.Axis(
+                format="%b",          # Jan, Feb, Mar
+                labelAngle=0,
+                tickCount="month"
+            )
+        )
     )
 
-    adjusted_target_ytd = adjusted_target_for_period(
-        ytd_start, ytd_end
+    # -----------------------
+    # UTILIZATION LINE
+    # -----------------------
+    util_line = base.mark_line(
+        strokeWidth=3,
+        color="#ED017F"
+    ).encode(
+        y=alt.Y(
+            "Utilization:Q",
+            axis=alt.Axis(format="%"),
+            title="Utilization",
+            scale=alt.Scale(zero=False)   # dynamic scale
+        ),
+        tooltip=[
+            alt.Tooltip("WeekStart:T", format="%b %d", title="Week"),
+            alt.Tooltip("Utilization:Q", format=".1%", title="Utilization"),
+            alt.Tooltip("Utilization Target:Q", format=".1%", title="Target")
+        ]
     )
 
-    util_last_month = (
-        project_last_month / adjusted_target_last_month
-        if adjusted_target_last_month > 0 else 0
+    # square markers
+    util_points = base.mark_point(
+        shape="square",
+        size=60,
+        filled=True,
+        color="#ED017F"
+    ).encode(
+        y="Utilization:Q"
     )
 
-    util_ytd = (
-        project_ytd / adjusted_target_ytd
-        if adjusted_target_ytd > 0 else 0
+    # labels
+    util_labels = base.mark_text(
+        dy=-10,
+        color="#ED017F",
+        fontSize=10
+    ).encode(
+        y="Utilization:Q",
+        text=alt.Text("Utilization:Q", format=".0%")
+    )
+    # -----------------------
+    # TARGET LINE
+    # -----------------------
+    target_line = base.mark_line(
+        strokeWidth=2,
+        color="black"
+    ).encode(
+        y="Utilization Target:Q"
     )
 
-    col_metrics, col_charts = st.columns([1.6, 0.8])
-
-    #----------------------
-    # Hours Worked Box
-    #----------------------
-    with col_metrics:
-        col_left, col_right = st.columns([0.6, 1])
-        with col_left:
-            components.html(f"""
-            <div style="
-                padding: 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                max-width: 400px;
-                text-align: center;
-                margin-top: 1rem;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <h3 style="margin:0 0 0.25rem 0; font-weight:600; color:#111827;">Hours Worked</h3>
-                <h1 style="margin:0 0 1rem 0; font-weight:700; font-size:3rem; color:#111827;">{total_working_hours:.1f}</h1>
-                
-                <div style="display:flex;justify-content:center; align-items:center; gap:2rem; font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;">
-                    <div style="text-align:center;">
-                        <p style="margin:0; font-size:0.9rem; color:#6b7280;">Project</p>
-                        <p style="margin:0; font-weight:600; font-size:1.2rem; color:#111827;">{project_hours:.1f}</p>
-                    </div>
-                    <div style="font-weight:700; font-size:1.2rem; color:#111827;">+</div>
-                    <div style="text-align:center;">
-                        <p style="margin:0; font-size:0.9rem; color:#6b7280;">Internal</p>
-                        <p style="margin:0; font-weight:600; font-size:1.2rem; color:#111827;">{internal_hours:.1f}</p>
-                    </div>
-                </div>
-            </div>
-            """, height=200)
+    # square markers
+    target_points = base.mark_point(
+        shape="square",
+        size=50,
+        filled=True,
+        color="black"
+    ).encode(
+        y="Utilization Target:Q"
+    )
 
-    
-    #----------------------
-    # Adjusted Target Box
-    #----------------------
+    # labels
+    target_labels = base.mark_text(
+        dy=10,
+        color="black",
+        fontSize=10
+    ).encode(
+        y="Utilization Target:Q",
+        text=alt.Text("Utilization Target:Q", format=".0%")
+    )
 
-        with col_right:
-            components.html(f"""
-            <div style="
-                padding: 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                max-width: 600px;
-                text-align: center;
-                margin-top: 1rem;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <h3 style="margin:0 0 0.25rem 0; font-weight:600; color:#111827;">Adjusted Baseline</h3>
-                <h1 style="margin:0 0 1rem 0; font-weight:700; font-size:3rem; color:#111827;">{adjusted_target:.1f}</h1>
-
-                <div style="display:flex;justify-content:center; align-items:center; gap:1.5rem; font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;">
-                    <div style="text-align:center;">
-                        <p style="margin:0; font-size:0.9rem; color:#6b7280;">Baseline</p>
-                        <p style="margin:0; font-weight:600; font-size:1.2rem; color:#111827;">{target_hours:.1f}</p>
-                    </div>
-                    <div style="font-weight:700; font-size:1.2rem; color:#111827;">-</div>
-                    <div style="text-align:center;">
-                        <p style="margin:0; font-size:0.9rem; color:#6b7280;">Vacation</p>
-                        <p style="margin:0; font-weight:600; font-size:1.2rem; color:#111827;">{pto_vacation:.1f}</p>
-                    </div>
-                    <div style="font-weight:700; font-size:1.2rem; color:#111827;">-</div>
-                    <div style="text-align:center;">
-                        <p style="margin:0; font-size:0.9rem; color:#6b7280;">Sick/Medical</p>
-                        <p style="margin:0; font-weight:600; font-size:1.2rem; color:#111827;">{pto_sick:.1f}</p>
-                    </div>
-                    <div style="font-weight:700; font-size:1.2rem; color:#111827;">-</div>
-                    <div style="text-align:center;">
-                        <p style="margin:0; font-size:0.9rem; color:#6b7280;">Stat + Office Closed</p>
-                        <p style="margin:0; font-weight:600; font-size:1.2rem; color:#111827;">{combined_closed:.1f}</p>
-                    </div>
-                    <div style="font-weight:700; font-size:1.2rem; color:#111827;">-</div>
-                    <div style="text-align:center;">
-                        <p style="margin:0; font-size:0.9rem; color:#6b7280;">Unpaid</p>
-                        <p style="margin:0; font-weight:600; font-size:1.2rem; color:#111827;">{unpaid_hours:.1f}</p>
-                    </div>
-                </div>
-            </div>
-            """, height=200)
+    # -----------------------
+    # FINAL CHART
+    # -----------------------
+    line_chart = (
+        util_line
+        + util_points
+        + util_labels
+        + target_line
+        + target_points
+        + target_labels
+    ).properties(
+        width="container",
+        height=320,
+        title="Weekly Utilization vs Target"
+    )
 
+    st.altair_chart(line_chart, width="stretch")
+    # agg_df = df_filtered.groupby(["Month", "Utilization Category"], as_index=False)["Hours"].sum()
 
-    #----------------------
-    # Pie Charts + Addl Time Off Box
-    #----------------------
+    # #agg_df = df_filtered.groupby(["Month", "Utilization Category"], as_index=False)["Hours"].sum()
+    # # Get totals by month for text labels
 
-    with col_charts:
-        chart_col1, chart_col2 = st.columns([1, 0.8])
-        with chart_col1:
-            fig_vac = donut_chart(
-                used=vacation_used,
-                remaining=vacation_remaining,
-                title="Vacation",
-                footer=f"Max: {vacation_max:.1f} hrs"
-            )
-            st.pyplot(fig_vac, use_container_width=False)
-
-        with chart_col2:
-            fig_sick = donut_chart(
-                used=sick_used,
-                remaining=sick_remaining,
-                title="Sick/Medical",
-                footer="Max: 37.5 hrs"
-            )
-            st.pyplot(fig_sick, use_container_width=False)
+    # totals_by_month = agg_df.groupby("Month")["Hours"].sum().reset_index()
+
+    # st.subheader("Monthly Hours by Utilization Category")
+    # bars = alt.Chart(agg_df).mark_bar().encode(
+    #     x="Month:N",
+    #     y="Hours:Q",
+    #     color=alt.Color(
+    #     "Utilization Category:N",
+    #     scale=alt.Scale(
+    #         domain=["Project", "Internal", "Budget PTO", "Add'l & Flex PTO"],
+    #         range=["black", "#50005C", "#ED017F", "#F2BEDA"])),
+    #     tooltip=["Month", "Utilization Category", "Hours"]
+    # ).properties(width=700, height=400)
 
-        st.markdown("<div style='height:0.75rem'></div>", unsafe_allow_html=True)
+    # text = alt.Chart(totals_by_month).mark_text(
+    #     dy=-10,
+    #     color="black"
+    # ).encode(
+    #     x="Month:N",
+    #     y="Hours:Q",
+    #     text=alt.Text("Hours:Q")
+    # )
+    # st.altair_chart(bars + text)
 
-    # ----------------------
-    # Bottom Summary Row
-    # ----------------------
 
-    util_left, util_right = st.columns([1.6, 0.8])
+@st.fragment
+@timed_function()
+def render_projection_2026(state):
+    projection = load_2026_projection()
+    if state["emp_name"] not in projection.index:
+        return
+    p = projection.loc[state["emp_name"]]
+
+    st.subheader("Year-End Projection")
+    band_tooltip = "Low and high are the 10th and 90th percentiles of 1,000 simulated rests-of-year, each week drawn from one of your last 8 weeks."
+
+    render_cards(
+        card_grid([
+            summary_card([
+                f"""At your recent utilization of <strong>{p["recent_util"]:.1%}</strong>,
+                over <strong>{p["remaining_baseline"]:.1f}</strong> baseline hours left this year
+                (after <strong>{p["booked_time_off"]:.1f}</strong> hrs of time off already booked),
+                you are on track for <strong class="kpi-accent">{p["util_p50"]:.1%}</strong> utilization
+                against a target of <strong class="kpi-accent">{p["util_target"]:.1%}</strong>.""",
+                f"""Vacation left unused at year end if nothing else is booked:
+                <strong>{p["vacation_unused"]:.1f}</strong> hrs.""",
+            ]),
+        ], columns="1fr"),
+        card_grid([
+            stats_card(
+                "Billable Hours",
+                [("Low", p["billable_p10"]), ("Likely", p["billable_p50"]), ("High", p["billable_p90"])],
+                tooltip=band_tooltip, decimals=1,
+            ),
+            stats_card(
+                "Utilization %",
+                [("Low", p["util_p10"] * 100), ("Likely", p["util_p50"] * 100), ("High", p["util_p90"] * 100)],
+                tooltip=band_tooltip, decimals=1,
+            ),
+            stats_card(
+                "Flex Bucket",
+                [("Low", p["flex_p10"]), ("Likely", p["flex_p50"]), ("High", p["flex_p90"])],
+                tooltip=band_tooltip, decimals=1,
+            ),
+            stats_card(
+                "OT Bucket",
+                [("Low", p["ot_p10"]), ("Likely", p["ot_p50"]), ("High", p["ot_p90"])],
+                tooltip=band_tooltip, decimals=1,
+            ),
+        ], columns="repeat(4, 1fr)"),
+    )
 
-    with util_left:
-        components.html(
-            f"""
-            <div style="
-                padding: 0.75rem 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                font-size: 0.95rem;
-                color: #374151;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <p style="margin:0;">
-                    Your utilization for last month (December 2025) was
-                    <strong>{util_last_month:.1%}</strong>,
-                    and utilization YTD is
-                    <strong><span style="color:#ED017F;">{util_ytd:.1%}</span></strong>. 
-                    Your utilization target is 
-                    <strong><span style="color:#ED017F;">{util_target:.1%}</span></strong>
-                </p>
-                <p style="margin:0.4rem 0 0 0;">
-                    Project hours in December:
-                    <strong>{project_last_month:.1f}</strong>
-                    &nbsp;/&nbsp;
-                    Baseline:
-                    <strong>{adjusted_target_last_month:.1f}</strong>
-                </p>
-                <p style="margin:0.25rem 0 0 0;">
-                    Project hours YTD:
-                    <strong>{project_ytd:.1f}</strong>
-                    &nbsp;/&nbsp;
-                    Baseline:
-                    <strong>{adjusted_target_ytd:.1f}</strong>
-                </p>
-            </div>
-            """,
-            height=120
-        )
 
-    with util_right:
-        components.html(
-            f"""
-            <div style="
-                margin: 0 auto;
-                padding: 0.75rem 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                max-width: 600px;
-                text-align: center;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <p style="
-                    margin: 0 0 0.5rem 0;
-                    font-size: 1.2rem;
-                    font-weight: 600;
-                    color: #111827;
-                ">
-                    Additional Time Off Taken
-                </p>
-
-                <div style="display:flex; justify-content:space-between;">
-                    <div>
-                        <p style="margin:0; font-size:0.8rem; color:#6b7280;">Flex</p>
-                        <p style="margin:0; font-weight:600; color:#111827;">{flex_vacation:.1f}</p>
-                    </div>
-                    <div>
-                        <p style="margin:0; font-size:0.8rem; color:#6b7280;">Unpaid</p>
-                        <p style="margin:0; font-weight:600; color:#111827;">{unpaid_hours:.1f}</p>
-                    </div>
-
-                </div>
-            </div>
-            """,
-            height=120
+@st.fragment
+@timed_function()
+def render_planner_2026(state):
+    from datetime import date, timedelta
+
+    capacity = load_2026_time_off_capacity()
+    projection = load_2026_projection()
+    p = projection.loc[state["emp_name"]] if state["emp_name"] in projection.index else None
+
+    today = date.today()
+    this_monday = today - timedelta(days=today.weekday())
+    planned = st.session_state.setdefault("planned_time_off", [])
+
+    # The picker opens on next week, kept inside the planned year
+    first, last = date(capacity["year"], 1, 1), date(capacity["year"], 12, 31)
+    default = tuple(
+        min(max(day, first), last)
+        for day in (this_monday + timedelta(weeks=1), this_monday + timedelta(weeks=1, days=4))
+    )
+
+    st.subheader("What-If Time Off")
+    col_kind, col_dates, col_add = st.columns([1, 1.4, 0.6], vertical_alignment="bottom")
+    with col_kind:
+        kind = st.selectbox(
+            "Type", PLANNER_KINDS, key="planner_kind",
+            format_func=lambda k: {"PTO Sick/Medical": "Sick / Medical", "Unpaid Time Off": "Unpaid"}.get(k, k),
+        )
+    with col_dates:
+        picked = st.date_input(
+            "Dates", value=default, min_value=first, max_value=last, key="planner_dates",
+            on_change=st.session_state.update, kwargs={"planner_picked": True},
+        )
+    # Once the user has picked dates they count right away; "Add" keeps them while another range is picked
+    pending = [(kind, picked[0], picked[-1])] if st.session_state.get("planner_picked") and len(picked) else []
+    with col_add:
+        st.button("Add", key="planner_add", disabled=not pending, on_click=planned.extend, args=(pending,))
+
+    for i, (k, start, end) in enumerate(planned):
+        col_text, col_remove = st.columns([4, 1], vertical_alignment="center")
+        col_text.caption(f"{k}: {start:%b %d} – {end:%b %d}")
+        col_remove.button("Remove", key=f"planner_remove_{i}", on_click=planned.pop, args=(i,))
+
+    plan = time_off_plan(capacity, state["emp_name"], planned + pending, this_monday)
+
+    results = apply_time_off_plan(
+        state, plan,
+        recent_util=p["recent_util"] if p is not None else 0.0,
+        remaining_baseline=p["remaining_baseline"] if p is not None else 0.0,
+    )
+    hours = sum(past + future for past, future in plan.values())
+
+    def card(title, key, scale=1, tooltip=None):
+        before, after = results[key]
+        return stats_card(
+            title,
+            [("Now", before * scale), ("Planned", after * scale), ("Change", (after - before) * scale)],
+            tooltip=tooltip, decimals=1,
         )
 
+    st.caption(f"Planned: {hours:.1f} hrs of time off on working days not already booked.")
+    render_cards(card_grid([
+        card("Adjusted Baseline", "adjusted_target", tooltip="Time off before this week comes off your baseline as if it had been logged."),
+        card("Hours ± Baseline", "delta_hours"),
+        card("Vacation Remaining", "vacation_remaining"),
+        card("Sick Remaining", "sick_remaining"),
+        card("Utilization YTD %", "util_ytd", scale=100),
+        card(
+            "Year-End Utilization %", "util_year_end", scale=100,
+            tooltip=f"At your recent utilization, against a target of {state['current_util_target']:.1%}. Time off from this week on reduces the baseline left this year.",
+        ),
+    ], columns="repeat(3, 1fr)"))
 
-    #----------------------
-    # BAR CHART
-    #----------------------
 
-    agg_df = df_filtered.groupby(["Month", "Utilization Category"], as_index=False)["Hours"].sum()
+@st.fragment
+@timed_function()
+def render_calendar_2026(state):
+    import altair as alt
 
-    #agg_df = df_filtered.groupby(["Month", "Utilization Category"], as_index=False)["Hours"].sum()
-    # Get totals by month for text labels
+    grid = load_2026_day_grid()
+    days = calendar_days(grid, state["emp_name"])
 
-    totals_by_month = agg_df.groupby("Month")["Hours"].sum().reset_index()
+    st.subheader("Your Year by Day")
+    st.caption("Each square is a day, colored by the category you logged most. Dots mark time off; hatched days are vacation booked ahead.")
 
-    st.subheader("Monthly Hours by Utilization Category")
-    bars = alt.Chart(agg_df).mark_bar().encode(
-        x="Month:N",
-        y="Hours:Q",
+    base = alt.Chart(days).encode(
+        x=alt.X("Week:O", title="", axis=alt.Axis(format="%b", labelAngle=0, labelOverlap=True)),
+        y=alt.Y("Weekday:O", title="", sort=["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]),
+    )
+    cells = base.mark_rect(cornerRadius=2, stroke="white", strokeWidth=1).encode(
         color=alt.Color(
-        "Utilization Category:N",
-        scale=alt.Scale(
-            domain=["Project", "Internal", "Budget PTO", "Add'l & Flex PTO"],
-            range=["black", "#50005C", "#ED017F", "#F2BEDA"])),
-        tooltip=["Month", "Utilization Category", "Hours"]
-    ).properties(width=700, height=400)
+            "Category:N",
+            title="",
+            scale=alt.Scale(
+                domain=["Billable Project", "Internal + Proposal", "Overhead", "Time Off", "No entries"],
+                range=["#ED017F", "#50005C", "#9CA3AF", "#F7B3D6", "#F3F4F6"],
+            ),
+            legend=alt.Legend(orient="bottom"),
+        ),
+        opacity=alt.condition("datum.Hours > 0 || datum.Booked", alt.value(1), alt.value(0.6)),
+        tooltip=[
+            alt.Tooltip("Date:T", format="%a %b %d"),
+            alt.Tooltip("Hours:Q", format=".2f"),
+            alt.Tooltip("Category:N"),
+            alt.Tooltip("Booked:N", title="Vacation booked"),
+        ],
+    )
+    pto_marks = base.transform_filter("datum.PTO").mark_text(text="•", color="white", fontSize=10)
+    booked_marks = base.transform_filter("datum.Booked").mark_text(text="╱╱", color="#ED017F", fontSize=9)
 
-    text = alt.Chart(totals_by_month).mark_text(
-        dy=-10,
-        color="black"
-    ).encode(
-        x="Month:N",
-        y="Hours:Q",
-        text=alt.Text("Hours:Q")
+    st.altair_chart(
+        (cells + pto_marks + booked_marks).properties(height=170),
+        width="stretch",
     )
-    st.altair_chart(bars + text)
 
 
-    pass
+PROJECT_PERIODS = {"Last 4 weeks": 4, "Last 13 weeks": 13, "YTD": None}
+
+
+@st.fragment
+@timed_function()
+def render_projects_2026(state):
+    import altair as alt
+    import pandas as pd
+
+    project_weeks = load_2026_project_weeks()
+    mine = project_weeks.get(state["emp_name"])
+    if mine is None or mine.empty:
+        return
+
+    st.subheader("Billable Hours by Project")
+    col_period, col_top = st.columns([2, 1])
+    with col_period:
+        period = st.segmented_control("Period", list(PROJECT_PERIODS), default="YTD", key="project_period") or "YTD"
+    with col_top:
+        top_n = st.number_input("Top projects", min_value=3, max_value=25, value=8, key="project_top_n")
+
+    last_week = mine["Week"].max()
+    first_week = mine["Week"].min()
+    if PROJECT_PERIODS[period]:
+        first_week = max(first_week, last_week - pd.Timedelta(weeks=PROJECT_PERIODS[period] - 1))
+    weeks = pd.date_range(first_week, last_week, freq="W-MON")
+
+    everything = top_projects(mine, weeks, top_n=len(mine))
+    projects = top_projects(mine, weeks, top_n=top_n)
+
+    chart = alt.Chart(projects).mark_bar(color="#ED017F").encode(
+        x=alt.X("Hours:Q", title="Hours"),
+        y=alt.Y("Project:N", title="", sort=None),
+        tooltip=[
+            alt.Tooltip("Project:N"),
+            alt.Tooltip("Hours:Q", format=".2f"),
+            alt.Tooltip("Share:Q", format=".1%"),
+        ],
+    ).properties(height=max(120, 28 * len(projects)))
+    st.altair_chart(chart, width="stretch")
+
+    st.dataframe(
+        projects,
+        hide_index=True,
+        column_config={
+            "Project": st.column_config.TextColumn("Project No - Title"),
+            "Hours": st.column_config.NumberColumn("Hours", format="%.2f"),
+            "Share": st.column_config.NumberColumn("Share", format="percent"),
+            "Weekly": st.column_config.LineChartColumn(
+                f"Weekly ({weeks[0]:%b %d} – {weeks[-1]:%b %d})", y_min=0
+            ),
+        },
+    )
+
+    if len(everything) > top_n:
+        with st.expander("Projects in Other"):
+            st.dataframe(
+                everything.iloc[top_n:][["Project", "Hours"]],
+                hide_index=True,
+                column_config={
+                    "Project": st.column_config.TextColumn("Project No - Title"),
+                    "Hours": st.column_config.NumberColumn("Hours", format="%.2f"),
+                },
+            )
+
+
+@st.fragment
+@timed_function()
+def render_download_2026(state):
+    st.subheader("Download Your Timesheet")
+    st.caption("Your timesheet rows, with totals by project and by month.")
+
+    col_format, col_action = st.columns([1, 1])
+    with col_format:
+        fmt = st.segmented_control("Format", list(FORMATS), default="CSV", key="download_format") or "CSV"
+
+    # The file is only built once asked for, then cached for the data version
+    with col_action:
+        if st.button("Prepare download", key="download_prepare"):
+            st.session_state["download_requested"] = True
+
+        if st.session_state.get("download_requested"):
+            data = load_2026_breakdown_file(state["emp_name"], fmt)
+            st.download_button(
+                f"Download {fmt}",
+                data=data,
+                file_name=f"timesheet_{state['first_name'].lower()}_2026.{FORMATS[fmt]['extension']}",
+                mime=FORMATS[fmt]["mime"],
+                key="download_file",
+            )
+
+
+@st.fragment
+@timed_function()
+def render_distribution_2026(state):
+    import altair as alt
+    import pandas as pd
+
+    distribution, offices = load_2026_utilization_distribution()
+    office = offices.get(state["emp_name"])
+
+    groups = [g for g in ["Firm", office] if g in distribution]
+    if not groups:
+        return
+
+    st.subheader("How You Compare")
+    col_group, col_period = st.columns([1, 1])
+    with col_group:
+        group = st.segmented_control(
+            "Compared with", groups, default="Firm", key="dist_group",
+            format_func=lambda g: "Whole firm" if g == "Firm" else f"{g} office",
+        ) or "Firm"
+    with col_period:
+        metric = st.segmented_control(
+            "Period", ["util_ytd", "util_last_month"], default="util_ytd", key="dist_period",
+            format_func=lambda m: "YTD" if m == "util_ytd" else state["last_month_label"],
+        ) or "util_ytd"
+
+    values = distribution[group].get(metric)
+    if values is None:
+        st.caption("Not enough people in this group to show a distribution.")
+        return
+
+    mine = state[metric]
+    q1, median, q3 = quartiles(values)
+    hist = pd.DataFrame(utilization_histogram(values), columns=["bin", "count"])
+    hist["yours"] = (hist["bin"] <= mine) & (mine < hist["bin"] + 0.1)
+    if mine >= hist["bin"].iloc[-1]:
+        hist.loc[hist.index[-1], "yours"] = True
+
+    chart_col, stats_col = st.columns([1.6, 0.8])
+    with chart_col:
+        chart = alt.Chart(hist).mark_bar().encode(
+            x=alt.X("bin:Q", title="Utilization", bin="binned", axis=alt.Axis(format="%")),
+            x2="bin_end:Q",
+            y=alt.Y("count:Q", title="People"),
+            color=alt.condition("datum.yours", alt.value("#ED017F"), alt.value("#F7B3D6")),
+            tooltip=[alt.Tooltip("bin:Q", format=".0%", title="From"), alt.Tooltip("count:Q", title="People")],
+        ).transform_calculate(bin_end="datum.bin + 0.1").properties(height=240)
+        st.altair_chart(chart, width="stretch")
+
+    with stats_col:
+        render_cards(card_grid([
+            stats_card(
+                f"Your Percentile: {percentile_rank(values, mine):.0%}",
+                [("Q1 %", q1 * 100), ("Median %", median * 100), ("Q3 %", q3 * 100), ("You %", mine * 100)],
+                tooltip=f"Share of the {len(values)} people in this group whose utilization is below yours. Groups smaller than five are never shown.",
+                decimals=1,
+            ),
+        ], columns="1fr"))
+
+
+@st.fragment
+@timed_function()
+def render_team_2026(team):
+    st.subheader("My Team")
+
+    columns = {
+        "Legal Office": st.column_config.TextColumn("Office"),
+        "total_working_hours": st.column_config.NumberColumn("Hours Worked", format="%.2f"),
+        "adjusted_target": st.column_config.NumberColumn("Adjusted Baseline", format="%.2f"),
+        "delta_hours": st.column_config.NumberColumn("Hours ± Baseline", format="%.2f"),
+        "util_ytd": st.column_config.NumberColumn("Utilization YTD", format="percent"),
+        "current_util_target": st.column_config.NumberColumn("Utilization Target", format="percent"),
+        "vacation_remaining": st.column_config.NumberColumn("Vacation Left", format="%.2f"),
+        "sick_remaining": st.column_config.NumberColumn("Sick Left", format="%.2f"),
+        "flex_bucket": st.column_config.NumberColumn("Flex Bucket", format="%.2f"),
+        "ot_bucket": st.column_config.NumberColumn("OT Bucket", format="%.2f"),
+    }
+
+    st.dataframe(
+        team[list(columns)],
+        column_config={"Full Name": st.column_config.TextColumn("Name"), **columns},
+    )
+
+
+@st.fragment
+@timed_function()
+def render_offices_2026():
+    import altair as alt
+
+    version, cube = load_2026_office_cube()
+    all_offices = sorted(cube.index.get_level_values("Legal Office").unique())
+
+    st.subheader("Legal Offices")
+    col_filter, col_freq = st.columns([3, 1])
+    with col_filter:
+        offices = st.multiselect("Office", all_offices, default=all_offices, key="office_filter")
+    with col_freq:
+        freq = st.segmented_control("Group by", ["Week", "Month"], default="Month", key="office_freq") or "Month"
+
+    if not offices:
+        st.info("Select at least one office.")
+        return
+
+    rollup = load_2026_office_rollup(version, freq[0], tuple(sorted(offices)), cube).reset_index()
+
+    chart = alt.Chart(rollup).mark_line(point=True).encode(
+        x=alt.X("Period:T", title="", axis=alt.Axis(format="%b %d" if freq == "Week" else "%b")),
+        y=alt.Y("utilization:Q", title="Utilization", axis=alt.Axis(format="%")),
+        color=alt.Color("Legal Office:N", title="Office"),
+        tooltip=[
+            alt.Tooltip("Legal Office:N", title="Office"),
+            alt.Tooltip("Period:T", format="%b %d, %Y"),
+            alt.Tooltip("utilization:Q", format=".1%", title="Utilization"),
+            alt.Tooltip("weighted_target:Q", format=".1%", title="Weighted Target"),
+        ],
+    ).properties(height=320, title="Utilization by Office")
+    st.altair_chart(chart, width="stretch")
+
+    st.dataframe(
+        rollup,
+        hide_index=True,
+        column_config={
+            "Legal Office": st.column_config.TextColumn("Office"),
+            "Period": st.column_config.DateColumn("Week of" if freq == "Week" else "Month", format="MMM D, YYYY"),
+            "contract_hours": None,
+            "pto_hours": st.column_config.NumberColumn("PTO Taken", format="%.2f"),
+            "billable_hours": st.column_config.NumberColumn("Billable Hours", format="%.2f"),
+            "baseline_hours": st.column_config.NumberColumn("Adjusted Baseline", format="%.2f"),
+            "utilization": st.column_config.NumberColumn("Utilization", format="percent"),
+            "weighted_target": st.column_config.NumberColumn("Weighted Target", format="percent"),
+        },
+        column_order=["Legal Office", "Period", "billable_hours", "baseline_hours", "utilization", "weighted_target", "pto_hours"],
+    )
 
 
 def render_2026_dashboard():
@@ -865,1153 +1272,162 @@ def render_2026_dashboard():
     #        unsafe_allow_html=True
     #    )
 
-    
-
-    def target_hours_in_period(row, period_start, period_end):
-        period_start = pd.Timestamp(period_start)
-        period_end = pd.Timestamp(period_end)
-
-        start = max(row["Start"], period_start)
-        end = min(row["End"], period_end)
-
-        if start > end:
-            return 0
-
-        weekdays = pd.date_range(start, end, freq="B")
-        return len(weekdays) * row["Daily_Hours"]
-
-
-    def adjusted_target_for_period(start_date, end_date):
-    # Normalize dates
-        start_date = start_date.date() if hasattr(start_date, "date") else start_date
-        end_date = end_date.date() if hasattr(end_date, "date") else end_date
-
-        df_util["Date"] = pd.to_datetime(df_util["Date"]).dt.date
-
-        # Target hours
-        target = (
-            df_user[df_user["Full Name"] == emp_name]
-            .apply(target_hours_in_period, axis=1, args=(start_date, end_date))
-            .sum()
-        )
-
-        # PTO taken
-        pto = df_util[
-            (df_util["Date"] >= start_date) &
-            (df_util["Date"] <= end_date) &
-            (df_util["Project No - Title"].isin([
-                "Vacation",
-                "PTO Office Closed",
-                "Stat Holidays",
-                "Unpaid Time Off",
-                "PTO Sick/Medical"
-            ]))
-        ]["Hours"].sum()
-
-        return max(target - pto, 0)
-
-
-    def weekday_hours(row):
-            weekdays = pd.bdate_range(start=row["Start"], end=row["End"])
-            return len(weekdays) * row["Daily_Hours"]
-
-
-    def title_info_annotation(text, x=0.63):
-            return dict(
-                text="ⓘ",
-                x=x,
-                y=1.02,
-                xref="paper",
-                yref="paper",
-                showarrow=False,
-                font=dict(size=14, color="#6B7280"),
-                hovertext=text,
-                hoverlabel=dict(
-                    bgcolor="white",
-                    font_size=12,
-                    font_color="#111827"
-                ),
-            )
-
-
-    def donut_chart_plotly(used, remaining, title, footer, annotation_text):
-        fig = go.Figure(
-            data=[
-                go.Pie(
-                    values=[used, remaining],
-                    labels=["Used", "Remaining"],
-                    hole=0.72,
-                    direction="clockwise",
-                    marker=dict(
-                        colors=["#ED017F", "#F7B3D6"]
-                    ),
-                    textinfo="none",
-                    hovertemplate="%{label}: %{value:.2f} hrs<extra></extra>",
-                )
-            ]
-        )
-
-        fig.update_layout(
-            title=dict(
-                text=title,
-                y=1,
-                x=0.5,
-                xanchor="center",
-                yanchor="top",
-                font=dict(size=25, color="#111827"),
-            ),
-            annotations=[
-                title_info_annotation(annotation_text),
-                dict(
-                    text=f"<b>{used:.2f}</b>",
-                    x=0.5,
-                    y=0.5,
-                    font=dict(size=25, color="#111827"),
-                    showarrow=False,
-                ),
-                dict(
-                    text=footer,
-                    x=0.5,
-                    y=-0.25,
-                    font=dict(size=15, color="#6b7280"),
-                    showarrow=False,
-                ),
-            ],
-            showlegend=False,
-            margin=dict(t=40, b=35, l=0, r=0),
-            height=240,
-        )
+    with timed("load 2026 state", cached=True) as stage:
+        state = load_2026_state(st.user.email)
+    observe_cached_load("state_2026", stage)
+    account_session("state", deep_size(state))
 
-        return fig
-
-
-    def donut_chart_plotly_vacation(
-        used,
-        booked,
-        remaining,
-        title,
-        footer,
-        annotation_text
-    ):
-        fig = go.Figure(
-            data=[
-                go.Pie(
-                    values=[used, booked, remaining],
-                    labels=["Used", "Future Booked", "Remaining"],
-                    hole=0.72,
-                    marker=dict(
-                        colors=[
-                            "#ED017F",   
-                            "#ED017F",
-                            "#F7B3D6"    
-                        ],
-
-                        pattern=dict(
-                            shape=["", "/", ""],   # <-- pattern only on Future Booked
-                            fgcolor="#ED017F",
-                            solidity=0.5
-                        )
-                    ),
-                    textinfo="none",
-                    hovertemplate="%{label}: %{value:.2f} hrs<extra></extra>",
-                )
-            ]
-        )
+    render_header_2026(state)
 
-        fig.update_layout(
-            title=dict(
-                text=title,
-                y=1,
-                x=0.5,
-                xanchor="center",
-                yanchor="top",
-                font=dict(size=25, color="#111827"),
-            ),
-            annotations=[
-                title_info_annotation(annotation_text),
-            dict(
-                    text=f"<b>{used + booked:.2f}</b>",
-                    x=0.5,
-                    y=0.5,
-                    font=dict(size=25, color="#111827"),
-                    showarrow=False,
-                ),
-            dict(
-                    text=footer,
-                    x=0.5,
-                    y=-0.25,
-                    font=dict(size=15, color="#6b7280"),
-                    showarrow=False,
-                ),
-
-
-            dict(
-                x=0.70,
-                y=0.62,
-                xanchor="left",
-                yanchor="middle",
-                text=f"<span style='color:#ED017F;'>■</span> Used: {used:.1f} hrs",
-                showarrow=False,
-                font=dict(size=13, color="#111827"),
-            ),
-            dict(
-                x=0.70,
-                y=0.52,
-                xanchor="left",
-                yanchor="middle",
-                text=f"<span style='color:#ED017F;'>▧</span> Future Booked: {booked:.1f} hrs",
-                showarrow=False,
-                font=dict(size=13, color="#111827"),
-            ),
-            dict(
-                x=0.70,
-                y=0.42,
-                xanchor="left",
-                yanchor="middle",
-                text=f"<span style='color:#F7B3D6;'>■</span> Remaining: {remaining:.1f} hrs",
-                showarrow=False,
-                font=dict(size=13, color="#111827"),
-            ),
-        ],
+    inject_card_styles()
 
+    st.markdown(
+        """
+        <style>
+        div[data-testid="metric-container"] {
+            background-color: #f5f5f5;
+            padding: 10px;
+            border-radius: 8px;
+            text-align: center;
             
-            showlegend=False,
-            margin=dict(t=40, b=35, l=0, r=0),
-            height=240,
-        )
-
-        return fig
-    
-    df_user = get_sharepoint_file(
-        client_id=st.secrets["sharepoint"]["client_id"],
-        client_secret=st.secrets["sharepoint"]["client_secret"],
-        tenant_id=st.secrets["sharepoint"]["tenant_id"],
-        site_url=st.secrets["sharepoint"]["site_url"],
-        file_path=st.secrets["sharepoint"]["userfig_path_2026"],
-        sheet_name="PQ")
-
-    df = get_sharepoint_file(
-        client_id=st.secrets["sharepoint"]["client_id"],
-        client_secret=st.secrets["sharepoint"]["client_secret"],
-        tenant_id=st.secrets["sharepoint"]["tenant_id"],
-        site_url=st.secrets["sharepoint"]["site_url"],
-        file_path=st.secrets["sharepoint"]["timesheet_path_2026"],
-        sheet_name="PQ"
-    )
-
-    df_allowance = get_sharepoint_file(
-        client_id=st.secrets["sharepoint"]["client_id"],
-        client_secret=st.secrets["sharepoint"]["client_secret"],
-        tenant_id=st.secrets["sharepoint"]["tenant_id"],
-        site_url=st.secrets["sharepoint"]["site_url"],
-        file_path=st.secrets["sharepoint"]["allowance_path_2026"],
-        sheet_name="PQ"
+        }
+        </style>
+        """,
+        unsafe_allow_html=True
     )
 
-    df_flexot = get_sharepoint_file(
-        client_id=st.secrets["sharepoint"]["client_id"],
-        client_secret=st.secrets["sharepoint"]["client_secret"],
-        tenant_id=st.secrets["sharepoint"]["tenant_id"],
-        site_url=st.secrets["sharepoint"]["site_url"],
-        file_path=st.secrets["sharepoint"]["flexot_path_2026"],
-        sheet_name="PQ"
+    st.markdown(
+        """
+        <style>
+        .stSelectbox > div[data-baseweb="select"] > div,
+        .stMultiSelect > div[data-baseweb="select"] > div {
+            color: black;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True
     )
 
-    logged_in_email = st.user.email
-    user_info = df_user[df_user["Email"].str.lower() == logged_in_email.lower()]
-
-    if not user_info.empty:
-        emp_name = user_info.iloc[0]["Full Name"]
-    else:
-        emp_name = "Unknown User"
-    first_name = emp_name.split(" ")[0]
+    render_kpi_cards_2026(state)
 
+    render_donuts_2026(state)
 
-    today = datetime.today()
-    monday = today - timedelta(days=today.weekday())
-    monday_date = monday.date()
-    last_refreshed = monday.strftime("%B %d, %Y")
+    render_utilization_panel_2026(state)
 
+    render_charts_2026(state)
 
+    render_projection_2026(state)
 
-    df_allowance_user = df_allowance[
-    df_allowance["Employee Full Name"].str.lower() == emp_name.lower()
-]
-    latest_date = (
-    df[
-        (df["Employee Full Name"].str.lower() == emp_name.lower()) &
-        (df["Utilization Category"] != "Time Off")
-    ]["Date"]
-    .max()
-    )
-    latest_date_str = latest_date.strftime("%B %d, %Y")
-
-    if not df_allowance_user.empty:
-        timesheet_date_week = pd.to_datetime(
-            df_allowance_user["Timesheet Week"]
-        ).max()   # safer than iloc[0]
+    render_planner_2026(state)
 
-        timesheet_monday = (
-            timesheet_date_week - timedelta(days=timesheet_date_week.weekday())
-        ).date()
-    else:
-        timesheet_monday = None
+    render_calendar_2026(state)
 
+    render_projects_2026(state)
 
+    render_distribution_2026(state)
 
-    if timesheet_monday is not None:
-        timesheet_date_str = timesheet_monday.strftime("%B %d, %Y")
-        is_stale = timesheet_monday != monday_date
-    else:
-        timesheet_date_str = "Unavailable"
-        is_stale = True
+    render_download_2026(state)
 
+    # Team view for anyone listed as a manager in userfig
+    if st.user.email.lower().strip() in load_2026_managers():
+        render_team_2026(direct_reports(load_2026_employee_table(), st.user.email))
+        render_offices_2026()
 
-    timesheet_color = "#DC2626" if is_stale else "#374151"   # red vs normal
-    timesheet_weight = "600" if is_stale else "400"
 
-    
+#----------------------
+# DIAGNOSTICS
+#----------------------
 
-    col_left, col_right = st.columns([3, 1])
+def render_diagnostics():
+    # Stage timings and memory for this process; admins are listed in secrets as
+    # [diagnostics] admins = ["name@aspect.ca", ...]
+    admins = [email.lower() for email in st.secrets.get("diagnostics", {}).get("admins", [])]
+    if st.user.email.lower() not in admins:
+        return
 
-    with col_left:
-        st.markdown(
-            f"""
-            <h2 style="margin-bottom: 0;">
-                Good morning, <span style="color:#ED017F;">{first_name}</span>
-            </h2>
-            <p style="margin-top: 0.1rem; color: #374151; font-size: 1.2rem;">
-                Your year so far:
-            </p>
-            """,
-            unsafe_allow_html=True
+    with st.expander("Diagnostics"):
+        warm = warmup_status()
+        if warm["status"] == "skipped":
+            st.caption(f"Boot warmup ({warm['year']}): skipped.")
+        elif warm["status"] != "not started":
+            st.caption(f"Boot warmup ({warm['year']}): {warm['status']} after {warm['seconds'] or 0:.1f} s. {warm['error'] or ''}")
+        st.caption("Wall time per stage over the last 1,000 calls in this process.")
+        st.dataframe(
+            diagnostics_summary(),
+            hide_index=True,
+            column_config={
+                "stage": st.column_config.TextColumn("Stage"),
+                "count": st.column_config.NumberColumn("Calls"),
+                "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%.1f"),
+                "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%.1f"),
+                "p99_ms": st.column_config.NumberColumn("p99 (ms)", format="%.1f"),
+                "max_ms": st.column_config.NumberColumn("Max (ms)", format="%.1f"),
+                "bytes": st.column_config.NumberColumn("Bytes / call", format="compact"),
+                "rows": st.column_config.NumberColumn("Rows / call", format="compact"),
+                "cache_hit_rate": st.column_config.NumberColumn("Cache hits", format="percent"),
+            },
         )
 
-    with col_right:
-        st.markdown(
-            f"""
-            <p style="
-                text-align: right;
-                color: #374151;
-                font-size: 0.9rem;
-            ">
-                <strong>Last refreshed:</strong> {last_refreshed}
-                    <span
-                        class="info-tooltip"
-                        title="The data refresh date. Timesheet data is refreshed weekly on Mondays. Your Baseline is updated till the Friday before the refresh."
-                        style="vertical-align: super;" 
-                    > ⓘ</span>
-            </p>
-            <p style="
-                text-align: right;
-                color: {timesheet_color};
-                font-size: 0.9rem;
-                font-weight: {timesheet_weight};
-            ">
-                <strong>Your Timesheet Week:</strong> {timesheet_date_str}
-                <span
-                    class="info-tooltip"
-                    title="The most recent timesheet week included in this dashboard. If this date is before the last refreshed date, your timesheet may have missing entries, hence the red color. Please ensure your timesheet is up to date."
-                    style="vertical-align: super;"
-                > ⓘ</span>
-            </p>
-            <p style="
-                text-align: right;
-                color: #374151;
-                font-size: 0.9rem;
-            ">
-                <strong>Last Timesheet Date Included:</strong> {latest_date_str}
-                    <span
-                        class="info-tooltip"
-                        title="The last included timesheet date in the latest refresh (For partial completion)"
-                        style="vertical-align: super;" 
-                    > ⓘ</span>
-            </p>
-            """,
-            unsafe_allow_html=True
-        )
-
-
-    st.markdown(
-        """
-        <style>
-        div[data-testid="metric-container"] {
-            background-color: #f5f5f5;
-            padding: 10px;
-            border-radius: 8px;
-            text-align: center;
-            
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
-
-    st.markdown(
-        """
-        <style>
-        .stSelectbox > div[data-baseweb="select"] > div,
-        .stMultiSelect > div[data-baseweb="select"] > div {
-            color: black;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
-
-
-    #----------------------
-    # TARGET HRS CALC
-    #----------------------
-    # Convert dates
-    df_user["Start"] = pd.to_datetime(df_user["Start"], errors="coerce")
-    df_user["End"] = pd.to_datetime(df_user["End"], errors="coerce")
-
-    # Hard cap date
-    cap_end_date = monday-timedelta(days=1)  # Sunday this week
-
-    # Fill open-ended contracts to cap date
-    df_user["End"] = df_user["End"].fillna(cap_end_date)
-
-    # Cap all End dates at Dec 31, 2025
-    df_user["End"] = df_user["End"].clip(upper=cap_end_date)
-
-    # Calculate daily working hours
-    df_user["Daily_Hours"] = np.where(
-        df_user["Working Hrs"] > 0,
-        df_user["Working Hrs"] / 5,
-        0
-    )
-
-    df_user["Target Working Hrs (Contract)"] = df_user.apply(weekday_hours, axis=1)
-
-
-    # Aggregate by employee
-    df_target = df_user.groupby(["Full Name", "Legal Office"], as_index=False)["Target Working Hrs (Contract)"].sum()
-
-
-    #----------------------
-    # TIMESHEET CLEANING
-    #----------------------
-
-    df.rename(columns={
-        "Employee Full Name": "Full Name", 
-        "Sum of Hours": "Hours"
-    }, inplace=True)
-
-    # Convert Date
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Month"] = df["Date"].dt.to_period("M").astype(str)
-
-    # Force Utilization Category order
-    cat_order = ["Billable Project", "Internal + Proposal", "Overhead", "Time Off"]
-    df["Utilization Category"] = pd.Categorical(
-        df["Utilization Category"], 
-        categories=cat_order, 
-        ordered=True
-    )
-
-    # Filter timesheet to only include dates before start of this week
-    today = datetime.today()
-    start_of_week = today - timedelta(days=today.weekday())  # Monday this week
-    df_future = df[df["Date"] >= start_of_week].copy()
-    df = df[df["Date"] < start_of_week]
-
-    # Target vs Actual Comparison
-    df_filtered = df[df["Full Name"] == emp_name]
-    df_actual = df_filtered.groupby("Full Name", as_index=False)["Hours"].sum()
-    df_comparison = pd.merge(df_target, df_actual, on="Full Name", how="left").fillna(0)
-    totals_by_util = df_filtered.groupby("Utilization Category")["Hours"].sum().reset_index()
-
-    future_vacation = df_future[
-        (df_future["Full Name"] == emp_name) &
-        (df_future["Project No - Title"].isin([
-            "Vacation",
-            "PTO Flex Vacation"
-        ]))
-    ]
-
-    #----------------------
-    # METRICS
-    #----------------------
-    project_hours = df_filtered.loc[df_filtered["Utilization Category"] == "Billable Project", "Hours"].sum()
-    internalplusproposal_hours = df_filtered.loc[df_filtered["Utilization Category"] == "Internal + Proposal", "Hours"].sum()
-    overhead_hours = df_filtered.loc[df_filtered["Utilization Category"] == "Overhead", "Hours"].sum()
-    total_working_hours = project_hours + internalplusproposal_hours + overhead_hours
-    #budget_pto = totals_by_util.loc[totals_by_util["Utilization Category"] == "Budget PTO", "Hours"].sum()
-    #flex_pto = totals_by_util.loc[totals_by_util["Utilization Category"] == "Add'l & Flex PTO", "Hours"].sum()
-
-    # Calculate PTO breakdown
-    budget_pto_breakdown = df_filtered[df_filtered["Utilization Category"] == "Time Off"]
-    budget_pto_grouped = budget_pto_breakdown.groupby("Project No - Title")["Hours"].sum().reset_index()
-
-    # Add PTO Flex from Add'l & Flex PTO
-    flex_hours = df_filtered.loc[df_filtered["Project No - Title"] == "PTO Flex Vacation", "Hours"].sum()
-    flex_row = pd.DataFrame({"Project No - Title": ["PTO Flex Vacation"], "Hours": [flex_hours]})
-    budget_pto_grouped = pd.concat([budget_pto_grouped, flex_row], ignore_index=True)
-    unpaid_hours = df_filtered.loc[df_filtered["Project No - Title"] == "Unpaid Time Off", "Hours"].sum()
-
-    prod_hours = df_filtered.loc[df_filtered["Project No - Title"] == "Professional Development", "Hours"].sum()
-    future_vacation_hours = future_vacation.loc[future_vacation["Project No - Title"] == "Vacation","Hours"].sum()
-    future_flex_hours = future_vacation.loc[future_vacation["Project No - Title"] == "PTO Flex Vacation","Hours"].sum()
-
-    # PTO titles order
-    titles_order = ["Vacation", "PTO Sick/Medical","PTO Flex Vacation", "Stat Holidays", "PTO Office Closed"]
-
-    # Merge to ensure all titles exist
-    all_titles_df = pd.DataFrame({"Project No - Title": titles_order})
-    budget_pto_grouped = pd.merge(all_titles_df, budget_pto_grouped, on="Project No - Title", how="left").fillna(0)
-
-
-    df_allowance.rename(columns={
-        "Employee Full Name": "Full Name"
-    }, inplace=True)
-
-    df_allowance["Full Name"] = df_allowance["Full Name"].str.strip()
-    df_target["Full Name"] = df_target["Full Name"].str.strip()
-
-    df_target = df_target.merge(
-        df_allowance,
-        on="Full Name",
-        how="left"
-    )
-
-    vacation_max = (
-        df_target.loc[df_target["Full Name"] == emp_name, "Allowance"]
-        .fillna(0)
-        .iloc[0]
-    )
-
-
-    #  max allocations per PTO type
-    pto_max = {
-        "Vacation": vacation_max,
-        "Sick/Medical": 37.5,
-        "Stat Holidays": np.nan,
-        "PTO Office Closed": np.nan,
-        "Flex": np.nan
-    }
-
-    # Get target working hours for the selected employee
-    target_hours = df_target.loc[df_target["Full Name"] == emp_name, "Target Working Hrs (Contract)"].sum()
-    # Calculate PTO amounts
-    pto_vacation = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Vacation", "Hours"].sum()
-    pto_sick = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Sick/Medical", "Hours"].sum() + budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Bereavement", "Hours"].sum()
-    stat_holidays = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Stat Holidays", "Hours"].sum()
-    office_closed = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Office Closed", "Hours"].sum()
-    combined_closed = stat_holidays + office_closed
-
-    # Calculate Adjusted Target
-    adjusted_target = target_hours - pto_vacation - pto_sick - combined_closed - unpaid_hours
-    flex_vacation = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Flex Vacation", "Hours"].sum()
-
-
-    # PTO max values
-    vacation_max = pto_max["Vacation"]
-    sick_max = pto_max["Sick/Medical"]
-
-    vacation_used = min(pto_vacation, vacation_max)
-    vacation_remaining = max(vacation_max - vacation_used - future_vacation_hours, 0)
-
-    sick_used = min(pto_sick, sick_max)
-    sick_remaining = max(sick_max - sick_used, 0)
-
-
-    # -------------------------
-    # UTILIZATION DATE WINDOWS
-    # -------------------------
-
-    df_filtered["Date"] = pd.to_datetime(df_filtered["Date"]).dt.normalize()
-    cap_end_date = pd.to_datetime(cap_end_date).normalize()
-
-    # Last month relative to current data cutoff
-    last_month_end = cap_end_date.replace(day=1) - pd.Timedelta(days=1)
-
-    last_month_start = last_month_end.replace(day=1)
-
-    ytd_start = pd.Timestamp("2026-01-01")
-    ytd_end = cap_end_date
-
-    df_util = df_filtered[df_filtered["Date"] <= cap_end_date]
-
-    # Last month project hours
-    project_last_month = df_util[
-        (df_util["Utilization Category"] == "Billable Project") &
-        (df_util["Date"].between(last_month_start, last_month_end, inclusive="both"))
-    ]["Hours"].sum()
-
-    # YTD project hours
-    project_ytd = df_util[
-        (df_util["Utilization Category"] == "Billable Project") &
-        (df_util["Date"].between(ytd_start, ytd_end))
-    ]["Hours"].sum()
-
-    adjusted_target_last_month = adjusted_target_for_period(
-        last_month_start, last_month_end
-    )
-
-    adjusted_target_ytd = adjusted_target_for_period(
-        ytd_start, ytd_end
-    )
-
-    util_last_month = (
-        project_last_month / adjusted_target_last_month
-        if adjusted_target_last_month > 0 else 0
-    )
-
-    util_ytd = (
-        project_ytd / adjusted_target_ytd
-        if adjusted_target_ytd > 0 else 0
-    )
-
-    delta_hours =  total_working_hours  - adjusted_target
-    last_month_label = last_month_start.strftime("%B %Y")
-
-    #----------------------
-    # Hours Worked Box
-    #----------------------
-
-
-
-    df_flexot_user = df_flexot[
-    df_flexot["Full Name"].str.lower() == emp_name.lower()
-    ]
-    flex_bucket = df_flexot_user["Flex Bucket"].sum()
-    ot_bucket = df_flexot_user["OT Bucket"].sum()
-
-    valid_targets = df_flexot_user.loc[
-    df_flexot_user["Utilization Target"] > 0, "Utilization Target"
-    ]
-
-    util_target = valid_targets.mean() if not valid_targets.empty else 0
-
-    r1_c1, r1_c2, r1_c3 = st.columns(3, gap="large")
-
-    with r1_c1:
-            components.html(f"""
-            <div style="
-                width: 100%;
-                padding: 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                box-sizing: border-box;
-                text-align: center;
-                margin-top: 0rem;
-                margin-bottom: 0rem;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <h3 style="margin:0 0 0.25rem 0; font-weight:600; color:#111827;">Hours Worked<span
-                    class="info-tooltip"
-                    title="Total hours worked.Includes: \nBillable Project: Client Projects\nInternal+Proposals: Internal Projects + Proposals\nOverhead: Internal time codes"
-                    style="
-                        font-size: 1rem;
-                        font-weight: 400;
-                        color: #6B7280;
-                        vertical-align: super;"        
-                > ⓘ</span></h3>
-                            
-                <h1 style="margin:0 0 1rem 0; font-weight:700; font-size:3rem; color:#111827;">{total_working_hours:.2f}</h1>
-                <div style="
-                display:grid;
-                grid-template-columns: auto auto auto;
-                gap:1.5rem;
-                justify-content:center;
-                ">
-                
-                    <div style="display:flex;justify-content:center; align-items:center; gap:2rem; font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;">
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">BillableProject</p>
-                            <p style="margin:0; font-weight:600; font-size:0.9rem; color:#111827;">{project_hours:.2f}</p>
-                        </div>
-                        <div style="font-weight:700; font-size:1.0.9rem; color:#111827;">+</div>
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">Internal + Proposal</p>
-                            <p style="margin:0; font-weight:600; font-size:0.9rem; color:#111827;">{internalplusproposal_hours:.2f}</p>
-                        </div>
-                        <div style="font-weight:700; font-size:1.0.9rem; color:#111827;">+</div>
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">Overhead</p>
-                            <p style="margin:0; font-weight:600; font-size:0.9rem; color:#111827;">{overhead_hours:.2f}</p>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """,height=200)
-    
-    #----------------------
-    # Adjusted Target Box
-    #----------------------
-
-    with r1_c2:
-            components.html(f"""
-            <div style="
-                width: 100%;
-                padding: 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                box-sizing: border-box;
-                text-align: center;
-                margin-top: 0rem;
-                margin-bottom: 0rem;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <h3 style="margin:0 0 0.25rem 0; font-weight:600; color:#111827;">Adjusted Baseline<span
-                    class="info-tooltip"
-                    title="Your adjusted baseline. Baseline is calculated per your weekly working hours, minus any budgeted time off taken (vacation, sick, stat, unpaid). Stat includes both statutory holidays and winter break time. Sick includes bereavment."
-                    style="
-                        font-size: 1rem;
-                        font-weight: 400;
-                        color: #6B7280;
-                        vertical-align: super;    "        
-                > ⓘ</span></h3>
-                <h1 style="margin:0 0 1rem 0; font-weight:700; font-size:3rem; color:#111827;">{adjusted_target:.2f}</h1>
-
-                <div style="
-                display:grid;
-                grid-template-columns: repeat(auto-fit, minmax(90px, 1fr));
-                gap:1rem;
-                ">
-
-                    <div style="display:flex;justify-content:center; align-items:center; gap:1.5rem; font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;">
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">Baseline</p>
-                            <p style="margin:0; font-weight:600; font-size:0.9rem; color:#111827;">{target_hours:.2f}</p>
-                        </div>
-                        <div style="font-weight:700; font-size:0.9rem; color:#111827;">-</div>
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">Vacation</p>
-                            <p style="margin:0; font-weight:600; font-size:0.9rem; color:#111827;">{pto_vacation:.2f}</p>
-                        </div>
-                        <div style="font-weight:700; font-size:0.9rem; color:#111827;">-</div>
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">Sick/Medical</p>
-                            <p style="margin:0; font-weight:600; font-size:0.9rem; color:#111827;">{pto_sick:.2f}</p>
-                        </div>
-                        <div style="font-weight:700; font-size:0.9rem; color:#111827;">-</div>
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">Stat</p>
-                            <p style="margin:0; font-weight:600; font-size:0.9rem; color:#111827;">{combined_closed:.2f}</p>
-                        </div>
-                        <div style="font-weight:700; font-size:0.9rem; color:#111827;">-</div>
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">Unpaid</p>
-                            <p style="margin:0; font-weight:600; font-size:0.9rem; color:#111827;">{unpaid_hours:.2f}</p>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            """,height=200)
-
-    with r1_c3:
-            components.html(f"""
-            <div style="
-                width: 100%;
-                padding: 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                box-sizing: border-box;
-                text-align: center;
-                margin-top: 0rem;
-                margin-bottom: 0rem;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-            <h3 style="margin:0 0 0.25rem 0; font-weight:600; color:#111827;">Hours ± Baseline<span
-                    class="info-tooltip"
-                    title="If you don't want to do the math. If your timesheet is up to date, this shows how many hours you've worked above or below your adjusted baseline."
-                    style="
-                        font-size: 1rem;
-                        font-weight: 400;
-                        color: #6B7280;
-                        vertical-align: super;    "        
-                > ⓘ</span></h3>
-            <h1 style="margin:0 0 1rem 0; font-weight:700; font-size:3rem; color:#111827;">{delta_hours:.2f}</h1>                 
-                <div style="display:flex;justify-content:center; align-items:center; gap:1.5rem; font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;">
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">Hours Worked</p>
-                            <p style="margin:0; font-weight:600; font-size:1rem; color:#111827;">{total_working_hours:.2f}</p>
-                        </div>
-                        <div style="font-weight:700; font-size:1rem; color:#111827;">-</div>
-                        <div style="text-align:center;">
-                            <p style="margin:0; font-size:0.9rem; color:#6b7280;">Adjusted Baseline</p>
-                            <p style="margin:0; font-weight:600; font-size:1rem; color:#111827;">{adjusted_target:.2f}</p>
-                        </div>
-                </div>
-            </div>
-            """,height=200)
-
-    #st.markdown("<div style='margin-top:-0.75rem'></div>", unsafe_allow_html=True)
-    r2a_c1, r2a_c2 = st.columns(2, gap="small")
-    with r2a_c1:
-            components.html(f"""
-            <div style="
-                width: 100%;
-                padding: 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                box-sizing: border-box;
-                text-align: center;
-                margin-top: 0rem;
-                margin-bottom: 0rem;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <h3 style="margin:0 0 0.25rem 0; font-weight:600; color:#111827;">Flex Bucket<span
-                    class="info-tooltip"
-                    title="Additions:\nAdjusted Baseline < Working Hours < 40\nDeductions:\n(Adjusted Baseline - Working Hours) if Working Hours < Adjusted Baseline + Flex Time Used + Future Flex booked + Cap Deductions"
-                    style="
-                        font-size: 1rem;
-                        font-weight: 400;
-                        color: #6B7280;
-                        vertical-align: super;"        
-                > ⓘ</span></h3>
-                            
-                <h1 style="margin:0 0 1rem 0; font-weight:700; font-size:3rem; color:#111827;">{flex_bucket:.2f}</h1>
-                <div style="
-                display:grid;
-                grid-template-columns: auto auto auto;
-                gap:1.5rem;
-                justify-content:center;
-                ">
-                </div>
-            </div>
-            """,height=200)
-
-    with r2a_c2:
-            components.html(f"""
-            <div style="
-                width: 100%;
-                padding: 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                box-sizing: border-box;
-                text-align: center;
-                margin-top: 0rem;
-                margin-bottom: 0rem;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <h3 style="margin:0 0 0.25rem 0; font-weight:600; color:#111827;">OT Bucket<span
-                    class="info-tooltip"
-                    title="Additions:\nOT Hours according to the policy\nDeductions:\nOT PTO Used + Future OT PTO booked + Payout OT"
-                    style="
-                        font-size: 1rem;
-                        font-weight: 400;
-                        color: #6B7280;
-                        vertical-align: super;"        
-                > ⓘ</span></h3>
-                            
-                <h1 style="margin:0 0 1rem 0; font-weight:700; font-size:3rem; color:#111827;">{ot_bucket:.2f}</h1>
-                <div style="
-                display:grid;
-                grid-template-columns: auto auto auto;
-                gap:1.5rem;
-                justify-content:center;
-                ">
-                </div>
-            </div>
-            """,height=200)
-
-    r2_c1, r2_c2, r2_c3 = st.columns(3, gap="small")
-    #----------------------
-    # Pie Charts + Addl Time Off Box
-    #----------------------
-
-    with r2_c1:
-        fig_pd = donut_chart_plotly(
-            used=prod_hours,
-            remaining=30 - prod_hours,
-            title="PD",
-            footer="Max: 30 hrs",
-            annotation_text= "Professional development time you have used."
-        )
-        st.plotly_chart(fig_pd, use_container_width=True, config ={"displayModeBar": False})
-
-    with r2_c2:
-        fig_vac = donut_chart_plotly_vacation(
-        used=vacation_used,
-        booked=future_vacation_hours,
-        remaining=vacation_remaining,
-        title="Vacation",
-        footer=f"Max: {vacation_max:.1f} hrs",
-        annotation_text= "Vacation time you have used and booked. Future booked time is shown with a pattern."
-    )
-        st.plotly_chart(fig_vac, use_container_width=True, config ={"displayModeBar": False})
-
-    with r2_c3:
-        fig_sick = donut_chart_plotly(
-            used=sick_used,
-            remaining=sick_remaining,
-            title="Sick / Medical",
-            footer="Max: 37.5 hrs",
-            annotation_text= "Sick time you have used."
-        )
-        st.plotly_chart(fig_sick, use_container_width=True, config ={"displayModeBar": False})
-
-    flex_used = df_flexot_user["Flex PTO"].sum()
-    flex_booked = df_flexot_user["Future Flex PTO"].sum()
-    ot_used = df_flexot_user["OT PTO"].sum() + df_flexot_user["Payout OT"].sum()
-    ot_booked = df_flexot_user["Future OT PTO"].sum()
-
-    current_util_target = (
-        df_allowance.loc[df_allowance["Full Name"] == emp_name, "Utilization Target"]
-        .fillna(0)
-        .iloc[0]
-    )
-    # ----------------------
-    # Bottom Summary Row
-    # ----------------------
-    util_left, util_right = st.columns([1.6, 0.8])
-
-    with util_left:
-        components.html(
-            f"""
-            <div style="
-                width: 100%;
-                box-sizing: border-box;
-                padding: 0.75rem 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                font-size: 0.95rem;
-                color: #374151;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <p style="margin:0;">
-                    Your utilization for last month ({last_month_label}) was
-                    <strong>{util_last_month:.1%}</strong>,
-                    and utilization YTD is
-                    <strong><span style="color:#ED017F;">{util_ytd:.1%}</span></strong>
-                    <strong><span
-                    class="info-tooltip"
-                    title="Your utilization vs target. If you take flex time or OT time off, your utilization will be impacted as they are included in the adjusted baseline.\nYour average utilization target is the average of your utilization target over the weeks, accounting for any changes because of the updated calculation of Utilization."
-                    style="
-                        font-size: 1rem;
-                        font-weight: 400;
-                        color: #6B7280;
-                        vertical-align: super;    "        
-                > ⓘ</span></strong>
-                </p>
-                <p style="margin:0.4rem 0 0 0;"> 
-                    Your average utilization target YTD is 
-                    <strong><span style="color:#ED017F;">{util_target:.1%}</span></strong>
-                    and current utilization target is
-                    <strong><span style="color:#ED017F;">{current_util_target:.1%}</span></strong>
-                </p>
-                 
-                
-                <p style="margin:0.4rem 0 0 0;">
-                    Billable Project hours in ({last_month_label}):
-                    <strong>{project_last_month:.2f}</strong>
-                    &nbsp;/&nbsp;
-                    Baseline:
-                    <strong>{adjusted_target_last_month:.2f}</strong>
-                </p>
-                <p style="margin:0.25rem 0 0 0;">
-                    Billable Project hours YTD:
-                    <strong>{project_ytd:.2f}</strong>
-                    &nbsp;/&nbsp;
-                    Baseline:
-                    <strong>{adjusted_target_ytd:.2f}</strong>
-                </p>
-            </div>
-            """,
-            height=160
+        process_budget, cache_budget = memory_budgets()
+        caches = shared_cache_sizes()
+        limit = container_memory_limit()
+        st.caption("Memory")
+        st.dataframe(
+            [
+                {"measure": "Process RSS", "bytes": process_rss(), "budget": process_budget},
+                {"measure": "Shared caches", "bytes": sum(caches.values()), "budget": cache_budget},
+                {"measure": "Container limit", "bytes": limit, "budget": None},
+            ],
+            hide_index=True,
+            column_config={
+                "measure": st.column_config.TextColumn("Measure"),
+                "bytes": st.column_config.NumberColumn("Bytes", format="compact"),
+                "budget": st.column_config.NumberColumn("Budget", format="compact"),
+            },
         )
-
-    with util_right:
-        components.html(
-            f"""
-            <div style="
-                margin: 0 auto;
-                padding: 0.75rem 1rem;
-                border: 1px solid #e5e7eb;
-                border-radius: 10px;
-                text-align: center;
-                font-family: 'Source Sans Pro', 'Helvetica Neue', Helvetica, Arial, sans-serif;
-            ">
-                <p style="
-                    margin: 0 0 0.5rem 0;
-                    font-size: 1.2rem;
-                    font-weight: 600;
-                    color: #111827;
-                ">
-                    Additional Time Off<span
-                    class="info-tooltip"
-                    title="Additional Time off. Includes flex used & future booked, OT used & future booked, and Unpaid time off taken."
-                    style="
-                        font-size: 1rem;
-                        font-weight: 400;
-                        color: #6B7280;
-                        vertical-align: super;    "        
-                > ⓘ</span>
-                </p>
-
-                <div style="display:flex; justify-content:space-between;">
-                    <div>
-                        <p style="margin:0; font-size:0.8rem; color:#6b7280;">Flex Used</p>
-                        <p style="margin:0; font-weight:600; color:#111827;">{flex_used:.2f}</p>
-                    </div>
-                    <div>
-                        <p style="margin:0; font-size:0.8rem; color:#6b7280;">Flex Booked</p>
-                        <p style="margin:0; font-weight:600; color:#111827;">{flex_booked:.2f}</p>
-                    </div>
-                    <div>
-                        <p style="margin:0; font-size:0.8rem; color:#6b7280;">OT Used</p>
-                        <p style="margin:0; font-weight:600; color:#111827;">{ot_used:.2f}</p>
-                    </div>
-                    <div>
-                        <p style="margin:0; font-size:0.8rem; color:#6b7280;">OT Booked</p>
-                        <p style="margin:0; font-weight:600; color:#111827;">{ot_booked:.2f}</p>
-                    </div>
-                    <div>
-                        <p style="margin:0; font-size:0.8rem; color:#6b7280;">Unpaid</p>
-                        <p style="margin:0; font-weight:600; color:#111827;">{unpaid_hours:.2f}</p>
-                    </div>
-                </div>
-            </div>
-            """,
-            height=160
+        st.caption("Shared caches (cache_data: pickled entries; cache_resource: in-memory size) and source tables as loaded.")
+        st.dataframe(
+            [{"cache": name, "bytes": size} for name, size in sorted(caches.items(), key=lambda item: -item[1])]
+            + [{"cache": f"table {name}", "bytes": size} for name, size in sorted(table_sizes().items())],
+            hide_index=True,
+            column_config={
+                "cache": st.column_config.TextColumn("Cache"),
+                "bytes": st.column_config.NumberColumn("Bytes", format="compact"),
+            },
         )
-
-
-    df_line = df_flexot_user.copy()
-
-    df_line["WeekStart"] = pd.to_datetime(df_line["WeekStart"])
-    df_line = df_line.sort_values("WeekStart")
-
-    # -----------------------
-    # BASE ENCODING
-    # -----------------------
-    base = alt.Chart(df_line).encode(
-        x=alt.X(
-            "WeekStart:T",
-            title="",
-            axis=alt.Axis(
-                format="%b",          # Jan, Feb, Mar
-                labelAngle=0,
-                tickCount="month"
-            )
+        st.caption("Sessions active in the last hour: what each one's last run held.")
+        st.dataframe(
+            session_memory(),
+            hide_index=True,
+            column_config={
+                "session": st.column_config.TextColumn("Session"),
+                "bytes": st.column_config.NumberColumn("Bytes", format="compact"),
+                "largest": st.column_config.TextColumn("Largest"),
+            },
         )
-    )
-
-    # -----------------------
-    # UTILIZATION LINE
-    # -----------------------
-    util_line = base.mark_line(
-        strokeWidth=3,
-        color="#ED017F"
-    ).encode(
-        y=alt.Y(
-            "Utilization:Q",
-            axis=alt.Axis(format="%"),
-            title="Utilization",
-            scale=alt.Scale(zero=False)   # dynamic scale
-        ),
-        tooltip=[
-            alt.Tooltip("WeekStart:T", format="%b %d", title="Week"),
-            alt.Tooltip("Utilization:Q", format=".1%", title="Utilization"),
-            alt.Tooltip("Utilization Target:Q", format=".1%", title="Target")
-        ]
-    )
-
-    # square markers
-    util_points = base.mark_point(
-        shape="square",
-        size=60,
-        filled=True,
-        color="#ED017F"
-    ).encode(
-        y="Utilization:Q"
-    )
-
-    # labels
-    util_labels = base.mark_text(
-        dy=-10,
-        color="#ED017F",
-        fontSize=10
-    ).encode(
-        y="Utilization:Q",
-        text=alt.Text("Utilization:Q", format=".0%")
-    )
-    # -----------------------
-    # TARGET LINE
-    # -----------------------
-    target_line = base.mark_line(
-        strokeWidth=2,
-        color="black"
-    ).encode(
-        y="Utilization Target:Q"
-    )
-
-    # square markers
-    target_points = base.mark_point(
-        shape="square",
-        size=50,
-        filled=True,
-        color="black"
-    ).encode(
-        y="Utilization Target:Q"
-    )
-
-    # labels
-    target_labels = base.mark_text(
-        dy=10,
-        color="black",
-        fontSize=10
-    ).encode(
-        y="Utilization Target:Q",
-        text=alt.Text("Utilization Target:Q", format=".0%")
-    )
-
-    # -----------------------
-    # FINAL CHART
-    # -----------------------
-    line_chart = (
-        util_line
-        + util_points
-        + util_labels
-        + target_line
-        + target_points
-        + target_labels
-    ).properties(
-        width="container",
-        height=320,
-        title="Weekly Utilization vs Target"
-    )
-
-    st.altair_chart(line_chart, use_container_width=True)
-    # agg_df = df_filtered.groupby(["Month", "Utilization Category"], as_index=False)["Hours"].sum()
-
-    # #agg_df = df_filtered.groupby(["Month", "Utilization Category"], as_index=False)["Hours"].sum()
-    # # Get totals by month for text labels
-
-    # totals_by_month = agg_df.groupby("Month")["Hours"].sum().reset_index()
-
-    # st.subheader("Monthly Hours by Utilization Category")
-    # bars = alt.Chart(agg_df).mark_bar().encode(
-    #     x="Month:N",
-    #     y="Hours:Q",
-    #     color=alt.Color(
-    #     "Utilization Category:N",
-    #     scale=alt.Scale(
-    #         domain=["Project", "Internal", "Budget PTO", "Add'l & Flex PTO"],
-    #         range=["black", "#50005C", "#ED017F", "#F2BEDA"])),
-    #     tooltip=["Month", "Utilization Category", "Hours"]
-    # ).properties(width=700, height=400)
-
-    # text = alt.Chart(totals_by_month).mark_text(
-    #     dy=-10,
-    #     color="black"
-    # ).encode(
-    #     x="Month:N",
-    #     y="Hours:Q",
-    #     text=alt.Text("Hours:Q")
-    # )
-    # st.altair_chart(bars + text)
-
-    pass
-
-if year == "2025":
-    render_2025_dashboard()
-else:
-    render_2026_dashboard()
-
 
 
+process_budget, cache_budget = memory_budgets()
+enforce_memory_budget(EVICTION_ORDER, process_budget, cache_budget)
+start_session_run(memory_session())
+start_metrics_server()
+set_attributes(session=memory_session(), year=year)
+if trace_settings.get("user_key"):
+    set_attributes(user=pseudonym(st.user.email.lower(), trace_settings["user_key"]))
+
+try:
+    with timed(f"render {year}") as stage:
+        if year == "2025":
+            render_2025_dashboard()
+        else:
+            render_2026_dashboard()
+    RENDER_SECONDS.observe(stage["seconds"], view=year)
+
+    account_session("session_state", deep_size(st.session_state.to_dict()))
+    render_diagnostics()
+except BaseException as e:
+    # Includes Streamlit's rerun/stop signals, which end the run early
+    set_attributes(exception=type(e).__name__)
+    raise
+finally:
+    finish_trace()
@@ -0,0 +1,356 @@
+"""
+Synthetic SharePoint tables for profiling and testing without real data.
+
+Generates seeded userfig, timesheet, allowance and (2026) flexot tables in
+the schemas the dashboard reads, for anything from a handful to tens of
+thousands of employees: contracts with mid-year changes, joiners and
+leavers, daily billable/internal/overhead hours around each person's
+utilization target, stat holidays, office closures, vacation weeks, sick
+days, time off booked ahead, stale timesheets and weekly flex/OT rows. The
+same size, year, seed and date always give the same tables.
+
+Tables are written as a snapshot directory (what --snapshot reads in the
+offline jobs) or as xlsx workbooks named like the SharePoint files:
+
+    python synthetic.py --employees 1000 --out snapshots/synthetic-1000
+    python synthetic.py --employees 50 --year 2025 --format xlsx --out synthetic/2025
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+SCHEMAS = {
+    2025: {
+        "sheet": "in",
+        "billable": "Project",
+        "internal": "Internal",
+        "overhead": "Internal",
+        "time_off": "Budget PTO",
+        "flex": "Add'l & Flex PTO",
+        "stat_holidays": ["2025-01-01", "2025-02-17", "2025-04-18", "2025-05-19", "2025-07-01", "2025-08-04",
+                          "2025-09-01", "2025-09-30", "2025-10-13", "2025-11-11", "2025-12-25", "2025-12-26"],
+        "office_closed": ["2025-12-29", "2025-12-30", "2025-12-31"],
+    },
+    2026: {
+        "sheet": "PQ",
+        "billable": "Billable Project",
+        "internal": "Internal + Proposal",
+        "overhead": "Overhead",
+        "time_off": "Time Off",
+        "flex": "Time Off",
+        "stat_holidays": ["2026-01-01", "2026-02-16", "2026-04-03", "2026-05-18", "2026-07-01", "2026-08-03",
+                          "2026-09-07", "2026-09-30", "2026-10-12", "2026-11-11", "2026-12-25", "2026-12-28"],
+        "office_closed": ["2026-12-29", "2026-12-30", "2026-12-31"],
+    },
+}
+
+# Snapshot table name -> SharePoint file stem (xlsx output is <stem>_<year>.xlsx)
+FILES = {"df_user": "userfig", "df": "timesheet", "df_allowance": "allowance", "df_flexot": "flexot"}
+
+EXCEL_MAX_ROWS = 1_048_575   # one row is the header
+
+OFFICES = {"Vancouver": 0.36, "Victoria": 0.24, "Kelowna": 0.12, "Calgary": 0.12, "Nanaimo": 0.08, "Seattle": 0.08}
+
+FIRST_NAMES = [
+    "Aaron", "Aisha", "Alex", "Amelia", "Andre", "Anna", "Ben", "Bianca", "Carlos", "Chloe", "Daniel", "Diana",
+    "Emily", "Ethan", "Fatima", "Felix", "Grace", "Hamid", "Hannah", "Ian", "Isabel", "Jack", "Jasmine", "Jonah",
+    "Julia", "Kai", "Laura", "Liam", "Maya", "Mohammed", "Nadia", "Noah", "Olivia", "Omar", "Priya", "Quinn",
+    "Rachel", "Ravi", "Sofia", "Tom",
+]
+LAST_NAMES = [
+    "Anderson", "Bauer", "Brown", "Chen", "Clarke", "Davies", "Dubois", "Evans", "Fischer", "Garcia", "Gill",
+    "Gupta", "Hall", "Ito", "Johnson", "Kaur", "Kim", "Larsen", "Lee", "MacDonald", "Martin", "Moreau", "Nguyen",
+    "Novak", "Okafor", "Olsen", "Patel", "Reid", "Rossi", "Sato", "Schmidt", "Singh", "Smith", "Tanaka", "Thomas",
+    "Walker", "Wang", "Wilson", "Wong", "Young",
+]
+PROJECT_NAMES = [
+    "Harbour Street Tower", "Cedar Elementary Seismic", "Riverside Rental", "Marine Drive Mixed Use",
+    "Hillside Care Home", "North Shore Library", "Lakeview Townhomes", "Gateway Parkade", "Pier 7 Retrofit",
+    "Maple Ridge Arena", "Oak Bay Residence", "Station Square Office", "Summit Lodge", "Bridgeview Warehouse",
+]
+INTERNAL_TITLES = ["Admin", "Proposal - Fee Estimate", "Internal Training", "Marketing", "Team Meeting"]
+OVERHEAD_TITLES = ["Overhead - General", "IT Support", "Office Management"]
+
+
+#----------------------
+# PEOPLE
+#----------------------
+
+def _names(n, rng):
+    """n unique "First Last" names, with a middle initial once the plain pairs run out."""
+    pairs = len(FIRST_NAMES) * len(LAST_NAMES)
+    if n > pairs * 27:
+        raise ValueError(f"at most {pairs * 27} employees can be generated")
+    picks = rng.permutation(pairs)[:min(n, pairs)].tolist()
+    if n > pairs:
+        picks += (pairs + rng.permutation(pairs * 26)[:n - pairs]).tolist()
+
+    names = []
+    for pick in picks:
+        initial, pair = divmod(pick, pairs)
+        first, last = FIRST_NAMES[pair // len(LAST_NAMES)], LAST_NAMES[pair % len(LAST_NAMES)]
+        names.append(f"{first} {chr(64 + initial)}. {last}" if initial else f"{first} {last}")
+    return np.array(names, dtype=object)
+
+
+def _userfig(names, year, rng):
+    """Contract rows for the year, and each employee's hire date."""
+    n = len(names)
+    year_start = np.datetime64(f"{year}-01-01", "D")
+
+    # Most people started years ago; some join during the year
+    joined = rng.random(n) < 0.12
+    start = np.where(joined, year_start + rng.integers(0, 300, n), year_start - rng.integers(30, 15 * 365, n))
+    leaves = rng.random(n) < 0.05
+    end = np.where(leaves, np.maximum(start, year_start) + rng.integers(30, 330, n), np.datetime64("NaT"))
+    hired = pd.DatetimeIndex(start.astype("datetime64[ns]"))
+    # A year's userfig contract starts on Jan 1 at the earliest
+    start = np.maximum(start, year_start)
+
+    working_hrs = rng.choice([37.5, 40.0, 30.0, 22.5], n, p=[0.8, 0.08, 0.08, 0.04])
+    target = rng.choice([0.0, 0.6, 0.7, 0.75, 0.8, 0.85], n, p=[0.08, 0.1, 0.25, 0.3, 0.2, 0.07])
+    offices = rng.choice(list(OFFICES), n, p=list(OFFICES.values()))
+    emails = np.array([name.lower().replace(". ", "").replace(" ", ".") + "@example.com" for name in names], dtype=object)
+    # A few addresses are stored in capitals, as some are in SharePoint
+    shouting = rng.random(n) < 0.03
+    emails[shouting] = [email.upper() for email in emails[shouting]]
+
+    # One manager per ~8 people; managers report to the first manager
+    managers = rng.choice(n, max(1, n // 8), replace=False)
+    manager = emails[rng.choice(managers, n)]
+    manager[managers] = emails[managers[0]]
+    manager[managers[0]] = None
+
+    users = pd.DataFrame({
+        "Full Name": names,
+        "Email": emails,
+        "Start": start.astype("datetime64[ns]"),
+        "End": end.astype("datetime64[ns]"),
+        "Working Hrs": working_hrs,
+        "Legal Office": offices,
+        "Utilization Target": target,
+        "Manager Email": manager,
+    })
+
+    # Some contracts change hours mid-year: the first row ends, a second starts the next day
+    changes = np.flatnonzero((rng.random(n) < 0.08) & ~joined & ~leaves)
+    change_date = (year_start + rng.integers(60, 300, len(changes))).astype("datetime64[ns]")
+    second = users.iloc[changes].copy()
+    second["Start"] = change_date
+    second["Working Hrs"] = rng.choice([22.5, 30.0, 37.5], len(changes))
+    users.loc[changes, "End"] = change_date - np.timedelta64(1, "D")
+
+    return pd.concat([users, second]).sort_index(kind="stable").reset_index(drop=True), hired
+
+
+#----------------------
+# TIMESHEET
+#----------------------
+
+def _timesheet(users, names, target, schema, year, cutoff, stale_from, rng):
+    """
+    Daily rows for every contract business day in `year`. Days before
+    `cutoff` (this week's Monday) have worked hours or time off; later days
+    only have time off that is already booked. An employee's worked hours
+    stop at their `stale_from` date, as a missing timesheet would.
+    """
+    n = len(names)
+    days = pd.bdate_range(f"{year}-01-01", f"{year}-12-31").to_numpy()
+    week = (days - days[0]).astype("timedelta64[D]").astype(int) // 7
+
+    # (contract row, day) pairs -> (employee, day) with that contract's daily hours
+    emp_of_row = pd.Index(names).get_indexer(users["Full Name"])
+    start = users["Start"].to_numpy()
+    end = users["End"].fillna(pd.Timestamp(f"{year}-12-31")).to_numpy()
+    row, day = np.nonzero((days[None, :] >= start[:, None]) & (days[None, :] <= end[:, None]))
+    emp = emp_of_row[row]
+    daily = users["Working Hrs"].to_numpy()[row] / 5
+    date = days[day]
+    past = date < cutoff
+
+    # What kind of day each one is
+    stat = np.isin(date, np.array(schema["stat_holidays"], dtype="datetime64[ns]"))
+    closed = np.isin(date, np.array(schema["office_closed"], dtype="datetime64[ns]"))
+    vacation_weeks = rng.random((n, week.max() + 1)) < rng.uniform(0.03, 0.07, n)[:, None]
+    vacation = vacation_weeks[emp, week[day]] | (rng.random(len(emp)) < 0.02)
+    vacation &= past | (rng.random(len(emp)) < 0.6)   # not all of the year's vacation is booked yet
+    draw = rng.random(len(emp))
+    sick = past & (draw < 0.02)
+    flex = past & (draw >= 0.02) & (draw < 0.03)
+    unpaid = past & (draw >= 0.03) & (draw < 0.032)
+    bereavement = past & (draw >= 0.032) & (draw < 0.0325) & (year >= 2026)
+
+    title = np.full(len(emp), None, dtype=object)
+    for mask, name in [
+        (bereavement, "Bereavement"), (unpaid, "Unpaid Time Off"), (flex, "PTO Flex Vacation"),
+        (sick, "PTO Sick/Medical"), (vacation, "Vacation"), (closed, "PTO Office Closed"), (stat, "Stat Holidays"),
+    ]:
+        title[mask] = name   # later masks win: a stat holiday is never a vacation day
+    off = title != None   # noqa: E711
+    category = np.where(title == "PTO Flex Vacation", schema["flex"], schema["time_off"])
+
+    frames = [pd.DataFrame({
+        "Date": date[off],
+        "Employee Full Name": names[emp[off]],
+        "Sum of Hours": daily[off],
+        "Utilization Category": category[off],
+        "Project No - Title": title[off],
+    })]
+
+    # Worked days: billable around the person's target, the rest internal/overhead
+    work = ~off & past & (date < stale_from[emp])
+    e, d, hours = emp[work], date[work], np.round(daily[work] * rng.uniform(0.95, 1.2, work.sum()) * 4) / 4
+    share = np.clip(target[e] + rng.normal(0, 0.12, len(e)), 0, 1)
+    billable = np.round(hours * share * 4) / 4
+    internal = np.round((hours - billable) * rng.uniform(0.3, 0.8, len(e)) * 4) / 4
+    overhead = hours - billable - internal
+
+    projects = np.array([
+        f"{year % 100}{i:03d} - {PROJECT_NAMES[i % len(PROJECT_NAMES)]}" + (f" Phase {i // len(PROJECT_NAMES) + 1}" if i >= len(PROJECT_NAMES) else "")
+        for i in range(max(20, len(names) // 3))
+    ], dtype=object)
+    own_projects = rng.integers(0, len(projects), (n, 4))
+    development = rng.random(len(e)) < 0.03
+    internal_title = np.array(INTERNAL_TITLES, dtype=object)[rng.integers(0, len(INTERNAL_TITLES), len(e))]
+    internal_title[development] = "Professional Development"
+
+    for hrs, cat, ttl in [
+        (billable, schema["billable"], projects[own_projects[e, rng.integers(0, 4, len(e))]]),
+        (internal, schema["internal"], internal_title),
+        (overhead, schema["overhead"], np.array(OVERHEAD_TITLES, dtype=object)[rng.integers(0, len(OVERHEAD_TITLES), len(e))]),
+    ]:
+        keep = hrs > 0
+        frames.append(pd.DataFrame({
+            "Date": d[keep],
+            "Employee Full Name": names[e[keep]],
+            "Sum of Hours": hrs[keep],
+            "Utilization Category": cat,
+            "Project No - Title": ttl[keep],
+        }))
+
+    return pd.concat(frames, ignore_index=True).sort_values(["Date", "Employee Full Name"], kind="stable").reset_index(drop=True)
+
+
+def _flexot(df, users, names, target, schema, year, cutoff, rng):
+    """Weekly flex/OT rows for every employee up to last week (2026 only)."""
+    weeks = pd.date_range(f"{year}-01-01", cutoff - pd.Timedelta(days=7), freq="W-MON")
+    ts = df[df["Date"] < cutoff]
+    week_start = ts["Date"] - pd.to_timedelta(ts["Date"].dt.weekday, unit="D")
+    worked = ts.groupby(["Employee Full Name", week_start])["Sum of Hours"].sum()
+    billable = ts[ts["Utilization Category"] == schema["billable"]].groupby(["Employee Full Name", week_start])["Sum of Hours"].sum()
+    flex_pto = ts[ts["Project No - Title"] == "PTO Flex Vacation"].groupby(["Employee Full Name", week_start])["Sum of Hours"].sum()
+
+    grid = pd.MultiIndex.from_product([names, weeks], names=["Full Name", "WeekStart"])
+    contract = users.groupby("Full Name")["Working Hrs"].last().reindex(grid.get_level_values(0)).to_numpy()
+    worked = worked.reindex(grid, fill_value=0).to_numpy()
+    over = worked - contract
+
+    n = len(grid)
+    ot_pto = np.where(rng.random(n) < 0.02, 7.5, 0.0)
+    return pd.DataFrame({
+        "Full Name": grid.get_level_values(0),
+        "WeekStart": grid.get_level_values(1),
+        "Flex Bucket": np.round(np.clip(over, -7.5, None) * 0.75, 2),
+        "OT Bucket": np.round(np.clip(over, 0, None) * 0.25, 2),
+        "Utilization": np.where(contract > 0, billable.reindex(grid, fill_value=0).to_numpy() / np.where(contract > 0, contract, 1), 0),
+        "Utilization Target": np.repeat(target, len(weeks)),
+        "Flex PTO": flex_pto.reindex(grid, fill_value=0).to_numpy(),
+        "Future Flex PTO": np.where(rng.random(n) < 0.01, 7.5, 0.0),
+        "OT PTO": ot_pto,
+        "Payout OT": np.where(rng.random(n) < 0.005, np.round(rng.uniform(1, 8, n) * 4) / 4, 0.0),
+        "Future OT PTO": np.where(rng.random(n) < 0.005, 7.5, 0.0),
+    })
+
+
+#----------------------
+# TABLES
+#----------------------
+
+def generate(employees, year=2026, seed=0, today=None):
+    """
+    The tables the dashboard loads for `year`, keyed like the offline jobs'
+    snapshots (df_user, df, df_allowance and, for 2026, df_flexot).
+    """
+    schema = SCHEMAS[year]
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp(today or datetime.today()).normalize()
+    cutoff = min(today - pd.Timedelta(days=today.weekday()), pd.Timestamp(f"{year + 1}-01-01"))   # Monday this week
+
+    names = _names(employees, rng)
+    users, hired = _userfig(names, year, rng)
+    first = users.drop_duplicates("Full Name").set_index("Full Name").reindex(names)
+    target = first["Utilization Target"].to_numpy()
+
+    # Most timesheets are in up to this week; some are a few weeks behind
+    behind = np.where(rng.random(employees) < 0.12, rng.integers(1, 5, employees), 0)
+    timesheet_week = cutoff - pd.to_timedelta(behind * 7, unit="D")
+    stale_from = timesheet_week.to_numpy()
+
+    df = _timesheet(users, names, target, schema, year, cutoff, stale_from, rng)
+
+    tenure = (pd.Timestamp(f"{year}-01-01") - hired).days.to_numpy() / 365
+    allowance = np.select([tenure >= 8, tenure >= 3], [187.5, 150.0], 112.5)
+    allowance[rng.random(employees) < 0.03] = np.nan
+    df_allowance = pd.DataFrame({"Employee Full Name": names, "Allowance": allowance})
+
+    tables = {"df_user": users, "df": df, "df_allowance": df_allowance}
+    if year >= 2026:
+        df_allowance["Timesheet Week"] = timesheet_week
+        df_allowance["Utilization Target"] = target
+        tables["df_flexot"] = _flexot(df, users, names, target, schema, year, cutoff, rng)
+    return tables
+
+
+def write_xlsx(tables, directory, year):
+    """One workbook per table, named and sheeted like the SharePoint files."""
+    sheet = SCHEMAS[year]["sheet"]
+    too_big = {name: len(frame) for name, frame in tables.items() if len(frame) > EXCEL_MAX_ROWS}
+    if too_big:
+        raise ValueError(f"too many rows for one Excel sheet: {too_big}; write a snapshot instead")
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, frame in tables.items():
+        path = os.path.join(directory, f"{FILES[name]}_{year}.xlsx")
+        frame.to_excel(path, sheet_name=sheet, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=300)
+    parser.add_argument("--year", type=int, choices=sorted(SCHEMAS), default=2026)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--today", type=datetime.fromisoformat, default=None, help="generate as of this date (YYYY-MM-DD)")
+    parser.add_argument("--format", choices=["snapshot", "xlsx"], default="snapshot")
+    parser.add_argument("--out", help="output directory (default: snapshots/synthetic-<year>-<employees>)")
+    args = parser.parse_args()
+
+    out_dir = args.out or os.path.join(ROOT, "snapshots", f"synthetic-{args.year}-{args.employees}")
+
+    started = time.perf_counter()
+    tables = generate(args.employees, year=args.year, seed=args.seed, today=args.today)
+    generated = time.perf_counter()
+    if args.format == "xlsx":
+        write_xlsx(tables, out_dir, args.year)
+    else:
+        from sharepoint import save_snapshot
+
+        save_snapshot(tables, out_dir)
+
+    sizes = ", ".join(f"{name} {len(frame):,}" for name, frame in tables.items())
+    print(
+        f"{args.employees} employees ({sizes} rows) in {out_dir}\n"
+        f"  generated {generated - started:.2f} s, written {time.perf_counter() - generated:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
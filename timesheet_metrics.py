@@ -0,0 +1,1452 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+from diagnostics import timed
+
+
+#----------------------
+# SHARED HELPERS
+#----------------------
+
+def target_hours_in_period(row, period_start, period_end):
+    period_start = pd.Timestamp(period_start)
+    period_end = pd.Timestamp(period_end)
+
+    start = max(row["Start"], period_start)
+    end = min(row["End"], period_end)
+
+    if start > end:
+        return 0
+
+    weekdays = pd.date_range(start, end, freq="B")
+    return len(weekdays) * row["Daily_Hours"]
+
+
+def weekday_hours(row):
+    weekdays = pd.bdate_range(start=row["Start"], end=row["End"])
+    return len(weekdays) * row["Daily_Hours"]
+
+
+def find_employee_name(df_user, email):
+    user_info = df_user[df_user["Email"].str.lower() == email.lower()]
+
+    if not user_info.empty:
+        return user_info.iloc[0]["Full Name"]
+    return "Unknown User"
+
+
+#----------------------
+# 2025
+#----------------------
+
+def compute_2025_state(df_user, df, df_allowance, email, today=None):
+    """
+    Compute everything the 2025 recap renders for one user.
+    Input frames are not modified.
+    """
+    df_user = df_user.copy()
+    df = df.copy()
+    df_allowance = df_allowance.copy()
+
+    def adjusted_target_for_period(start_date, end_date):
+        # Target hours in period
+        target = (
+            df_user[df_user["Full Name"] == emp_name]
+            .apply(target_hours_in_period, axis=1, args=(start_date, end_date))
+            .sum()
+        )
+
+        # PTO taken in period
+        pto = df_util[
+            (df_util["Date"].between(start_date, end_date)) &
+            (df_util["Project No - Title"].isin([
+                "Vacation",
+                "PTO Office Closed",
+                "Stat Holidays",
+                "Unpaid Time Off",
+                "PTO Sick/Medical"
+            ]))
+        ]["Hours"].sum()
+
+        return max(target - pto, 0)
+
+    emp_name = find_employee_name(df_user, email)
+    first_name = emp_name.split(" ")[0]
+
+    today = today or datetime.today()
+    monday = today - timedelta(days=today.weekday())
+    last_refreshed = monday.strftime("%B %d, %Y")
+
+    #----------------------
+    # TARGET HRS CALC
+    #----------------------
+    # Convert dates
+    df_user["Start"] = pd.to_datetime(df_user["Start"], errors="coerce")
+    df_user["End"] = pd.to_datetime(df_user["End"], errors="coerce")
+
+    # Hard cap date
+    cap_end_date = pd.Timestamp("2025-12-31")
+
+    # Fill open-ended contracts to cap date
+    df_user["End"] = df_user["End"].fillna(cap_end_date)
+
+    # Cap all End dates at Dec 31, 2025
+    df_user["End"] = df_user["End"].clip(upper=cap_end_date)
+
+    # Calculate daily working hours
+    df_user["Daily_Hours"] = np.where(
+        df_user["Working Hrs"] > 0,
+        df_user["Working Hrs"] / 5,
+        0
+    )
+
+    with timed("contract hours (apply)") as stage:
+        df_user["Target Working Hrs (Contract)"] = df_user.apply(weekday_hours, axis=1)
+        stage["rows"] = len(df_user)
+
+    # Aggregate by employee
+    df_target = df_user.groupby(["Full Name", "Legal Office"], as_index=False)["Target Working Hrs (Contract)"].sum()
+
+    df_util_target = (
+        df_user
+        .groupby("Full Name", as_index=False)
+        .agg({"Utilization Target": "mean"})
+    )
+
+    #----------------------
+    # TIMESHEET CLEANING
+    #----------------------
+
+    with timed("clean timesheet") as stage:
+        df.rename(columns={
+            "Employee Full Name": "Full Name",
+            "Sum of Hours": "Hours"
+        }, inplace=True)
+
+        # Convert Date
+        df["Date"] = pd.to_datetime(df["Date"])
+        df["Month"] = df["Date"].dt.to_period("M").astype(str)
+
+        # Force Utilization Category order
+        cat_order = ["Project", "Internal", "Budget PTO", "Add'l & Flex PTO"]
+        df["Utilization Category"] = pd.Categorical(
+            df["Utilization Category"],
+            categories=cat_order,
+            ordered=True
+        )
+        stage["rows"] = len(df)
+
+    # Filter timesheet to only include dates before start of this week
+    start_of_week = today - timedelta(days=today.weekday())  # Monday this week
+    df = df[df["Date"] < start_of_week]
+
+    df_filtered = df[df["Full Name"] == emp_name]
+    totals_by_util = df_filtered.groupby("Utilization Category", observed=False)["Hours"].sum().reset_index()
+
+    #----------------------
+    # METRICS
+    #----------------------
+    project_hours = totals_by_util.loc[totals_by_util["Utilization Category"] == "Project", "Hours"].sum()
+    internal_hours = totals_by_util.loc[totals_by_util["Utilization Category"] == "Internal", "Hours"].sum()
+    total_working_hours = project_hours + internal_hours
+
+    # Calculate PTO breakdown
+    budget_pto_breakdown = df_filtered[df_filtered["Utilization Category"] == "Budget PTO"]
+    budget_pto_grouped = budget_pto_breakdown.groupby("Project No - Title")["Hours"].sum().reset_index()
+
+    # Add PTO Flex from Add'l & Flex PTO
+    flex_hours = df_filtered.loc[df_filtered["Utilization Category"] == "Add'l & Flex PTO", "Hours"].sum()
+    flex_row = pd.DataFrame({"Project No - Title": ["PTO Flex Vacation"], "Hours": [flex_hours]})
+    budget_pto_grouped = pd.concat([budget_pto_grouped, flex_row], ignore_index=True)
+    unpaid_hours = df_filtered.loc[df_filtered["Project No - Title"] == "Unpaid Time Off", "Hours"].sum()
+
+    # PTO titles order
+    titles_order = ["Vacation", "PTO Sick/Medical","PTO Flex Vacation", "Stat Holidays", "PTO Office Closed"]
+
+    # Merge to ensure all titles exist
+    all_titles_df = pd.DataFrame({"Project No - Title": titles_order})
+    budget_pto_grouped = pd.merge(all_titles_df, budget_pto_grouped, on="Project No - Title", how="left").fillna(0)
+
+    df_allowance.rename(columns={
+        "Employee Full Name": "Full Name"
+    }, inplace=True)
+
+    df_allowance["Full Name"] = df_allowance["Full Name"].str.strip()
+    df_target["Full Name"] = df_target["Full Name"].str.strip()
+
+    df_target = df_target.merge(
+        df_allowance,
+        on="Full Name",
+        how="left"
+    )
+
+    vacation_max = (
+        df_target.loc[df_target["Full Name"] == emp_name, "Allowance"]
+        .fillna(0)
+        .iloc[0]
+    )
+
+    util_target = (
+        df_util_target.loc[df_util_target["Full Name"] == emp_name, "Utilization Target"]
+        .fillna(0)
+        .iloc[0]
+    )
+
+    # Get target working hours for the selected employee
+    target_hours = df_target.loc[df_target["Full Name"] == emp_name, "Target Working Hrs (Contract)"].sum()
+    # Calculate PTO amounts
+    pto_vacation = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Vacation", "Hours"].sum()
+    pto_sick = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Sick/Medical", "Hours"].sum()
+    stat_holidays = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Stat Holidays", "Hours"].sum()
+    office_closed = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Office Closed", "Hours"].sum()
+
+    combined_closed = stat_holidays + office_closed
+
+    # Calculate Adjusted Target
+    adjusted_target = target_hours - pto_vacation - pto_sick - combined_closed - unpaid_hours
+    flex_vacation = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Flex Vacation", "Hours"].sum()
+
+    # PTO max values
+    sick_max = 37.5
+
+    vacation_used = min(pto_vacation, vacation_max)
+    vacation_remaining = max(vacation_max - vacation_used, 0)
+
+    sick_used = min(pto_sick, sick_max)
+    sick_remaining = max(sick_max - sick_used, 0)
+
+    # -------------------------
+    # UTILIZATION DATE WINDOWS
+    # -------------------------
+
+    last_month_start = pd.Timestamp("2025-12-01")
+    last_month_end = pd.Timestamp("2025-12-31")
+
+    ytd_start = pd.Timestamp("2025-01-01")
+    ytd_end = cap_end_date
+
+    df_util = df_filtered[df_filtered["Date"] <= cap_end_date]
+
+    # Last month project hours
+    project_last_month = df_util[
+        (df_util["Utilization Category"] == "Billable Project") &
+        (df_util["Date"].between(last_month_start, last_month_end))
+    ]["Hours"].sum()
+
+    # YTD project hours
+    project_ytd = df_util[
+        (df_util["Utilization Category"] == "Billable Project") &
+        (df_util["Date"].between(ytd_start, ytd_end))
+    ]["Hours"].sum()
+
+    adjusted_target_last_month = adjusted_target_for_period(
+        last_month_start, last_month_end
+    )
+
+    adjusted_target_ytd = adjusted_target_for_period(
+        ytd_start, ytd_end
+    )
+
+    util_last_month = (
+        project_last_month / adjusted_target_last_month
+        if adjusted_target_last_month > 0 else 0
+    )
+
+    util_ytd = (
+        project_ytd / adjusted_target_ytd
+        if adjusted_target_ytd > 0 else 0
+    )
+
+    #----------------------
+    # BAR CHART DATA
+    #----------------------
+    agg_df = df_filtered.groupby(["Month", "Utilization Category"], as_index=False, observed=False)["Hours"].sum()
+    totals_by_month = agg_df.groupby("Month")["Hours"].sum().reset_index()
+
+    return {
+        "emp_name": emp_name,
+        "first_name": first_name,
+        "last_refreshed": last_refreshed,
+        "project_hours": project_hours,
+        "internal_hours": internal_hours,
+        "total_working_hours": total_working_hours,
+        "target_hours": target_hours,
+        "pto_vacation": pto_vacation,
+        "pto_sick": pto_sick,
+        "combined_closed": combined_closed,
+        "unpaid_hours": unpaid_hours,
+        "adjusted_target": adjusted_target,
+        "flex_vacation": flex_vacation,
+        "vacation_max": vacation_max,
+        "vacation_used": vacation_used,
+        "vacation_remaining": vacation_remaining,
+        "sick_used": sick_used,
+        "sick_remaining": sick_remaining,
+        "util_target": util_target,
+        "project_last_month": project_last_month,
+        "project_ytd": project_ytd,
+        "adjusted_target_last_month": adjusted_target_last_month,
+        "adjusted_target_ytd": adjusted_target_ytd,
+        "util_last_month": util_last_month,
+        "util_ytd": util_ytd,
+        "agg_df": agg_df,
+        "totals_by_month": totals_by_month,
+    }
+
+
+#----------------------
+# 2026
+#----------------------
+
+def prepare_contracts_2026(df_user, cap_end_date):
+    """
+    Parse a userfig copy's contract dates in place, ending open and later
+    contracts at cap_end_date, and add Daily_Hours; returns it.
+    """
+    df_user["Start"] = pd.to_datetime(df_user["Start"], errors="coerce")
+    df_user["End"] = pd.to_datetime(df_user["End"], errors="coerce")
+
+    # Fill open-ended contracts to cap date
+    df_user["End"] = df_user["End"].fillna(cap_end_date)
+
+    # Cap all End dates at the data cutoff
+    df_user["End"] = df_user["End"].clip(upper=cap_end_date)
+
+    # Calculate daily working hours
+    df_user["Daily_Hours"] = np.where(
+        df_user["Working Hrs"] > 0,
+        df_user["Working Hrs"] / 5,
+        0
+    )
+    return df_user
+
+
+def clean_timesheet_2026(df):
+    """Rename, parse and categorize a 2026 timesheet copy in place; returns it."""
+    df.rename(columns={
+        "Employee Full Name": "Full Name",
+        "Sum of Hours": "Hours"
+    }, inplace=True)
+
+    # Convert Date
+    df["Date"] = pd.to_datetime(df["Date"])
+    df["Month"] = df["Date"].dt.to_period("M").astype(str)
+
+    # Force Utilization Category order
+    cat_order = ["Billable Project", "Internal + Proposal", "Overhead", "Time Off"]
+    df["Utilization Category"] = pd.Categorical(
+        df["Utilization Category"],
+        categories=cat_order,
+        ordered=True
+    )
+    return df
+
+
+def adjusted_target_for_period_2026(df_user, df_util, emp_name, start_date, end_date):
+    """
+    emp_name's contract hours between two dates (prepared userfig rows),
+    less the time off in their timesheet rows df_util over the same dates.
+    """
+    # Normalize dates
+    start_date = start_date.date() if hasattr(start_date, "date") else start_date
+    end_date = end_date.date() if hasattr(end_date, "date") else end_date
+
+    util_dates = pd.to_datetime(df_util["Date"]).dt.date
+
+    # Target hours
+    target = (
+        df_user[df_user["Full Name"] == emp_name]
+        .apply(target_hours_in_period, axis=1, args=(start_date, end_date))
+        .sum()
+    )
+
+    # PTO taken
+    pto = df_util[
+        (util_dates >= start_date) &
+        (util_dates <= end_date) &
+        (df_util["Project No - Title"].isin([
+            "Vacation",
+            "PTO Office Closed",
+            "Stat Holidays",
+            "Unpaid Time Off",
+            "PTO Sick/Medical"
+        ]))
+    ]["Hours"].sum()
+
+    return max(target - pto, 0)
+
+
+def weekly_utilization_2026(df_flexot_user):
+    """One user's Flex/OT rows in week order, for the weekly utilization chart."""
+    df_line = df_flexot_user.copy()
+
+    df_line["WeekStart"] = pd.to_datetime(df_line["WeekStart"])
+    return df_line.sort_values("WeekStart")
+
+
+def compute_2026_state(df_user, df, df_allowance, df_flexot, email, today=None):
+    """
+    Compute everything the 2026 dashboard renders for one user.
+    Input frames are not modified.
+    """
+    df_user = df_user.copy()
+    df = df.copy()
+    df_allowance = df_allowance.copy()
+
+    emp_name = find_employee_name(df_user, email)
+    first_name = emp_name.split(" ")[0]
+
+    today = today or datetime.today()
+    monday = today - timedelta(days=today.weekday())
+    monday_date = monday.date()
+    last_refreshed = monday.strftime("%B %d, %Y")
+
+    df_allowance_user = df_allowance[
+        df_allowance["Employee Full Name"].str.lower() == emp_name.lower()
+    ]
+    latest_date = (
+        df[
+            (df["Employee Full Name"].str.lower() == emp_name.lower()) &
+            (df["Utilization Category"] != "Time Off")
+        ]["Date"]
+        .max()
+    )
+    latest_date_str = latest_date.strftime("%B %d, %Y")
+
+    if not df_allowance_user.empty:
+        timesheet_date_week = pd.to_datetime(
+            df_allowance_user["Timesheet Week"]
+        ).max()   # safer than iloc[0]
+
+        timesheet_monday = (
+            timesheet_date_week - timedelta(days=timesheet_date_week.weekday())
+        ).date()
+    else:
+        timesheet_monday = None
+
+    if timesheet_monday is not None:
+        timesheet_date_str = timesheet_monday.strftime("%B %d, %Y")
+        is_stale = timesheet_monday != monday_date
+    else:
+        timesheet_date_str = "Unavailable"
+        is_stale = True
+
+    #----------------------
+    # TARGET HRS CALC
+    #----------------------
+    # Hard cap date
+    cap_end_date = monday-timedelta(days=1)  # Sunday this week
+
+    prepare_contracts_2026(df_user, cap_end_date)
+
+    with timed("contract hours (apply)") as stage:
+        df_user["Target Working Hrs (Contract)"] = df_user.apply(weekday_hours, axis=1)
+        stage["rows"] = len(df_user)
+
+    # Aggregate by employee
+    df_target = df_user.groupby(["Full Name", "Legal Office"], as_index=False)["Target Working Hrs (Contract)"].sum()
+
+    #----------------------
+    # TIMESHEET CLEANING
+    #----------------------
+
+    with timed("clean timesheet") as stage:
+        clean_timesheet_2026(df)
+        stage["rows"] = len(df)
+
+    # Filter timesheet to only include dates before start of this week
+    start_of_week = today - timedelta(days=today.weekday())  # Monday this week
+    df_future = df[df["Date"] >= start_of_week]
+    df = df[df["Date"] < start_of_week]
+
+    df_filtered = df[df["Full Name"] == emp_name].copy()
+
+    future_vacation = df_future[
+        (df_future["Full Name"] == emp_name) &
+        (df_future["Project No - Title"].isin([
+            "Vacation",
+            "PTO Flex Vacation"
+        ]))
+    ]
+
+    #----------------------
+    # METRICS
+    #----------------------
+    project_hours = df_filtered.loc[df_filtered["Utilization Category"] == "Billable Project", "Hours"].sum()
+    internalplusproposal_hours = df_filtered.loc[df_filtered["Utilization Category"] == "Internal + Proposal", "Hours"].sum()
+    overhead_hours = df_filtered.loc[df_filtered["Utilization Category"] == "Overhead", "Hours"].sum()
+    total_working_hours = project_hours + internalplusproposal_hours + overhead_hours
+
+    # Calculate PTO breakdown
+    budget_pto_breakdown = df_filtered[df_filtered["Utilization Category"] == "Time Off"]
+    budget_pto_grouped = budget_pto_breakdown.groupby("Project No - Title")["Hours"].sum().reset_index()
+
+    # Add PTO Flex from Add'l & Flex PTO
+    flex_hours = df_filtered.loc[df_filtered["Project No - Title"] == "PTO Flex Vacation", "Hours"].sum()
+    flex_row = pd.DataFrame({"Project No - Title": ["PTO Flex Vacation"], "Hours": [flex_hours]})
+    budget_pto_grouped = pd.concat([budget_pto_grouped, flex_row], ignore_index=True)
+    unpaid_hours = df_filtered.loc[df_filtered["Project No - Title"] == "Unpaid Time Off", "Hours"].sum()
+
+    prod_hours = df_filtered.loc[df_filtered["Project No - Title"] == "Professional Development", "Hours"].sum()
+    future_vacation_hours = future_vacation.loc[future_vacation["Project No - Title"] == "Vacation","Hours"].sum()
+
+    # PTO titles order
+    titles_order = ["Vacation", "PTO Sick/Medical","PTO Flex Vacation", "Stat Holidays", "PTO Office Closed"]
+
+    # Merge to ensure all titles exist
+    all_titles_df = pd.DataFrame({"Project No - Title": titles_order})
+    budget_pto_grouped = pd.merge(all_titles_df, budget_pto_grouped, on="Project No - Title", how="left").fillna(0)
+
+    df_allowance.rename(columns={
+        "Employee Full Name": "Full Name"
+    }, inplace=True)
+
+    df_allowance["Full Name"] = df_allowance["Full Name"].str.strip()
+    df_target["Full Name"] = df_target["Full Name"].str.strip()
+
+    df_target = df_target.merge(
+        df_allowance,
+        on="Full Name",
+        how="left"
+    )
+
+    vacation_max = (
+        df_target.loc[df_target["Full Name"] == emp_name, "Allowance"]
+        .fillna(0)
+        .iloc[0]
+    )
+
+    # Get target working hours for the selected employee
+    target_hours = df_target.loc[df_target["Full Name"] == emp_name, "Target Working Hrs (Contract)"].sum()
+    # Calculate PTO amounts
+    pto_vacation = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Vacation", "Hours"].sum()
+    pto_sick = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Sick/Medical", "Hours"].sum() + budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Bereavement", "Hours"].sum()
+    stat_holidays = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "Stat Holidays", "Hours"].sum()
+    office_closed = budget_pto_grouped.loc[budget_pto_grouped["Project No - Title"] == "PTO Office Closed", "Hours"].sum()
+    combined_closed = stat_holidays + office_closed
+
+    # Calculate Adjusted Target
+    adjusted_target = target_hours - pto_vacation - pto_sick - combined_closed - unpaid_hours
+
+    # PTO max values
+    sick_max = 37.5
+
+    vacation_used = min(pto_vacation, vacation_max)
+    vacation_remaining = max(vacation_max - vacation_used - future_vacation_hours, 0)
+
+    sick_used = min(pto_sick, sick_max)
+    sick_remaining = max(sick_max - sick_used, 0)
+
+    # -------------------------
+    # UTILIZATION DATE WINDOWS
+    # -------------------------
+
+    df_filtered["Date"] = pd.to_datetime(df_filtered["Date"]).dt.normalize()
+    cap_end_date = pd.to_datetime(cap_end_date).normalize()
+
+    # Last month relative to current data cutoff
+    last_month_end = cap_end_date.replace(day=1) - pd.Timedelta(days=1)
+
+    last_month_start = last_month_end.replace(day=1)
+
+    ytd_start = pd.Timestamp("2026-01-01")
+    ytd_end = cap_end_date
+
+    df_util = df_filtered[df_filtered["Date"] <= cap_end_date]
+
+    # Last month project hours
+    project_last_month = df_util[
+        (df_util["Utilization Category"] == "Billable Project") &
+        (df_util["Date"].between(last_month_start, last_month_end, inclusive="both"))
+    ]["Hours"].sum()
+
+    # YTD project hours
+    project_ytd = df_util[
+        (df_util["Utilization Category"] == "Billable Project") &
+        (df_util["Date"].between(ytd_start, ytd_end))
+    ]["Hours"].sum()
+
+    adjusted_target_last_month = adjusted_target_for_period_2026(
+        df_user, df_util, emp_name, last_month_start, last_month_end
+    )
+
+    adjusted_target_ytd = adjusted_target_for_period_2026(
+        df_user, df_util, emp_name, ytd_start, ytd_end
+    )
+
+    util_last_month = (
+        project_last_month / adjusted_target_last_month
+        if adjusted_target_last_month > 0 else 0
+    )
+
+    util_ytd = (
+        project_ytd / adjusted_target_ytd
+        if adjusted_target_ytd > 0 else 0
+    )
+
+    delta_hours =  total_working_hours  - adjusted_target
+    last_month_label = last_month_start.strftime("%B %Y")
+
+    #----------------------
+    # FLEX / OT
+    #----------------------
+
+    df_flexot_user = df_flexot[
+        df_flexot["Full Name"].str.lower() == emp_name.lower()
+    ]
+    flex_bucket = df_flexot_user["Flex Bucket"].sum()
+    ot_bucket = df_flexot_user["OT Bucket"].sum()
+
+    valid_targets = df_flexot_user.loc[
+        df_flexot_user["Utilization Target"] > 0, "Utilization Target"
+    ]
+
+    util_target = valid_targets.mean() if not valid_targets.empty else 0
+
+    flex_used = df_flexot_user["Flex PTO"].sum()
+    flex_booked = df_flexot_user["Future Flex PTO"].sum()
+    ot_used = df_flexot_user["OT PTO"].sum() + df_flexot_user["Payout OT"].sum()
+    ot_booked = df_flexot_user["Future OT PTO"].sum()
+
+    current_util_target = (
+        df_allowance.loc[df_allowance["Full Name"] == emp_name, "Utilization Target"]
+        .fillna(0)
+        .iloc[0]
+    )
+
+    #----------------------
+    # LINE CHART DATA
+    #----------------------
+    df_line = weekly_utilization_2026(df_flexot_user)
+
+    return {
+        "emp_name": emp_name,
+        "first_name": first_name,
+        "last_refreshed": last_refreshed,
+        "latest_date_str": latest_date_str,
+        "timesheet_date_str": timesheet_date_str,
+        "is_stale": is_stale,
+        "project_hours": project_hours,
+        "internalplusproposal_hours": internalplusproposal_hours,
+        "overhead_hours": overhead_hours,
+        "total_working_hours": total_working_hours,
+        "target_hours": target_hours,
+        "pto_vacation": pto_vacation,
+        "pto_sick": pto_sick,
+        "combined_closed": combined_closed,
+        "unpaid_hours": unpaid_hours,
+        "adjusted_target": adjusted_target,
+        "delta_hours": delta_hours,
+        "prod_hours": prod_hours,
+        "vacation_max": vacation_max,
+        "vacation_used": vacation_used,
+        "vacation_remaining": vacation_remaining,
+        "future_vacation_hours": future_vacation_hours,
+        "sick_used": sick_used,
+        "sick_remaining": sick_remaining,
+        "flex_bucket": flex_bucket,
+        "ot_bucket": ot_bucket,
+        "flex_used": flex_used,
+        "flex_booked": flex_booked,
+        "ot_used": ot_used,
+        "ot_booked": ot_booked,
+        "util_target": util_target,
+        "current_util_target": current_util_target,
+        "last_month_label": last_month_label,
+        "project_last_month": project_last_month,
+        "project_ytd": project_ytd,
+        "adjusted_target_last_month": adjusted_target_last_month,
+        "adjusted_target_ytd": adjusted_target_ytd,
+        "util_last_month": util_last_month,
+        "util_ytd": util_ytd,
+        "df_line": df_line,
+    }
+
+
+#----------------------
+# ALL EMPLOYEES (2026)
+#----------------------
+
+# userfig column naming each employee's manager, by email
+MANAGER_COLUMN = "Manager Email"
+
+# Time off deducted from the baseline in the utilization windows
+PERIOD_PTO_TITLES = ["Vacation", "PTO Office Closed", "Stat Holidays", "Unpaid Time Off", "PTO Sick/Medical"]
+
+
+def _business_days(start, end):
+    """Inclusive weekday count between two datetime Series, 0 where start > end or either is NaT."""
+    valid = start.notna() & end.notna()
+    days = np.zeros(len(start), dtype="int64")
+    days[valid.to_numpy()] = np.busday_count(
+        start[valid].to_numpy().astype("datetime64[D]"),
+        end[valid].to_numpy().astype("datetime64[D]") + np.timedelta64(1, "D"),
+    )
+    return pd.Series(np.maximum(days, 0), index=start.index)
+
+
+def compute_2026_employee_table(df_user, df, df_allowance, df_flexot, today=None):
+    """
+    The per-user 2026 metrics for every employee in userfig at once, one row
+    per Full Name. Columns use the same names as compute_2026_state (the
+    numbers and staleness), plus Email, Legal Office and the manager column
+    when userfig has it.
+
+    Every frame is grouped once, instead of filtering it again per person.
+    Input frames are not modified.
+    """
+    today = today or datetime.today()
+    monday = today - timedelta(days=today.weekday())
+    cap_end_date = monday - timedelta(days=1)  # Sunday last week
+
+    #----------------------
+    # EMPLOYEES / TARGET HRS
+    #----------------------
+    users = prepare_contracts_2026(df_user.copy(), cap_end_date)
+
+    info_columns = ["Email", "Legal Office"] + ([MANAGER_COLUMN] if MANAGER_COLUMN in users else [])
+    table = users.groupby("Full Name", sort=False)[info_columns].first()
+
+    # Contract rows without a Legal Office drop out of the grouped target, as they do per user
+    contract_hours = _business_days(users["Start"], users["End"]) * users["Daily_Hours"]
+    table["target_hours"] = (
+        contract_hours[users["Legal Office"].notna()]
+        .groupby(users["Full Name"].str.strip()).sum()
+        .reindex(table.index.str.strip(), fill_value=0)
+        .to_numpy()
+    )
+
+    cap_end_date = pd.Timestamp(cap_end_date).normalize()
+    last_month_end = cap_end_date.replace(day=1) - pd.Timedelta(days=1)
+    last_month_start = last_month_end.replace(day=1)
+    ytd_start = pd.Timestamp("2026-01-01")
+    ytd_end = cap_end_date
+
+    def target_in_period(period_start, period_end):
+        hours = _business_days(
+            users["Start"].clip(lower=period_start),
+            users["End"].clip(upper=period_end),
+        ) * users["Daily_Hours"]
+        return hours.groupby(users["Full Name"]).sum().reindex(table.index, fill_value=0)
+
+    #----------------------
+    # TIMESHEET
+    #----------------------
+    ts = df.rename(columns={"Employee Full Name": "Full Name", "Sum of Hours": "Hours"})
+    date = pd.to_datetime(ts["Date"])
+    day = date.dt.normalize()
+    hours = ts["Hours"]
+    category = ts["Utilization Category"]
+    title = ts["Project No - Title"]
+
+    past = date < monday
+    util = past & (day <= cap_end_date)
+    billable = category == "Billable Project"
+    time_off = category == "Time Off"
+    period_pto = util & title.isin(PERIOD_PTO_TITLES)
+    last_month = day.between(last_month_start, last_month_end)
+    ytd = day.between(ytd_start, ytd_end)
+
+    masks = {
+        "project_hours": past & billable,
+        "internalplusproposal_hours": past & (category == "Internal + Proposal"),
+        "overhead_hours": past & (category == "Overhead"),
+        "pto_vacation": past & time_off & (title == "Vacation"),
+        "pto_sick": past & time_off & (title == "PTO Sick/Medical"),
+        "combined_closed": past & time_off & title.isin(["Stat Holidays", "PTO Office Closed"]),
+        "unpaid_hours": past & (title == "Unpaid Time Off"),
+        "prod_hours": past & (title == "Professional Development"),
+        "future_vacation_hours": ~past & (title == "Vacation"),
+        "project_last_month": util & billable & last_month,
+        "project_ytd": util & billable & ytd,
+        "pto_last_month": period_pto & last_month,
+        "pto_ytd": period_pto & ytd,
+    }
+    sums = (
+        pd.DataFrame({column: hours.where(mask, 0) for column, mask in masks.items()})
+        .groupby(ts["Full Name"]).sum()
+        .reindex(table.index, fill_value=0)
+    )
+    table = table.join(sums)
+
+    table["total_working_hours"] = table["project_hours"] + table["internalplusproposal_hours"] + table["overhead_hours"]
+    table["adjusted_target"] = (
+        table["target_hours"] - table["pto_vacation"] - table["pto_sick"]
+        - table["combined_closed"] - table["unpaid_hours"]
+    )
+    table["delta_hours"] = table["total_working_hours"] - table["adjusted_target"]
+
+    table["adjusted_target_last_month"] = (
+        target_in_period(last_month_start, last_month_end) - table.pop("pto_last_month")
+    ).clip(lower=0)
+    table["adjusted_target_ytd"] = (target_in_period(ytd_start, ytd_end) - table.pop("pto_ytd")).clip(lower=0)
+
+    for period in ["last_month", "ytd"]:
+        baseline = table[f"adjusted_target_{period}"]
+        table[f"util_{period}"] = (table[f"project_{period}"] / baseline).where(baseline > 0, 0)
+
+    #----------------------
+    # ALLOWANCE
+    #----------------------
+    allowance = df_allowance.rename(columns={"Employee Full Name": "Full Name"})
+    allowance = allowance.assign(**{"Full Name": allowance["Full Name"].str.strip()}).drop_duplicates("Full Name")
+    allowance = allowance.set_index("Full Name").reindex(table.index.str.strip())
+
+    table["vacation_max"] = allowance["Allowance"].fillna(0).to_numpy()
+    table["current_util_target"] = allowance["Utilization Target"].fillna(0).to_numpy()
+
+    # Staleness: the latest timesheet week in the allowance sheet vs this week
+    timesheet_week = (
+        pd.to_datetime(df_allowance["Timesheet Week"])
+        .groupby(df_allowance["Employee Full Name"].str.lower()).max()
+        .reindex(table.index.str.lower())
+    )
+    timesheet_monday = (timesheet_week - pd.to_timedelta(timesheet_week.dt.weekday, unit="D")).dt.normalize()
+    table["timesheet_date_str"] = timesheet_monday.dt.strftime("%B %d, %Y").fillna("Unavailable").to_numpy()
+    table["is_stale"] = (timesheet_monday.dt.date != monday.date()).to_numpy()
+
+    sick_max = 37.5
+    table["vacation_used"] = np.minimum(table["pto_vacation"], table["vacation_max"])
+    table["vacation_remaining"] = (
+        table["vacation_max"] - table["vacation_used"] - table["future_vacation_hours"]
+    ).clip(lower=0)
+    table["sick_used"] = np.minimum(table["pto_sick"], sick_max)
+    table["sick_remaining"] = (sick_max - table["sick_used"]).clip(lower=0)
+
+    #----------------------
+    # FLEX / OT
+    #----------------------
+    flexot = df_flexot.assign(
+        flex_bucket=df_flexot["Flex Bucket"],
+        ot_bucket=df_flexot["OT Bucket"],
+        flex_used=df_flexot["Flex PTO"],
+        flex_booked=df_flexot["Future Flex PTO"],
+        ot_used=df_flexot["OT PTO"].fillna(0) + df_flexot["Payout OT"].fillna(0),
+        ot_booked=df_flexot["Future OT PTO"],
+        util_target=df_flexot["Utilization Target"].where(df_flexot["Utilization Target"] > 0),
+    )
+    by_name = flexot.groupby(flexot["Full Name"].str.lower())
+    buckets = by_name[["flex_bucket", "ot_bucket", "flex_used", "flex_booked", "ot_used", "ot_booked"]].sum()
+    buckets["util_target"] = by_name["util_target"].mean()
+    buckets = buckets.reindex(table.index.str.lower()).fillna(0)
+    for column in buckets:
+        table[column] = buckets[column].to_numpy()
+
+    return table
+
+
+def _manager_emails(table):
+    # An all-blank column reads from Excel as float64, which has no .str
+    return table[MANAGER_COLUMN].astype("string").str.lower().str.strip()
+
+
+def manager_emails(table):
+    """Everyone listed as a manager in a userfig or employee table, lowercased."""
+    if MANAGER_COLUMN not in table:
+        return frozenset()
+    return frozenset(_manager_emails(table).dropna())
+
+
+def direct_reports(table, manager_email):
+    """Rows of an employee table whose manager is `manager_email`."""
+    if MANAGER_COLUMN not in table:
+        return table.iloc[0:0]
+    managers = _manager_emails(table)
+    return table[managers.eq(manager_email.lower().strip()).fillna(False).astype(bool)]
+
+
+#----------------------
+# OFFICE ROLLUPS (2026)
+#----------------------
+
+def data_version(*frames):
+    """Short content hash of the input frames, for keying caches on the data itself."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+        digest.update(",".join(map(str, frame.columns)).encode())
+    return digest.hexdigest()[:16]
+
+
+def compute_2026_office_cube(df_user, df, df_allowance, today=None):
+    """
+    Daily YTD cube indexed by (Legal Office, Date) with:
+
+        contract_hours    contract hours on that weekday
+        pto_hours         time off deducted from the baseline (as in the utilization windows)
+        billable_hours    Billable Project hours
+        target_weighted   utilization target x baseline hours, for the weighted target
+
+    Each employee counts toward their current Legal Office. Summed over the
+    YTD for one person, contract_hours - pto_hours is their unclipped
+    adjusted_target_ytd. Weeks and months are rolled up from this cube by
+    roll_up_office_cube(), never from the raw timesheet.
+    """
+    today = today or datetime.today()
+    monday = today - timedelta(days=today.weekday())
+    cap_end_date = pd.Timestamp(monday - timedelta(days=1)).normalize()
+    ytd_start = pd.Timestamp("2026-01-01")
+
+    users = df_user.copy()
+    users["Start"] = pd.to_datetime(users["Start"], errors="coerce").dt.normalize()
+    users["End"] = pd.to_datetime(users["End"], errors="coerce").fillna(cap_end_date).clip(upper=cap_end_date).dt.normalize()
+    users["Daily_Hours"] = np.where(users["Working Hrs"] > 0, users["Working Hrs"] / 5, 0)
+
+    office = users.groupby("Full Name")["Legal Office"].last().fillna("Unassigned")
+
+    allowance = df_allowance.rename(columns={"Employee Full Name": "Full Name"})
+    allowance = allowance.assign(**{"Full Name": allowance["Full Name"].str.strip()}).drop_duplicates("Full Name")
+    target = allowance.set_index("Full Name")["Utilization Target"].reindex(office.index.str.strip()).fillna(0)
+    target.index = office.index
+
+    #----------------------
+    # CONTRACT HOURS
+    #----------------------
+    days = pd.bdate_range(ytd_start, max(cap_end_date, ytd_start))
+    day_values = days.to_numpy()
+    active = (
+        (day_values >= users["Start"].to_numpy()[:, None]) &
+        (day_values <= users["End"].to_numpy()[:, None])
+    )
+    contract = active * users["Daily_Hours"].to_numpy()[:, None]
+    row_office = users["Full Name"].map(office).to_numpy()
+    row_target = users["Full Name"].map(target).fillna(0).to_numpy()[:, None]
+
+    contract_cube = pd.concat({
+        "contract_hours": pd.DataFrame(contract, columns=days).groupby(row_office).sum().stack(),
+        "contract_weighted": pd.DataFrame(contract * row_target, columns=days).groupby(row_office).sum().stack(),
+    }, axis=1)
+    contract_cube.index.names = ["Legal Office", "Date"]
+
+    #----------------------
+    # TIMESHEET HOURS
+    #----------------------
+    ts = df.rename(columns={"Employee Full Name": "Full Name", "Sum of Hours": "Hours"})
+    day = pd.to_datetime(ts["Date"]).dt.normalize()
+    ts = ts[day.between(ytd_start, cap_end_date) & ts["Full Name"].isin(office.index)]
+    day = day[ts.index]
+
+    pto = ts["Hours"].where(ts["Project No - Title"].isin(PERIOD_PTO_TITLES), 0)
+    timesheet_cube = (
+        pd.DataFrame({
+            "pto_hours": pto,
+            "pto_weighted": pto * ts["Full Name"].map(target),
+            "billable_hours": ts["Hours"].where(ts["Utilization Category"] == "Billable Project", 0),
+        })
+        .groupby([ts["Full Name"].map(office).rename("Legal Office"), day.rename("Date")]).sum()
+    )
+
+    cube = contract_cube.join(timesheet_cube, how="outer").fillna(0)
+    cube["target_weighted"] = cube.pop("contract_weighted") - cube.pop("pto_weighted")
+    return cube[["contract_hours", "pto_hours", "billable_hours", "target_weighted"]]
+
+
+def roll_up_office_cube(cube, freq, offices=None):
+    """
+    Sum the daily office cube into weeks ("W", keyed by Monday) or months
+    ("M", keyed by the 1st), optionally for a subset of offices, and derive
+    the baseline, utilization and hours-weighted utilization target.
+    """
+    if offices is not None:
+        cube = cube[cube.index.get_level_values("Legal Office").isin(offices)]
+
+    dates = cube.index.get_level_values("Date")
+    period = dates.to_period("W-SUN" if freq == "W" else "M").start_time
+    rollup = cube.groupby([cube.index.get_level_values("Legal Office"), period]).sum()
+    rollup.index.names = ["Legal Office", "Period"]
+
+    baseline = rollup["contract_hours"] - rollup["pto_hours"]
+    rollup["baseline_hours"] = baseline
+    rollup["utilization"] = (rollup["billable_hours"] / baseline).where(baseline > 0, 0)
+    rollup["weighted_target"] = (rollup.pop("target_weighted") / baseline).where(baseline > 0, 0)
+    return rollup
+
+
+#----------------------
+# UTILIZATION DISTRIBUTION (2026)
+#----------------------
+
+# Groups smaller than this are never summarized, so no one can be singled out
+MIN_GROUP_SIZE = 5
+
+# 10% histogram bins; anything past the last edge lands in the last bin
+UTILIZATION_BINS = np.round(np.arange(0, 1.3, 0.1), 1)
+
+UTILIZATION_METRICS = {"util_ytd": "adjusted_target_ytd", "util_last_month": "adjusted_target_last_month"}
+
+
+def compute_utilization_distribution(table):
+    """
+    Sorted utilization values for the firm and for each Legal Office, from
+    an employee table (compute_2026_employee_table). Only employees with a
+    positive baseline for the period count. Groups below MIN_GROUP_SIZE
+    are dropped; the result holds no names.
+
+        {"Firm": {"util_ytd": array, "util_last_month": array}, "<office>": {...}}
+    """
+    groups = {"Firm": table}
+    groups.update(dict(list(table.groupby("Legal Office"))))
+
+    distribution = {}
+    for group, rows in groups.items():
+        values = {
+            metric: np.sort(rows.loc[rows[baseline] > 0, metric].to_numpy(dtype=float))
+            for metric, baseline in UTILIZATION_METRICS.items()
+        }
+        values = {metric: v for metric, v in values.items() if len(v) >= MIN_GROUP_SIZE}
+        if values:
+            distribution[group] = values
+    return distribution
+
+
+def percentile_rank(sorted_values, value):
+    """Share of the group below `value`, counting ties as half, in [0, 1]."""
+    below = np.searchsorted(sorted_values, value, side="left")
+    at_or_below = np.searchsorted(sorted_values, value, side="right")
+    return (below + at_or_below) / 2 / len(sorted_values)
+
+
+def quartiles(sorted_values):
+    return np.quantile(sorted_values, [0.25, 0.5, 0.75])
+
+
+def utilization_histogram(sorted_values):
+    """Counts per UTILIZATION_BINS bin, as (bin start, count) pairs."""
+    clipped = np.clip(sorted_values, 0, UTILIZATION_BINS[-1] - 1e-9)
+    counts, _ = np.histogram(clipped, bins=UTILIZATION_BINS)
+    return list(zip(UTILIZATION_BINS[:-1], counts))
+
+
+#----------------------
+# PROJECT DRILL-DOWN (2026)
+#----------------------
+
+def compute_2026_project_weeks(df, today=None):
+    """
+    Billable Project hours per employee, project and week (keyed by Monday),
+    from the rows the dashboard counts, as {Full Name: frame} where each
+    frame has Project No - Title, Week and Hours. Built once per data
+    version; drill-downs only ever slice one employee's frame.
+    """
+    today = today or datetime.today()
+    monday = today - timedelta(days=today.weekday())
+
+    date = pd.to_datetime(df["Date"])
+    rows = (date < monday) & (df["Utilization Category"] == "Billable Project")
+    date = date[rows].dt.normalize()
+
+    weekly = (
+        df.loc[rows, "Sum of Hours"]
+        .groupby([
+            df.loc[rows, "Employee Full Name"].rename("Full Name"),
+            df.loc[rows, "Project No - Title"],
+            (date - pd.to_timedelta(date.dt.weekday, unit="D")).rename("Week"),
+        ])
+        .sum()
+        .rename("Hours")
+        .reset_index()
+    )
+    return {
+        name: frame.drop(columns="Full Name").reset_index(drop=True)
+        for name, frame in weekly.groupby("Full Name")
+    }
+
+
+def top_projects(project_weeks, weeks, top_n=8):
+    """
+    One employee's projects over `weeks` (Mondays, oldest first), largest
+    first, with everything past `top_n` folded into "Other". Each project
+    carries its hours per week as a list, aligned with `weeks`.
+    """
+    weeks = pd.DatetimeIndex(weeks)
+    rows = project_weeks[project_weeks["Week"].isin(weeks)]
+
+    grid = rows.pivot_table(index="Project No - Title", columns="Week", values="Hours", aggfunc="sum", fill_value=0)
+    grid = grid.reindex(columns=weeks, fill_value=0)
+    grid = grid.loc[grid.sum(axis=1).sort_values(ascending=False, kind="stable").index]
+
+    if len(grid) > top_n:
+        other = grid.iloc[top_n:].sum().rename("Other")
+        grid = pd.concat([grid.iloc[:top_n], other.to_frame().T])
+
+    hours = grid.sum(axis=1)
+    total = hours.sum()
+    return pd.DataFrame({
+        "Project": grid.index,
+        "Hours": hours.to_numpy(),
+        "Share": (hours / total).to_numpy() if total else 0.0,
+        "Weekly": grid.to_numpy().tolist(),
+    })
+
+
+#----------------------
+# DAY GRID (2026)
+#----------------------
+
+DAY_CATEGORIES = ["Billable Project", "Internal + Proposal", "Overhead", "Time Off"]
+
+# Future bookings shown on the calendar, as counted in future_vacation_hours
+FUTURE_TIME_OFF_TITLES = ["Vacation", "PTO Flex Vacation"]
+
+
+def compute_2026_day_grid(df, year=2026, today=None):
+    """
+    Dense per-employee calendar for `year`: one row per employee, one
+    column per day of the year (366, the last unused in common years).
+
+        names       {Full Name: row}
+        hours       hours logged before this week
+        category    index into DAY_CATEGORIES of the day's largest category, -1 if none
+        pto         any Time Off logged that day
+        future      Vacation / PTO Flex Vacation booked from this week on
+
+    Built once for everyone; a user's calendar is a slice of one row.
+    """
+    today = today or datetime.today()
+    monday = today - timedelta(days=today.weekday())
+
+    date = pd.to_datetime(df["Date"])
+    in_year = (date.dt.year == year).to_numpy()
+    names, rows = np.unique(df["Employee Full Name"].to_numpy()[in_year].astype(str), return_inverse=True)
+    day = date.dt.dayofyear.to_numpy()[in_year] - 1
+    hours = df["Sum of Hours"].to_numpy(dtype=float)[in_year]
+    hours = np.nan_to_num(hours)
+    past = (date < monday).to_numpy()[in_year]
+    category = pd.Categorical(df["Utilization Category"], categories=DAY_CATEGORIES).codes[in_year]
+    title = df["Project No - Title"].to_numpy()[in_year]
+
+    by_category = np.zeros((len(names), 366, len(DAY_CATEGORIES)), dtype=np.float32)
+    counted = past & (category >= 0)
+    np.add.at(by_category, (rows[counted], day[counted], category[counted]), hours[counted])
+
+    logged = np.zeros((len(names), 366), dtype=np.float32)
+    np.add.at(logged, (rows[past], day[past]), hours[past])
+
+    pto = np.zeros((len(names), 366), dtype=bool)
+    time_off = counted & (category == DAY_CATEGORIES.index("Time Off"))
+    pto[rows[time_off], day[time_off]] = True
+
+    future = np.zeros((len(names), 366), dtype=bool)
+    booked = ~past & np.isin(title, FUTURE_TIME_OFF_TITLES)
+    future[rows[booked], day[booked]] = True
+
+    return {
+        "year": year,
+        "names": {name: i for i, name in enumerate(names)},
+        "hours": logged,
+        "category": np.where(by_category.sum(axis=2) > 0, by_category.argmax(axis=2), -1).astype(np.int8),
+        "pto": pto,
+        "future": future,
+    }
+
+
+def calendar_days(grid, name):
+    """One employee's row of the day grid as a frame of dated days, for plotting."""
+    dates = pd.date_range(f"{grid['year']}-01-01", f"{grid['year']}-12-31")
+    row = grid["names"].get(name)
+    n = len(dates)
+
+    if row is None:
+        hours, category = np.zeros(n), np.full(n, -1)
+        pto = future = np.zeros(n, dtype=bool)
+    else:
+        hours, category = grid["hours"][row, :n], grid["category"][row, :n]
+        pto, future = grid["pto"][row, :n], grid["future"][row, :n]
+
+    labels = np.array(DAY_CATEGORIES + ["No entries"])
+    return pd.DataFrame({
+        "Date": dates,
+        "Week": (dates - pd.to_timedelta(dates.weekday, unit="D")),
+        "Weekday": dates.strftime("%a"),
+        "Hours": hours,
+        "Category": labels[category],   # -1 picks "No entries"
+        "PTO": pto,
+        "Booked": future,
+    })
+
+
+#----------------------
+# YEAR-END PROJECTION (2026)
+#----------------------
+
+PROJECTION_WEEKS = 8           # recent complete weeks the run rate is taken from
+PROJECTION_SIMULATIONS = 1000
+PROJECTION_QUANTILES = [0.1, 0.5, 0.9]
+
+
+def _weekly_contract_hours(users, weeks, names):
+    """Contract hours per employee (rows, in `names` order) and week (columns, Mondays)."""
+    days = pd.bdate_range(weeks[0], weeks[-1] + pd.Timedelta(days=4))
+    active = (
+        (days.to_numpy() >= users["Start"].to_numpy()[:, None]) &
+        (days.to_numpy() <= users["End"].to_numpy()[:, None])
+    )
+    daily = pd.DataFrame(active * users["Daily_Hours"].to_numpy()[:, None], columns=days)
+    per_name = daily.groupby(users["Full Name"].to_numpy()).sum().reindex(names, fill_value=0)
+    week_of_day = days - pd.to_timedelta(days.weekday, unit="D")
+    return per_name.T.groupby(week_of_day).sum().T.reindex(columns=weeks, fill_value=0).to_numpy()
+
+
+def _bootstrap_totals(samples, weights, simulations, rng):
+    """
+    Totals of sum_w sample * weight_w, where each week draws one of the
+    employee's own recent samples at random. `samples` is (n, k) with NaN
+    for missing weeks; `weights` is (n, w). Returns (n, simulations).
+    """
+    n, k = samples.shape
+    valid = np.isfinite(samples)
+    counts = valid.sum(axis=1)
+    # Valid samples first, so a draw in [0, count) always lands on one
+    ordered = np.take_along_axis(np.where(valid, samples, 0), np.argsort(~valid, axis=1, kind="stable"), axis=1)
+
+    totals = np.zeros((n, simulations))
+    rows = np.arange(n)[:, None]
+    for week in range(weights.shape[1]):
+        picks = (rng.random((n, simulations)) * np.maximum(counts, 1)[:, None]).astype(int)
+        totals += ordered[rows, picks] * weights[:, week][:, None]
+    return totals
+
+
+def compute_2026_projection(table, df_user, df, df_flexot, today=None, seed=0):
+    """
+    Year-end estimates for every employee in an employee table
+    (compute_2026_employee_table), as a frame with the same index.
+
+    Billable hours are projected from each person's recent weekly
+    utilization (billable / adjusted baseline) over their remaining
+    contract hours, less time off already booked. Flex and OT buckets
+    follow their recent weekly changes. Each week of the rest of the year
+    draws one of the person's last PROJECTION_WEEKS weeks at random, and
+    the simulated totals give the p10/p50/p90 columns.
+    """
+    today = today or datetime.today()
+    monday = pd.Timestamp(today - timedelta(days=today.weekday())).normalize()
+    year_end = pd.Timestamp("2026-12-31")
+    names = table.index
+    rng = np.random.default_rng(seed)
+
+    recent = pd.date_range(end=monday - pd.Timedelta(weeks=1), periods=PROJECTION_WEEKS, freq="W-MON")
+    remaining = pd.date_range(monday, year_end, freq="W-MON")
+
+    users = df_user.copy()
+    users["Start"] = pd.to_datetime(users["Start"], errors="coerce").dt.normalize()
+    users["End"] = pd.to_datetime(users["End"], errors="coerce").fillna(year_end).dt.normalize()
+    users["Daily_Hours"] = np.where(users["Working Hrs"] > 0, users["Working Hrs"] / 5, 0)
+
+    #----------------------
+    # WEEKLY HOURS
+    #----------------------
+    date = pd.to_datetime(df["Date"]).dt.normalize()
+    week = date - pd.to_timedelta(date.dt.weekday, unit="D")
+    hours = df["Sum of Hours"]
+    pto = df["Project No - Title"].isin(PERIOD_PTO_TITLES)
+
+    weekly = pd.DataFrame({
+        "billable": hours.where(df["Utilization Category"] == "Billable Project", 0),
+        "pto": hours.where(pto, 0),
+    }).groupby([df["Employee Full Name"], week]).sum()
+
+    def weekly_grid(column, weeks):
+        return (
+            weekly[column].unstack(fill_value=0)
+            .reindex(index=names, columns=weeks, fill_value=0)
+            .to_numpy()
+        )
+
+    baseline_recent = _weekly_contract_hours(users, recent, names) - weekly_grid("pto", recent)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate_recent = np.where(baseline_recent > 0, weekly_grid("billable", recent) / baseline_recent, np.nan)
+
+    booked = weekly_grid("pto", remaining) if len(remaining) else np.zeros((len(names), 0))
+    baseline_remaining = np.maximum(_weekly_contract_hours(users, remaining, names) - booked, 0) if len(remaining) else booked
+
+    #----------------------
+    # SIMULATION
+    #----------------------
+    billable = table["project_ytd"].to_numpy()[:, None] + _bootstrap_totals(
+        rate_recent, baseline_remaining, PROJECTION_SIMULATIONS, rng
+    )
+    baseline_year = table["adjusted_target_ytd"].to_numpy() + baseline_remaining.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilization = np.where(baseline_year[:, None] > 0, billable / baseline_year[:, None], 0)
+
+    flexot = df_flexot.assign(week=pd.to_datetime(df_flexot["WeekStart"]).dt.normalize())
+    flexot = flexot[flexot["week"].isin(recent)]
+    ones = np.ones((len(names), len(remaining)))
+
+    def bucket_deltas(column):
+        return (
+            flexot.groupby([flexot["Full Name"].str.lower(), "week"])[column].sum()
+            .unstack()
+            .reindex(index=names.str.lower(), columns=recent)
+            .to_numpy()
+        )
+
+    flex = table["flex_bucket"].to_numpy()[:, None] + _bootstrap_totals(bucket_deltas("Flex Bucket"), ones, PROJECTION_SIMULATIONS, rng)
+    ot = table["ot_bucket"].to_numpy()[:, None] + _bootstrap_totals(bucket_deltas("OT Bucket"), ones, PROJECTION_SIMULATIONS, rng)
+
+    projection = pd.DataFrame(index=names)
+    projection["remaining_baseline"] = baseline_remaining.sum(axis=1)
+    projection["booked_time_off"] = booked.sum(axis=1)
+    weeks_with_baseline = np.isfinite(rate_recent).sum(axis=1)
+    projection["recent_util"] = np.nansum(rate_recent, axis=1) / np.maximum(weeks_with_baseline, 1)
+    for name, values in [("billable", billable), ("util", utilization), ("flex", flex), ("ot", ot)]:
+        for q, column in zip(PROJECTION_QUANTILES, np.quantile(values, PROJECTION_QUANTILES, axis=1)):
+            projection[f"{name}_p{round(q * 100)}"] = column
+    projection["util_target"] = table["current_util_target"].to_numpy()
+    projection["vacation_unused"] = table["vacation_remaining"].to_numpy()
+    return projection
+
+
+#----------------------
+# TIME-OFF PLANNER (2026)
+#----------------------
+
+PLANNER_KINDS = ["Vacation", "PTO Sick/Medical", "Unpaid Time Off"]
+
+
+def compute_2026_time_off_capacity(df_user, df, year=2026):
+    """
+    Per-employee prefix sums of bookable hours over the days of `year`:
+    contract hours on each weekday, less time off already logged or booked
+    (PERIOD_PTO_TITLES). The hours a range would take are then one
+    subtraction, whatever its length.
+
+        names       {Full Name: row}
+        free_cum    (employees, days + 1) cumulative bookable hours; free_cum[:, d] covers the days before day d
+    """
+    year_start, year_end = pd.Timestamp(f"{year}-01-01"), pd.Timestamp(f"{year}-12-31")
+    days = pd.date_range(year_start, year_end)
+
+    users = df_user.copy()
+    users["Start"] = pd.to_datetime(users["Start"], errors="coerce").dt.normalize()
+    users["End"] = pd.to_datetime(users["End"], errors="coerce").fillna(year_end).dt.normalize()
+    daily_hours = np.where(users["Working Hrs"] > 0, users["Working Hrs"] / 5, 0)
+
+    names = pd.Index(users["Full Name"].unique())
+    weekday = (days.weekday < 5)[None, :]
+    active = (
+        (days.to_numpy() >= users["Start"].to_numpy()[:, None]) &
+        (days.to_numpy() <= users["End"].to_numpy()[:, None]) &
+        weekday
+    )
+    contract = pd.DataFrame(active * daily_hours[:, None]).groupby(users["Full Name"].to_numpy()).sum()
+    contract = contract.reindex(names).to_numpy()
+
+    date = pd.to_datetime(df["Date"]).dt.normalize()
+    rows = date.between(year_start, year_end) & df["Project No - Title"].isin(PERIOD_PTO_TITLES)
+    booked = np.zeros_like(contract)
+    row_index = names.get_indexer(df.loc[rows, "Employee Full Name"])
+    known = row_index >= 0
+    np.add.at(
+        booked,
+        (row_index[known], (date[rows].dt.dayofyear.to_numpy() - 1)[known]),
+        df.loc[rows, "Sum of Hours"].fillna(0).to_numpy()[known],
+    )
+
+    free = np.maximum(contract - booked, 0)
+    free_cum = np.zeros((len(names), len(days) + 1))
+    np.cumsum(free, axis=1, out=free_cum[:, 1:])
+
+    return {"year": year, "names": {name: i for i, name in enumerate(names)}, "free_cum": free_cum}
+
+
+def merge_ranges(ranges):
+    """Union of inclusive (start, end) date ranges, sorted, so overlaps are only counted once."""
+    merged = []
+    for start, end in sorted((min(s, e), max(s, e)) for s, e in ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def planned_hours(capacity, name, ranges, split):
+    """
+    Bookable hours in the (merged) date ranges for one employee, as
+    (before `split`, from `split` on). O(1) per range.
+    """
+    row = capacity["names"].get(name)
+    if row is None:
+        return 0.0, 0.0
+
+    cum = capacity["free_cum"][row]
+    first = datetime(capacity["year"], 1, 1).date()
+    n_days = len(cum) - 1
+
+    def hours(start, end):
+        a = min(max((start - first).days, 0), n_days)
+        b = min(max((end - first).days + 1, 0), n_days)
+        return float(cum[b] - cum[a]) if b > a else 0.0
+
+    past = future = 0.0
+    for start, end in merge_ranges(ranges):
+        past += hours(start, min(end, split - timedelta(days=1)))
+        future += hours(max(start, split), end)
+    return past, future
+
+
+def time_off_plan(capacity, name, entries, split):
+    """
+    Bookable hours for (kind, start, end) entries as {kind: (before `split`,
+    from `split` on)} over PLANNER_KINDS. Days an earlier entry already
+    covers, of any kind, are not counted again.
+    """
+    plan = {kind: (0.0, 0.0) for kind in PLANNER_KINDS}
+    covered = []
+    for kind, start, end in entries:
+        before = planned_hours(capacity, name, covered, split)
+        covered = merge_ranges(covered + [(start, end)])
+        after = planned_hours(capacity, name, covered, split)
+        past, future = plan[kind]
+        plan[kind] = (past + after[0] - before[0], future + after[1] - before[1])
+    return plan
+
+
+def apply_time_off_plan(state, plan, recent_util=0.0, remaining_baseline=0.0):
+    """
+    Before/after of the dashboard numbers for planned time off. `plan` maps
+    each of PLANNER_KINDS to (hours before this week, hours from this week
+    on). Past hours come off the adjusted baseline as if they had been
+    logged; future hours come off the remaining baseline, which moves the
+    year-end utilization at the user's recent run rate.
+    """
+    past = {kind: plan.get(kind, (0.0, 0.0))[0] for kind in PLANNER_KINDS}
+    future = {kind: plan.get(kind, (0.0, 0.0))[1] for kind in PLANNER_KINDS}
+    past_total, future_total = sum(past.values()), sum(future.values())
+
+    def year_end_util(past_hours, future_hours):
+        left = max(remaining_baseline - future_hours, 0)
+        baseline = max(state["adjusted_target_ytd"] - past_hours, 0) + left
+        return (state["project_ytd"] + recent_util * left) / baseline if baseline > 0 else 0
+
+    def vacation_remaining(extra_past, extra_future):
+        used = min(state["pto_vacation"] + extra_past, state["vacation_max"])
+        return max(state["vacation_max"] - used - state["future_vacation_hours"] - extra_future, 0)
+
+    def sick_remaining(extra):
+        return max(37.5 - min(state["pto_sick"] + extra, 37.5), 0)
+
+    adjusted_target = state["adjusted_target"] - past_total
+    adjusted_target_ytd = max(state["adjusted_target_ytd"] - past_total, 0)
+
+    return {
+        "adjusted_target": (state["adjusted_target"], adjusted_target),
+        "delta_hours": (state["delta_hours"], state["total_working_hours"] - adjusted_target),
+        "vacation_remaining": (
+            state["vacation_remaining"],
+            vacation_remaining(past["Vacation"], future["Vacation"]),
+        ),
+        "sick_remaining": (
+            state["sick_remaining"],
+            sick_remaining(past["PTO Sick/Medical"] + future["PTO Sick/Medical"]),
+        ),
+        "util_ytd": (
+            state["util_ytd"],
+            state["project_ytd"] / adjusted_target_ytd if adjusted_target_ytd > 0 else 0,
+        ),
+        "util_year_end": (year_end_util(0, 0), year_end_util(past_total, future_total)),
+    }
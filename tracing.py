@@ -0,0 +1,149 @@
+"""
+Per-rerun span traces for the dashboard.
+
+Each script rerun is a trace: a tree of spans (auth check, loading each
+workbook, cleaning, computing, rendering each card and chart) with their
+start offsets, durations and attributes such as row counts and cache hits.
+Every diagnostics.timed() block is a span, so the tree follows the stages
+the diagnostics panel already times.
+
+Finished traces are appended to a JSON lines file, one trace per line, when
+the rerun was sampled (sample_rate) or took at least slow_ms, so the slow
+page loads are always kept. Spans are only collected while a trace is
+running on the thread; otherwise opening one costs a thread-local lookup.
+"""
+import hashlib
+import hmac
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+MAX_BYTES = 50 * 1024 * 1024   # the sink rolls over to <path>.1 past this
+
+_local = threading.local()
+_sink_lock = threading.Lock()
+
+
+def start_trace(name, path, sample_rate=1.0, slow_ms=None, **attributes):
+    """Start tracing this thread's rerun, replacing any trace left unfinished."""
+    root = {"name": name, "start": time.perf_counter(), "attributes": attributes, "children": []}
+    _local.trace = {
+        "id": uuid.uuid4().hex[:16],
+        "started": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "path": path,
+        "sampled": random.random() < sample_rate,
+        "slow_ms": slow_ms,
+        "root": root,
+    }
+    _local.stack = [root]
+
+
+def open_span(name, **attributes):
+    """Open a child of the current span; None when this thread isn't tracing."""
+    stack = getattr(_local, "stack", None)
+    if not stack:
+        return None
+    span = {"name": name, "start": time.perf_counter(), "attributes": attributes, "children": []}
+    stack[-1]["children"].append(span)
+    stack.append(span)
+    return span
+
+
+def close_span(span, **attributes):
+    if span is None:
+        return
+    span["duration"] = time.perf_counter() - span["start"]
+    span["attributes"].update((key, value) for key, value in attributes.items() if value is not None)
+    stack = getattr(_local, "stack", None)
+    if stack and span in stack:
+        del stack[stack.index(span):]
+
+
+@contextmanager
+def span(name, **attributes):
+    """Trace the block as a span; the yielded dict takes further attributes."""
+    current = open_span(name, **attributes)
+    extra = {}
+    try:
+        yield extra
+    finally:
+        close_span(current, **extra)
+
+
+def set_attributes(**attributes):
+    """Add attributes to the rerun's root span."""
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace["root"]["attributes"].update(attributes)
+
+
+def pseudonym(value, key):
+    """A keyed hash (HMAC-SHA256) of `value`: stable per key, and not reversible from a list of values without it."""
+    return hmac.new(key.encode(), value.encode(), hashlib.sha256).hexdigest()[:16]
+
+
+def finish_trace(**attributes):
+    """End this thread's trace, writing it if sampled or slow; returns the duration in ms."""
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        return None
+    _local.trace = _local.stack = None
+
+    root = trace["root"]
+    close_span(root, **attributes)
+    duration_ms = root["duration"] * 1000
+    slow = trace["slow_ms"] is not None and duration_ms >= trace["slow_ms"]
+    if trace["sampled"] or slow:
+        record = {
+            "trace_id": trace["id"],
+            "started": trace["started"],
+            "duration_ms": round(duration_ms, 3),
+            "sampled": trace["sampled"],
+            "slow": slow,
+            "root": _export(root, root["start"]),
+        }
+        write(trace["path"], record)
+    return duration_ms
+
+
+def _export(span, origin):
+    exported = {
+        "name": span["name"],
+        "start_ms": round((span["start"] - origin) * 1000, 3),
+        # Spans cut short by an exception inside them never got a duration
+        "duration_ms": round(span["duration"] * 1000, 3) if "duration" in span else None,
+    }
+    if span["attributes"]:
+        exported["attributes"] = span["attributes"]
+    if span["children"]:
+        exported["children"] = [_export(child, origin) for child in span["children"]]
+    return exported
+
+
+def write(path, record):
+    """Append one trace to the JSON lines sink at `path`."""
+    line = json.dumps(record, default=str) + "\n"
+    with _sink_lock:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path) and os.path.getsize(path) + len(line) > MAX_BYTES:
+            os.replace(path, path + ".1")
+        with open(path, "a") as f:
+            f.write(line)
+
+
+def read_traces(path):
+    """The traces in a sink file, oldest first."""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def slowest(path, n=10):
+    """The `n` slowest traces in a sink file."""
+    return sorted(read_traces(path), key=lambda trace: trace["duration_ms"], reverse=True)[:n]
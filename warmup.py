@@ -0,0 +1,120 @@
+"""
+Boot-time warmup for the dashboard.
+
+Run once per process before users arrive: pre-import the data and plotting
+libraries, load the default year's tables (from the snapshot or SharePoint)
+and build the shared indexes and aggregates, all through the same cached
+loaders the app calls (loaders.py), so the first real page load is a cache
+hit. Progress is kept in status() and served as readiness on /healthz by
+the metrics endpoint: not ready until the warmup has finished or been
+skipped. A failed warmup reports "degraded" but stays ready, as a cold
+dashboard beats none.
+
+serve.py starts it alongside the Streamlit server.
+"""
+import importlib
+import threading
+import time
+
+from diagnostics import timed
+
+DEFAULT_YEAR = "2026"
+
+# Per year: the libraries its view draws with, and the loaders filling the
+# shared caches after its tables, in dependency order
+PLOTTING = {
+    "2025": ["altair", "matplotlib.pyplot", "pyarrow"],
+    "2026": ["altair", "plotly.graph_objs._figure", "pyarrow"],
+}
+AGGREGATES = {
+    "2025": [],
+    "2026": [
+        "load_2026_timesheet_index",
+        "load_2026_employee_table",
+        "load_2026_utilization_distribution",
+        "load_2026_projection",
+        "load_2026_project_weeks",
+        "load_2026_day_grid",
+        "load_2026_time_off_capacity",
+        "load_2026_office_cube",
+    ],
+}
+
+_lock = threading.Lock()
+_status = {"status": "not started", "year": None, "steps": {}, "seconds": None, "error": None}
+
+
+def status():
+    with _lock:
+        return {**_status, "steps": dict(_status["steps"])}
+
+
+def readiness():
+    """(ready, details) for the health check: not ready until the warmup has finished or been skipped."""
+    details = status()
+    return details["status"] in ("ready", "degraded", "skipped"), details
+
+
+def _step(name, func, *args):
+    started = time.perf_counter()
+    with timed(f"warmup: {name}"):
+        func(*args)
+    with _lock:
+        _status["steps"][name] = round(time.perf_counter() - started, 3)
+
+
+def warm(year=DEFAULT_YEAR):
+    """Warm `year`'s imports and caches in this thread; returns status()."""
+    with _lock:
+        _status.update(status="warming", year=year, steps={}, seconds=None, error=None)
+    started = time.perf_counter()
+    try:
+        for module in PLOTTING[year]:
+            _step(f"import {module}", importlib.import_module, module)
+
+        import loaders
+
+        _step(f"load {year} tables", getattr(loaders, f"load_{year}_tables"))
+        for name in AGGREGATES[year]:
+            _step(name, getattr(loaders, name))
+    except Exception as e:
+        with _lock:
+            _status.update(status="degraded", error=f"{type(e).__name__}: {e}")
+    else:
+        with _lock:
+            _status["status"] = "ready"
+    with _lock:
+        _status["seconds"] = round(time.perf_counter() - started, 3)
+    return status()
+
+
+def start(year=DEFAULT_YEAR, wait_for_runtime=True):
+    """
+    Warm `year` on a background thread, once per process. With
+    wait_for_runtime the thread first waits for the Streamlit runtime, whose
+    cache storage the loaders fill.
+    """
+    with _lock:
+        if _status["status"] != "not started":
+            return False
+        _status.update(status="starting", year=year)
+
+    def run():
+        if wait_for_runtime:
+            from streamlit import runtime
+
+            while not runtime.exists():
+                time.sleep(0.1)
+        warm(year)
+
+    threading.Thread(target=run, name="warmup", daemon=True).start()
+    return True
+
+
+def skip(year=DEFAULT_YEAR):
+    """Start cold on purpose: report ready without warming, once per process."""
+    with _lock:
+        if _status["status"] != "not started":
+            return False
+        _status.update(status="skipped", year=year)
+    return True